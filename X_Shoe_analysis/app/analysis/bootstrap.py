@@ -0,0 +1,79 @@
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from .scoring import PlaceSignals, SourceRows, _safe_mean, composite_parts, resolve_weights
+
+# Result parts that get an interval; trend is a Trends aggregate, not a row sample, so it is fixed
+INTERVAL_PARTS = ["score", "engagement", "reddit_engagement", "youtube_engagement", "sentiment"]
+
+
+def _resampled_totals(rows: SourceRows, n_boot: int, rng: np.random.Generator, block_size: int = 4_000_000) -> np.ndarray:
+	"""Per-place totals of ``n_boot`` with-replacement resamples of a source (n_boot x places x k).
+
+	A resample of all ``total_rows`` rows draws Binomial(total_rows, hits/total_rows) matched rows,
+	so only those draws are materialized: an index matrix into the matched rows, masked to each
+	resample's draw count and turned into per-row counts, then one (counts @ rows) product.
+	"""
+	hits, places = rows.members.shape
+	k = rows.values.shape[1]
+	out = np.zeros((n_boot, places, k))
+	if hits == 0:
+		return out
+	weighted = (rows.members[:, :, None] * rows.values[:, None, :]).reshape(hits, places * k)
+	draws = rng.binomial(rows.total_rows, hits / rows.total_rows, size=n_boot)
+	width = max(int(draws.max()), 1)
+	block = max(1, block_size // max(width, hits))
+	for start in range(0, n_boot, block):
+		n = draws[start : start + block]
+		index = rng.integers(0, hits, size=(len(n), width)) + np.arange(len(n))[:, None] * hits
+		# Draws past a resample's count land in one spill bin that is dropped
+		index[np.arange(width) >= n[:, None]] = len(n) * hits
+		counts = np.bincount(index.ravel(), minlength=len(n) * hits + 1)[:-1].reshape(len(n), hits)
+		out[start : start + len(n)] = (counts.astype(float) @ weighted).reshape(len(n), places, k)
+	return out
+
+
+def bootstrap_components(signals: PlaceSignals, n_boot: int = 2000, seed: int = 0) -> Dict[str, np.ndarray]:
+	"""Component arrays (n_boot x places) from resampling posts, comments and video stats independently."""
+	rng = np.random.default_rng(seed)
+	posts = _resampled_totals(signals.posts, n_boot, rng)
+	comments = _resampled_totals(signals.comments, n_boot, rng)
+	stats = _resampled_totals(signals.stats, n_boot, rng)
+	trend = signals.place_trends["trend"].reindex(signals.places).fillna(0).to_numpy(dtype=float)
+	return {
+		"post_engagement": posts[:, :, 0],
+		"post_sentiment": _safe_mean(posts[:, :, 1], posts[:, :, 2]),
+		"comment_engagement": comments[:, :, 0],
+		"comment_sentiment": _safe_mean(comments[:, :, 1], comments[:, :, 2]),
+		"view_count": stats[:, :, 0],
+		"like_count": stats[:, :, 1],
+		"comment_count": stats[:, :, 2],
+		"trend": np.broadcast_to(trend, (n_boot, len(trend))),
+	}
+
+
+def bootstrap_intervals(
+	signals: PlaceSignals,
+	weights: Dict[str, float] | None = None,
+	n_boot: int = 2000,
+	level: float = 0.95,
+	seed: int = 0,
+) -> pd.DataFrame:
+	"""Percentile intervals per place for the score and its parts, plus ``win_share``: the share of
+	resamples in which the place scores highest.
+
+	Columns are ``<part>_lo`` / ``<part>_hi`` for every part in INTERVAL_PARTS, ready to merge
+	into the ``combine_components`` result on ``place``.
+	"""
+	parts = composite_parts(bootstrap_components(signals, n_boot, seed), resolve_weights(weights))
+	tail = (1.0 - level) / 2.0 * 100.0
+	out = pd.DataFrame({"place": signals.places})
+	for part in INTERVAL_PARTS:
+		lo, hi = np.percentile(parts[part], [tail, 100.0 - tail], axis=0)
+		out[f"{part}_lo"] = lo
+		out[f"{part}_hi"] = hi
+	wins = np.bincount(parts["score"].argmax(axis=1), minlength=len(signals.places)) if signals.places else np.zeros(0)
+	out["win_share"] = wins / n_boot
+	return out
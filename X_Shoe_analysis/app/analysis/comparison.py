@@ -0,0 +1,62 @@
+from typing import Any, Dict, List
+
+import pandas as pd
+
+from .scoring import combine_components, extract_signals
+from .sentiment import SentimentCache
+from .trend_features import keyword_features, place_trend_features
+
+try:
+	from app.instrumentation import instrumented
+except ModuleNotFoundError:
+	from instrumentation import instrumented
+
+# Places of every city are scored together under qualified "<city> / <place>" names
+SEPARATOR = " / "
+
+
+def city_places(cities: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
+	return {f"{city}{SEPARATOR}{place}": kws for city, spec in cities.items() for place, kws in spec["places"].items()}
+
+
+def _city_trends(trends_df: pd.DataFrame, city: str, cities: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
+	# Features of the topic columns and the city's own place columns; other cities sharing the geo are left out
+	own = {k.lower() for kws in cities[city]["places"].values() for k in kws}
+	others = {k.lower() for name, spec in cities.items() if name != city for kws in spec["places"].values() for k in kws} - own
+	features = keyword_features(trends_df)
+	features = features[[str(k).lower() not in others for k in features.index]]
+	place_trends = place_trend_features(features, cities[city]["places"])
+	place_trends.index = pd.Index([f"{city}{SEPARATOR}{place}" for place in place_trends.index], name="place")
+	return place_trends
+
+
+@instrumented("comparison.extract_city_components")
+def extract_city_components(
+	reddit_posts: pd.DataFrame,
+	reddit_comments: pd.DataFrame,
+	yt_videos: pd.DataFrame,
+	yt_stats: pd.DataFrame,
+	trends_by_geo: Dict[str, pd.DataFrame],
+	cities: Dict[str, Dict[str, Any]],
+	sentiment_cache: SentimentCache | None = None,
+	sentiment_workers: int = 1,
+) -> pd.DataFrame:
+	"""Place components for every city from one shared collection ("<city> / <place>" x component).
+
+	The shared Reddit and YouTube rows are matched against all cities' keywords in one scan and
+	each matched row is sentiment-scored once, whichever cities it mentions; Trends features come
+	from each city's own geo.
+	"""
+	signals = extract_signals(reddit_posts, reddit_comments, yt_videos, yt_stats, pd.DataFrame(), city_places(cities), sentiment_cache, sentiment_workers)
+	signals.place_trends = pd.concat([_city_trends(trends_by_geo.get(spec["geo"], pd.DataFrame()), city, cities) for city, spec in cities.items()])
+	return signals.components()
+
+
+def compare_cities(components: pd.DataFrame, weights: Dict[str, float] | None = None) -> pd.DataFrame:
+	"""Cross-city table: every city's places by score, with the rank of each place within its city."""
+	result = combine_components(components, weights)
+	split = result["place"].str.split(SEPARATOR, n=1, expand=True)
+	result.insert(0, "city", split[0])
+	result["place"] = split[1]
+	result["city_rank"] = result.groupby("city")["score"].rank(ascending=False, method="first").astype(int)
+	return result.reset_index(drop=True)
@@ -0,0 +1,254 @@
+import hashlib
+import json
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from .matching import KeywordIndex
+from .scoring import STAT_COLUMNS, _components_from_totals, _matched_compound, _post_activity, _post_texts, _stat_values, _stats_members, composite_parts, resolve_weights
+from .sentiment import SentimentCache
+from .trend_features import keyword_features, place_trend_features, place_trend_levels
+
+try:
+	from app.instrumentation import instrumented, stage
+	from app.storage import DataStore
+except ModuleNotFoundError:
+	from instrumentation import instrumented, stage
+	from storage import DataStore
+
+SOURCES = ["reddit_posts", "reddit_comments", "youtube"]
+# Per (place, week, source) cell: engagement and compound sums, matched rows, YouTube stat sums
+VALUE_COLUMNS = ["engagement", "compound", "rows", *STAT_COLUMNS]
+CELL_COLUMNS = ["place", "week", "source", *VALUE_COLUMNS]
+# Columns whose changes alter a row's contribution, per source
+DIGEST_COLUMNS = {
+	"reddit_posts": ["id", "title", "selftext", "score", "num_comments", "created_utc"],
+	"reddit_comments": ["comment_id", "body", "score", "created_utc"],
+	"youtube": ["video_id", "title", "description", "published_at", *STAT_COLUMNS],
+}
+
+
+def week_start(timestamps: pd.Series) -> np.ndarray:
+	"""Monday 00:00 of each timestamp's week (NaT stays NaT) as datetime64[ns]."""
+	days = pd.to_datetime(timestamps, errors="coerce", utc=True).dt.tz_localize(None).dt.normalize()
+	return (days - pd.to_timedelta(days.dt.dayofweek, unit="D")).to_numpy(dtype="datetime64[ns]")
+
+
+def week_in_range(weeks: np.ndarray, start=None, end=None) -> np.ndarray:
+	"""Mask of the weeks (week starts) overlapping [start, end], both optional; NaT is never in range."""
+	weeks = pd.to_datetime(pd.Series(weeks))
+	keep = weeks.notna()
+	if start is not None:
+		keep &= weeks >= week_start(pd.Series([pd.Timestamp(start)]))[0]
+	if end is not None:
+		keep &= weeks <= pd.Timestamp(end)
+	return keep.to_numpy()
+
+
+def _week_keys(weeks: np.ndarray) -> np.ndarray:
+	# int64 nanoseconds, with NaT as its own key (iNaT)
+	return np.asarray(weeks, dtype="datetime64[ns]").view("i8")
+
+
+def _keywords_signature(location_keywords: Dict[str, List[str]]) -> np.uint64:
+	spec = json.dumps(location_keywords, sort_keys=True).encode("utf-8")
+	return np.uint64(int(hashlib.sha1(spec).hexdigest()[:16], 16))
+
+
+def _youtube_rows(yt_videos: pd.DataFrame, yt_stats: pd.DataFrame) -> pd.DataFrame:
+	# One row per stats row (as scoring counts them) with its video's text and publish date
+	if yt_stats.empty or yt_videos.empty:
+		return pd.DataFrame(columns=DIGEST_COLUMNS["youtube"])
+	videos = yt_videos.drop_duplicates("video_id").set_index("video_id")
+	rows = yt_stats.copy()
+	for col in ["title", "description", "published_at"]:
+		rows[col] = rows["video_id"].map(videos[col]) if col in videos.columns else None
+	return rows
+
+
+class ScoreCube:
+	"""Pre-aggregated (place x week x source) sums behind date-filtered scores and score histories.
+
+	Each cell holds one source's engagement and compound sums, matched-row count and YouTube stat
+	sums for one place and week (Reddit rows bucket by ``created_utc``, YouTube stats by their
+	video's ``published_at``). ``update`` only re-matches and re-scores the weeks whose rows changed
+	since the last update: every (source, week) keeps an order-independent digest of its rows and
+	of the place keywords, so new posts, refreshed scores or edited keywords invalidate exactly the
+	weeks they touch. Any date range or weekly/monthly trajectory is then a sum over cells.
+	"""
+
+	def __init__(self, location_keywords: Dict[str, List[str]], cells: pd.DataFrame | None = None, digests: pd.DataFrame | None = None):
+		self.location_keywords = location_keywords
+		self.places = list(location_keywords)
+		self.cells = cells if cells is not None else pd.DataFrame(columns=CELL_COLUMNS)
+		self.digests = digests if digests is not None else pd.DataFrame(columns=["source", "week", "digest"])
+
+	@classmethod
+	def load(cls, store: DataStore, location_keywords: Dict[str, List[str]]) -> "ScoreCube":
+		"""The stored cube, or an empty one; cells of other place sets are refreshed by ``update``."""
+		if not (store.exists("cube") and store.exists("cube_digests")):
+			return cls(location_keywords)
+		cells = store.read("cube")
+		cells = cells[cells["place"].isin(location_keywords)].reset_index(drop=True)
+		return cls(location_keywords, cells, store.read("cube_digests"))
+
+	def save(self, store: DataStore) -> None:
+		store.write("cube", self.cells)
+		store.write("cube_digests", self.digests)
+
+	def _digests(self, source: str, rows: pd.DataFrame, weeks: np.ndarray) -> pd.Series:
+		# Sum of row hashes per week (wrapping uint64), salted with the keywords so edits invalidate
+		if rows.empty:
+			return pd.Series(dtype="int64")
+		hashed = pd.util.hash_pandas_object(rows.reindex(columns=DIGEST_COLUMNS[source]), index=False).to_numpy()
+		salted = pd.Series(hashed ^ _keywords_signature(self.location_keywords))
+		sums = salted.groupby(_week_keys(weeks)).sum()
+		return pd.Series(sums.to_numpy(dtype="uint64").view("int64"), index=sums.index)
+
+	def _stale_weeks(self, source: str, current: pd.Series) -> np.ndarray:
+		stored = self.digests[self.digests["source"] == source]
+		stored = pd.Series(stored["digest"].to_numpy(dtype="int64"), index=_week_keys(stored["week"].to_numpy(dtype="datetime64[ns]")))
+		both = current.index.union(stored.index)
+		return both[current.reindex(both).to_numpy() != stored.reindex(both).to_numpy()].to_numpy()
+
+	def _bucket(self, source: str, members: pd.DataFrame, values: np.ndarray, weeks: np.ndarray) -> pd.DataFrame:
+		# Long (row, place) pairs of every match, summed per place and week
+		rows, places = np.nonzero(members.to_numpy(dtype=bool))
+		frame = pd.DataFrame(np.nan_to_num(values[rows]), columns=VALUE_COLUMNS)
+		frame.insert(0, "place", np.asarray(self.places, dtype=object)[places])
+		frame.insert(1, "week", weeks[rows])
+		cells = frame.groupby(["place", "week"], dropna=False, sort=False).sum().reset_index()
+		cells.insert(2, "source", source)
+		return cells[CELL_COLUMNS]
+
+	def _source_cells(self, source: str, rows: pd.DataFrame, weeks: np.ndarray, index: KeywordIndex, yt_videos: pd.DataFrame, sentiment_cache: SentimentCache | None, sentiment_workers: int) -> pd.DataFrame:
+		values = np.zeros((len(rows), len(VALUE_COLUMNS)))
+		if source == "youtube":
+			videos = yt_videos[yt_videos["video_id"].isin(rows["video_id"])].reset_index(drop=True)
+			members = _stats_members(videos, rows, index.membership(videos, ["title", "description"]))
+			values[:, 2] = 1.0
+			values[:, 3:] = _stat_values(rows)
+			return self._bucket(source, members, values, weeks)
+		if source == "reddit_posts":
+			members = index.membership(rows, ["title", "selftext"])
+			values[:, 0] = _post_activity(rows)
+			texts = _post_texts(rows)
+		else:
+			members = index.membership(rows, ["body"])
+			values[:, 0] = rows["score"].fillna(0).to_numpy(dtype=float)
+			texts = rows["body"].fillna("")
+		values[:, 1] = _matched_compound(texts, members, sentiment_cache, sentiment_workers).to_numpy(dtype=float)
+		values[:, 2] = 1.0
+		return self._bucket(source, members, values, weeks)
+
+	@instrumented("cube.update")
+	def update(
+		self,
+		reddit_posts: pd.DataFrame,
+		reddit_comments: pd.DataFrame,
+		yt_videos: pd.DataFrame,
+		yt_stats: pd.DataFrame,
+		sentiment_cache: SentimentCache | None = None,
+		sentiment_workers: int = 1,
+	) -> int:
+		"""Bring the cube up to date with the given datasets; returns how many (source, week) buckets were rebuilt."""
+		index = KeywordIndex(self.location_keywords)
+		frames = {
+			"reddit_posts": reddit_posts.reset_index(drop=True),
+			"reddit_comments": reddit_comments.reset_index(drop=True),
+			"youtube": _youtube_rows(yt_videos, yt_stats).reset_index(drop=True),
+		}
+		kept_cells, new_cells, new_digests = [], [], []
+		rebuilt = 0
+		for source, rows in frames.items():
+			with stage(f"cube.{source}") as record:
+				time_column = "published_at" if source == "youtube" else "created_utc"
+				if rows.empty or time_column not in rows.columns:
+					weeks = np.full(len(rows), np.datetime64("NaT"), dtype="datetime64[ns]")
+				elif source == "youtube":
+					weeks = week_start(rows[time_column])
+				else:
+					weeks = week_start(pd.to_datetime(rows[time_column], unit="s", errors="coerce"))
+				current = self._digests(source, rows, weeks)
+				stale = self._stale_weeks(source, current)
+				cells = self.cells[self.cells["source"] == source]
+				kept_cells.append(cells[~np.isin(_week_keys(cells["week"].to_numpy(dtype="datetime64[ns]")), stale)])
+				selected = np.isin(_week_keys(weeks), stale)
+				if selected.any():
+					subset = rows.loc[selected].reset_index(drop=True)
+					new_cells.append(self._source_cells(source, subset, weeks[selected], index, yt_videos, sentiment_cache, sentiment_workers))
+				new_digests.append(pd.DataFrame({"source": source, "week": current.index.to_numpy().view("datetime64[ns]"), "digest": current.to_numpy()}))
+				rebuilt += len(stale)
+				record.rows = int(selected.sum())
+		self.cells = pd.concat([c for c in kept_cells + new_cells if not c.empty] or [pd.DataFrame(columns=CELL_COLUMNS)], ignore_index=True)
+		self.digests = pd.concat(new_digests, ignore_index=True)
+		return rebuilt
+
+	def date_span(self) -> tuple:
+		"""First and last bucketed week (NaT when the cube is empty)."""
+		weeks = pd.to_datetime(self.cells["week"])
+		return weeks.min(), weeks.max()
+
+	def _select(self, start=None, end=None) -> pd.DataFrame:
+		if start is None and end is None:
+			return self.cells
+		return self.cells[week_in_range(self.cells["week"].to_numpy(dtype="datetime64[ns]"), start, end)]
+
+	def _totals(self, cells: pd.DataFrame, source: str, columns: List[str]) -> np.ndarray:
+		sums = cells[cells["source"] == source].groupby("place")[columns].sum()
+		return sums.reindex(self.places, fill_value=0.0).to_numpy(dtype=float)
+
+	def components(self, trends_df: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+		"""The place x component frame of ``extract_components`` restricted to weeks overlapping
+		[start, end] (both optional), with Trends features over the same dates."""
+		cells = self._select(start, end)
+		if "date" in trends_df.columns and (start is not None or end is not None):
+			dates = pd.to_datetime(trends_df["date"])
+			keep = pd.Series(True, index=trends_df.index)
+			if start is not None:
+				keep &= dates >= pd.Timestamp(start)
+			if end is not None:
+				keep &= dates <= pd.Timestamp(end)
+			trends_df = trends_df[keep]
+		return _components_from_totals(
+			self.places,
+			self._totals(cells, "reddit_posts", ["engagement", "compound", "rows"]),
+			self._totals(cells, "reddit_comments", ["engagement", "compound", "rows"]),
+			self._totals(cells, "youtube", STAT_COLUMNS),
+			place_trend_features(keyword_features(trends_df), self.location_keywords),
+		)
+
+	def history(self, trends_df: pd.DataFrame, weights: Dict[str, float] | None = None, freq: str = "W") -> pd.DataFrame:
+		"""Score trajectory: place, period start, score and its parts for every week (``freq="W"``) or
+		month (``"M"``), each period scored on its own sums and its mean Trends interest."""
+		cells = self.cells[pd.to_datetime(self.cells["week"]).notna()]
+		columns = ["place", "period", "score", "engagement", "sentiment", "trend"]
+		if cells.empty:
+			return pd.DataFrame(columns=columns)
+		periods = pd.to_datetime(cells["week"]).dt.to_period(freq).dt.start_time
+		sums = cells.assign(period=periods.to_numpy()).groupby(["source", "place", "period"])[VALUE_COLUMNS].sum()
+		grid = pd.MultiIndex.from_product([self.places, np.sort(periods.unique())], names=["place", "period"])
+
+		def per_source(name: str) -> pd.DataFrame:
+			frame = sums.xs(name, level="source") if name in sums.index.get_level_values("source") else pd.DataFrame(columns=VALUE_COLUMNS)
+			return frame.reindex(grid, fill_value=0.0).astype(float)
+
+		posts, comments, youtube = per_source("reddit_posts"), per_source("reddit_comments"), per_source("youtube")
+		levels = place_trend_levels(trends_df, self.location_keywords)
+		if not levels.empty:
+			levels = levels.groupby(levels.index.to_period(freq).start_time).mean()
+		trend = levels.stack().swaplevel().reindex(grid) if not levels.empty else pd.Series(np.nan, index=grid)
+		components = {
+			"post_engagement": posts["engagement"].to_numpy(),
+			"post_sentiment": np.divide(posts["compound"], posts["rows"], out=np.zeros(len(grid)), where=posts["rows"].to_numpy() > 0),
+			"comment_engagement": comments["engagement"].to_numpy(),
+			"comment_sentiment": np.divide(comments["compound"], comments["rows"], out=np.zeros(len(grid)), where=comments["rows"].to_numpy() > 0),
+			**{col: youtube[col].to_numpy() for col in STAT_COLUMNS},
+			"trend": trend.fillna(0.0).to_numpy(dtype=float),
+		}
+		parts = composite_parts(components, resolve_weights(weights))
+		out = grid.to_frame(index=False)
+		for col in columns[2:]:
+			out[col] = parts[col]
+		return out
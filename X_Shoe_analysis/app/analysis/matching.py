@@ -0,0 +1,86 @@
+import re
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+_REGEX_META = set(".^$*+?{}[]\\|()")
+
+
+def _is_literal(keyword: str) -> bool:
+	return not any(ch in _REGEX_META for ch in keyword)
+
+
+def _trie_pattern(words: List[str]) -> str:
+	# Collapse shared prefixes so the regex engine does not retry every alternative at every offset
+	trie: Dict[str, dict] = {}
+	for word in words:
+		node = trie
+		for ch in word:
+			node = node.setdefault(ch, {})
+		node[""] = {}
+
+	def build(node: Dict[str, dict]) -> str:
+		branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+		if not branches:
+			return ""
+		body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+		return f"(?:{body})?" if "" in node else body
+
+	return build(trie)
+
+
+def _compile_keywords(keywords: List[str]) -> str:
+	# Literal keywords go into a prefix trie; anything with regex syntax is kept verbatim,
+	# exactly as "|".join(keywords) would have treated it.
+	literals = [k for k in keywords if _is_literal(k)]
+	patterns = [k for k in keywords if not _is_literal(k)]
+	if literals:
+		patterns.insert(0, _trie_pattern(literals))
+	return "|".join(f"(?:{p})" for p in patterns)
+
+
+class KeywordIndex:
+	"""Compiled keyword matcher for all places at once.
+
+	Matching is equivalent to the case-insensitive ``str.contains("|".join(keywords))``
+	that ``aggregate_signal`` used per place. One union pattern over every place's
+	keywords is scanned once per text column; only the rows it hits are re-checked
+	against the per-place patterns to fill the membership matrix.
+	"""
+
+	def __init__(self, location_keywords: Dict[str, List[str]]):
+		self.places: List[str] = list(location_keywords)
+		self._patterns = [re.compile(_compile_keywords(kws), flags=re.IGNORECASE) for kws in location_keywords.values()]
+		# "|".join([]) is the empty pattern, which matches every string
+		self._match_all = np.array([not kws for kws in location_keywords.values()], dtype=bool)
+		all_keywords = list(dict.fromkeys(k for kws in location_keywords.values() for k in kws))
+		self._union = re.compile(_compile_keywords(all_keywords), flags=re.IGNORECASE) if all_keywords else None
+
+	def match(self, texts: pd.Series) -> np.ndarray:
+		"""Return a boolean (rows x places) membership matrix for one text column."""
+		out = np.zeros((len(texts), len(self.places)), dtype=bool)
+		values = texts.to_numpy(dtype=object)
+		is_text = np.fromiter((isinstance(t, str) for t in values), dtype=bool, count=len(values))
+		if self._match_all.any():
+			out[np.ix_(is_text, self._match_all)] = True
+		if self._union is None:
+			return out
+		union_search = self._union.search
+		checks = [(j, p.search) for j, p in enumerate(self._patterns) if not self._match_all[j]]
+		for i in np.flatnonzero(is_text):
+			text = values[i]
+			if union_search(text) is None:
+				continue
+			for j, search in checks:
+				if search(text) is not None:
+					out[i, j] = True
+		return out
+
+	def membership(self, df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+		"""OR the membership matrices of ``columns`` into a rows x places frame aligned to ``df``."""
+		out = np.zeros((len(df), len(self.places)), dtype=bool)
+		for col in columns:
+			if col in df.columns:
+				out |= self.match(df[col])
+		return pd.DataFrame(out, index=df.index, columns=self.places)
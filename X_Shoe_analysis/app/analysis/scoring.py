@@ -1,16 +1,285 @@
-from typing import Dict, List
+from typing import Any, Dict, Iterable, List
 
 import numpy as np
 import pandas as pd
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+from .matching import KeywordIndex
+from .sentiment import SentimentCache, get_analyzer, score_compound
+from .trend_features import keyword_features, place_trend_features
+# Re-exported: the summaries used to live here
+from .summary import describe_uncertainty, summarize_for_ppt  # noqa: F401
+
+try:
+	from app.instrumentation import instrumented, stage
+except ModuleNotFoundError:
+	from instrumentation import instrumented, stage
 
 
 def compute_sentiment_scores(texts: List[str]) -> pd.DataFrame:
-	analyzer = SentimentIntensityAnalyzer()
-	scores = [analyzer.polarity_scores(t or "") for t in texts]
+	analyzer = get_analyzer()
+	scores = [analyzer.polarity_scores(t if isinstance(t, str) else "") for t in texts]
 	return pd.DataFrame(scores)
 
 
+STAT_COLUMNS = ["view_count", "like_count", "comment_count"]
+
+# Components the composite score reads
+COMPONENT_COLUMNS = ["post_engagement", "post_sentiment", "comment_engagement", "comment_sentiment", *STAT_COLUMNS, "trend"]
+
+# Composite score weights; the defaults reproduce the original fixed heuristic
+DEFAULT_WEIGHTS: Dict[str, float] = {
+	"engagement": 0.6,
+	"sentiment": 0.2,
+	"trend": 0.2,
+	"engagement_scale": 10000.0,
+	"view": 0.001,
+	"like": 0.01,
+	"yt_comment": 0.1,
+	"post_sentiment": 0.6,
+	"comment_sentiment": 0.4,
+}
+
+
+def _post_texts(reddit_posts: pd.DataFrame) -> pd.Series:
+	# Compact frames carry this column prebuilt (storage.COMBINED_TEXT)
+	if "text" in reddit_posts.columns:
+		return reddit_posts["text"]
+	return reddit_posts["title"].fillna("") + ". " + reddit_posts["selftext"].fillna("")
+
+
+def _post_activity(reddit_posts: pd.DataFrame) -> np.ndarray:
+	# Each column goes to float first: compact frames hold them in narrow ints, whose sum could overflow
+	return reddit_posts["score"].fillna(0).to_numpy(dtype=float) + reddit_posts["num_comments"].fillna(0).to_numpy(dtype=float)
+
+
+def _stat_values(yt_stats: pd.DataFrame) -> np.ndarray:
+	return np.column_stack([yt_stats[c].fillna(0).to_numpy(dtype=float) if c in yt_stats.columns else np.zeros(len(yt_stats)) for c in STAT_COLUMNS])
+
+
+def _matched_compound(texts: pd.Series, members: pd.DataFrame, cache: SentimentCache | None, workers: int = 1) -> pd.Series:
+	# Score each row matched by any place exactly once; unmatched rows stay NaN
+	compound = pd.Series(np.nan, index=texts.index, dtype=float)
+	matched = members.any(axis=1).to_numpy()
+	if matched.any():
+		compound.loc[matched] = score_compound(texts.loc[matched].tolist(), cache=cache, workers=workers)
+	return compound
+
+
+class SourceRows:
+	"""The rows of one source that matched any place: membership (hits x places), per-row values
+	(hits x k) and the source's total row count. Unmatched rows contribute nothing to any total,
+	so they are not kept; resampling only needs to know how many there were. ``times`` (hits,
+	datetime64) are the rows' creation times where the source has them, for date-filtered views.
+	"""
+
+	def __init__(self, members: np.ndarray, values: np.ndarray, total_rows: int, times: np.ndarray | None = None):
+		self.members = members
+		self.values = values
+		self.total_rows = total_rows
+		self.times = times
+
+	@classmethod
+	def from_members(cls, members: pd.DataFrame, values: np.ndarray, times: np.ndarray | None = None) -> "SourceRows":
+		matrix = members.to_numpy(dtype=bool)
+		hit = matrix.any(axis=1)
+		return cls(matrix[hit], np.nan_to_num(np.asarray(values, dtype=float)[hit]), len(matrix), times[hit] if times is not None else None)
+
+	@classmethod
+	def empty(cls, places: int, k: int) -> "SourceRows":
+		return cls(np.zeros((0, places), dtype=bool), np.zeros((0, k)), 0, np.zeros(0, dtype="datetime64[ns]"))
+
+	def totals(self) -> np.ndarray:
+		# (places x hits) @ (hits x k) gives every per-place total of the source in one product
+		return self.members.T.astype(float) @ self.values
+
+
+def _created_times(rows: pd.DataFrame) -> np.ndarray | None:
+	if "created_utc" not in rows.columns:
+		return None
+	return pd.to_datetime(rows["created_utc"], unit="s", errors="coerce").to_numpy(dtype="datetime64[ns]")
+
+
+def _place_totals(members: pd.DataFrame, values: np.ndarray) -> np.ndarray:
+	return SourceRows.from_members(members, values).totals()
+
+
+def _source_values(engagement: np.ndarray, compound: pd.Series) -> np.ndarray:
+	# rows x [engagement, compound, 1]: totals give engagement sum, compound sum and matched rows
+	return np.column_stack([engagement, compound.to_numpy(dtype=float), np.ones(len(engagement))])
+
+
+def _source_totals(members: pd.DataFrame, engagement: np.ndarray, compound: pd.Series) -> np.ndarray:
+	# places x [engagement sum, compound sum, matched rows]; additive across chunks of a source
+	return _place_totals(members, _source_values(engagement, compound))
+
+
+def _safe_mean(sums: np.ndarray, counts: np.ndarray) -> np.ndarray:
+	return np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+
+
+def _components_from_totals(places: List[str], post_totals: np.ndarray, comment_totals: np.ndarray, stat_totals: np.ndarray, place_trends: pd.DataFrame) -> pd.DataFrame:
+	components = pd.DataFrame(index=pd.Index(places, name="place"))
+	components["post_engagement"] = post_totals[:, 0]
+	components["post_sentiment"] = _safe_mean(post_totals[:, 1], post_totals[:, 2])
+	components["comment_engagement"] = comment_totals[:, 0]
+	components["comment_sentiment"] = _safe_mean(comment_totals[:, 1], comment_totals[:, 2])
+	for i, col in enumerate(STAT_COLUMNS):
+		components[col] = stat_totals[:, i]
+	# Per-place Trends features (level is the 0-100 trend component; slope/growth/seasonality ride along)
+	return components.join(place_trends)
+
+
+def _stats_members(yt_videos: pd.DataFrame, yt_stats: pd.DataFrame, yt_members: pd.DataFrame) -> pd.DataFrame:
+	# A stats row belongs to a place if any matched video row shares its video_id
+	if yt_videos.empty or yt_stats.empty:
+		return pd.DataFrame(np.zeros((len(yt_stats), yt_members.shape[1]), dtype=bool), columns=yt_members.columns)
+	by_video = yt_members.groupby(yt_videos["video_id"].to_numpy()).any()
+	return by_video.reindex(yt_stats["video_id"].to_numpy(), fill_value=False).reset_index(drop=True)
+
+
+class PlaceSignals:
+	"""Per-row inputs of the place components: matched post, comment and YouTube stats rows plus
+	per-place Trends features. ``components()`` reduces them to the place x component frame;
+	``app.analysis.bootstrap`` resamples the same rows.
+	"""
+
+	def __init__(self, places: List[str], posts: SourceRows, comments: SourceRows, stats: SourceRows, place_trends: pd.DataFrame):
+		self.places = places
+		self.posts = posts
+		self.comments = comments
+		self.stats = stats
+		self.place_trends = place_trends
+
+	def components(self) -> pd.DataFrame:
+		return _components_from_totals(self.places, self.posts.totals(), self.comments.totals(), self.stats.totals(), self.place_trends)
+
+
+def place_signals(
+	reddit_posts: pd.DataFrame,
+	reddit_comments: pd.DataFrame,
+	yt_stats: pd.DataFrame,
+	place_trends: pd.DataFrame,
+	posts_members: pd.DataFrame,
+	comments_members: pd.DataFrame,
+	stats_members: pd.DataFrame,
+	post_compound: pd.Series,
+	comment_compound: pd.Series,
+) -> PlaceSignals:
+	places = list(posts_members.columns)
+	posts = SourceRows.from_members(posts_members, _source_values(_post_activity(reddit_posts), post_compound), _created_times(reddit_posts))
+	if not reddit_comments.empty:
+		comments = SourceRows.from_members(comments_members, _source_values(reddit_comments["score"].fillna(0).to_numpy(dtype=float), comment_compound), _created_times(reddit_comments))
+	else:
+		comments = SourceRows.empty(len(places), 3)
+	stats = SourceRows.from_members(stats_members, _stat_values(yt_stats))
+	return PlaceSignals(places, posts, comments, stats, place_trends)
+
+
+def resolve_weights(weights: Dict[str, float] | None = None) -> Dict[str, float]:
+	"""DEFAULT_WEIGHTS overridden by ``weights``; unknown names are rejected rather than ignored."""
+	weights = dict(weights or {})
+	unknown = sorted(set(weights) - set(DEFAULT_WEIGHTS))
+	if unknown:
+		raise ValueError(f"Unknown score weight(s): {', '.join(unknown)}")
+	return {**DEFAULT_WEIGHTS, **weights}
+
+
+def composite_parts(components: Any, weights: Dict[str, Any]) -> Dict[str, np.ndarray]:
+	"""Score and its parts from a place x component frame (or a mapping of component arrays).
+
+	Weights may be scalars (one weighting, arrays of length places) or (samples, 1) arrays, which
+	broadcast against the places to give samples x places arrays in one pass; (samples x places)
+	component arrays, as produced by bootstrap resampling, broadcast the same way.
+	"""
+	c = {col: np.asarray(components[col], dtype=float) for col in COMPONENT_COLUMNS}
+	reddit_engagement = c["post_engagement"] + c["comment_engagement"]
+	youtube_engagement = c["view_count"] * weights["view"] + c["like_count"] * weights["like"] + c["comment_count"] * weights["yt_comment"]
+	engagement = reddit_engagement + youtube_engagement
+	sentiment = c["post_sentiment"] * weights["post_sentiment"] + c["comment_sentiment"] * weights["comment_sentiment"]
+	trend = c["trend"]
+	score = (
+		np.tanh(engagement / weights["engagement_scale"]) * weights["engagement"]
+		+ ((sentiment + 1) / 2.0) * weights["sentiment"]
+		+ (trend / 100.0) * weights["trend"]
+	)
+	return {
+		"score": score,
+		"engagement": engagement,
+		"reddit_engagement": reddit_engagement,
+		"youtube_engagement": youtube_engagement,
+		"sentiment": sentiment,
+		"trend": trend,
+	}
+
+
+def combine_components(components: pd.DataFrame, weights: Dict[str, float] | None = None) -> pd.DataFrame:
+	"""Apply the composite score to a place x component frame (cheap; reweighting needs no re-extraction)."""
+	parts = composite_parts(components, resolve_weights(weights))
+	result = pd.DataFrame({"place": components.index.to_list(), **parts})
+	return result.sort_values("score", ascending=False)
+
+
+@instrumented("scoring.extract_signals")
+def extract_signals(
+	reddit_posts: pd.DataFrame,
+	reddit_comments: pd.DataFrame,
+	yt_videos: pd.DataFrame,
+	yt_stats: pd.DataFrame,
+	trends_df: pd.DataFrame,
+	location_keywords: Dict[str, List[str]],
+	sentiment_cache: SentimentCache | None = None,
+	sentiment_workers: int = 1,
+) -> PlaceSignals:
+	"""The expensive, weight-independent step: matching, sentiment and trend features per place.
+
+	Returns the matched per-row arrays; ``extract_components`` reduces them to place totals.
+	"""
+	# Scan every text column once for all places
+	with stage("scoring.match") as record:
+		index = KeywordIndex(location_keywords)
+		posts_members = index.membership(reddit_posts, ["title", "selftext"])
+		comments_members = index.membership(reddit_comments, ["body"])
+		yt_members = index.membership(yt_videos, ["title", "description"])
+		record.rows = len(reddit_posts) + len(reddit_comments) + len(yt_videos)
+	# One sentiment pass per matched row, shared by every place that matches it
+	with stage("scoring.sentiment") as record:
+		post_compound = _matched_compound(_post_texts(reddit_posts), posts_members, sentiment_cache, sentiment_workers)
+		comment_compound = _matched_compound(reddit_comments["body"].fillna(""), comments_members, sentiment_cache, sentiment_workers) if not reddit_comments.empty else pd.Series(dtype=float)
+		record.rows = int(post_compound.notna().sum() + comment_compound.notna().sum())
+	with stage("scoring.trend_features") as record:
+		place_trends = place_trend_features(keyword_features(trends_df), location_keywords)
+		record.rows = len(trends_df)
+	with stage("scoring.signals") as record:
+		signals = place_signals(
+			reddit_posts,
+			reddit_comments,
+			yt_stats,
+			place_trends,
+			posts_members,
+			comments_members,
+			_stats_members(yt_videos, yt_stats, yt_members),
+			post_compound,
+			comment_compound,
+		)
+		record.rows = len(signals.posts.members) + len(signals.comments.members) + len(signals.stats.members)
+		return signals
+
+
+def extract_components(
+	reddit_posts: pd.DataFrame,
+	reddit_comments: pd.DataFrame,
+	yt_videos: pd.DataFrame,
+	yt_stats: pd.DataFrame,
+	trends_df: pd.DataFrame,
+	location_keywords: Dict[str, List[str]],
+	sentiment_cache: SentimentCache | None = None,
+	sentiment_workers: int = 1,
+) -> pd.DataFrame:
+	signals = extract_signals(reddit_posts, reddit_comments, yt_videos, yt_stats, trends_df, location_keywords, sentiment_cache, sentiment_workers)
+	return signals.components()
+
+
+@instrumented("scoring.aggregate_signal")
 def aggregate_signal(
 	reddit_posts: pd.DataFrame,
 	reddit_comments: pd.DataFrame,
@@ -18,74 +287,68 @@ def aggregate_signal(
 	yt_stats: pd.DataFrame,
 	trends_df: pd.DataFrame,
 	location_keywords: Dict[str, List[str]],
+	sentiment_cache: SentimentCache | None = None,
+	sentiment_workers: int = 1,
+	weights: Dict[str, float] | None = None,
 ):
-	results: List[Dict[str, float]] = []  # type: ignore
-	for place, keywords in location_keywords.items():
-		# Reddit
-		posts_mask = reddit_posts["title"].str.contains("|".join(keywords), case=False, na=False) | reddit_posts["selftext"].str.contains("|".join(keywords), case=False, na=False)
-		posts_subset = reddit_posts.loc[posts_mask]
-		post_engagement = float(posts_subset["score"].sum() + posts_subset["num_comments"].sum())
-		post_sent = compute_sentiment_scores((posts_subset["title"] + ". " + posts_subset["selftext"]).tolist()) if not posts_subset.empty else pd.DataFrame()
-		post_sentiment = float(post_sent["compound"].mean()) if not post_sent.empty else 0.0
-
-		# Comments
-		if not reddit_comments.empty:
-			comments_mask = reddit_comments["body"].str.contains("|".join(keywords), case=False, na=False)
-			comments_subset = reddit_comments.loc[comments_mask]
-			comment_engagement = float(comments_subset["score"].sum())
-			comment_sent = compute_sentiment_scores(comments_subset["body"].tolist()) if not comments_subset.empty else pd.DataFrame()
-			comment_sentiment = float(comment_sent["compound"].mean()) if not comment_sent.empty else 0.0
-		else:
-			comment_engagement = 0.0
-			comment_sentiment = 0.0
-
-		# YouTube
-		if not yt_videos.empty:
-			yt_mask = yt_videos["title"].str.contains("|".join(keywords), case=False, na=False) | yt_videos["description"].str.contains("|".join(keywords), case=False, na=False)
-			videos_subset = yt_videos.loc[yt_mask]
-			stats_subset = yt_stats[yt_stats["video_id"].isin(videos_subset["video_id"])]
-			views = float(stats_subset["view_count"].sum())
-			likes = float(stats_subset["like_count"].sum())
-			comments_count = float(stats_subset["comment_count"].sum())
-		else:
-			views = likes = comments_count = 0.0
-
-		# Trends
-		trend_score = 0.0
-		if not trends_df.empty:
-			# Average all trend columns that exist for this keyword set
-			candidate_cols = [c for c in trends_df.columns if c not in ("date",)]
-			if candidate_cols:
-				trend_score = float(trends_df[candidate_cols].mean().mean())
-
-		# Combined normalized score (heuristic)
-		reddit_engagement = post_engagement + comment_engagement
-		youtube_engagement = views * 0.001 + likes * 0.01 + comments_count * 0.1
-		engagement = reddit_engagement + youtube_engagement
-		sentiment = post_sentiment * 0.6 + comment_sentiment * 0.4
-		score = np.tanh(engagement / 10000.0) * 0.6 + ((sentiment + 1) / 2.0) * 0.2 + (trend_score / 100.0) * 0.2
-		results.append({
-			"place": place,
-			"score": float(score),
-			"engagement": float(engagement),
-			"reddit_engagement": float(reddit_engagement),
-			"youtube_engagement": float(youtube_engagement),
-			"sentiment": float(sentiment),
-			"trend": float(trend_score),
-		})
-
-	return pd.DataFrame(results).sort_values("score", ascending=False)
-
-
-def summarize_for_ppt(result_df: pd.DataFrame) -> Dict[str, str]:
-	if result_df.empty:
-		return {"headline": "Insufficient data", "support": "Please run the analysis to populate results."}
-	best = result_df.iloc[0]
-	second = result_df.iloc[1] if len(result_df) > 1 else None
-	headline = f"Recommendation: {best['place']} first"
-	support = f"Highest composite fit score ({best['score']:.2f}), driven by engagement ({best['engagement']:.0f}) and positive sentiment ({best['sentiment']:.2f})."
-	if second is not None:
-		support += f" Next best: {second['place']} ({second['score']:.2f})."
-	return {"headline": headline, "support": support}
+	components = extract_components(reddit_posts, reddit_comments, yt_videos, yt_stats, trends_df, location_keywords, sentiment_cache, sentiment_workers)
+	return combine_components(components, weights)
 
 
+@instrumented("scoring.extract_components_streaming")
+def extract_components_streaming(
+	post_chunks: Iterable[pd.DataFrame],
+	comment_chunks: Iterable[pd.DataFrame],
+	yt_videos: pd.DataFrame,
+	yt_stats: pd.DataFrame,
+	trends_df: pd.DataFrame,
+	location_keywords: Dict[str, List[str]],
+	sentiment_cache: SentimentCache | None = None,
+	sentiment_workers: int = 1,
+) -> pd.DataFrame:
+	"""Same components as ``extract_components`` with Reddit posts and comments consumed chunk by chunk.
+
+	Only per-place running totals (engagement sum, compound sum, matched rows) are kept between
+	chunks, so memory is bounded by the chunk size rather than the corpus. YouTube and Trends
+	tables are small and are passed in whole.
+	"""
+	index = KeywordIndex(location_keywords)
+	places = index.places
+	post_totals = np.zeros((len(places), 3))
+	comment_totals = np.zeros((len(places), 3))
+	with stage("scoring.stream_posts") as record:
+		record.rows = 0
+		for chunk in post_chunks:
+			members = index.membership(chunk, ["title", "selftext"])
+			compound = _matched_compound(_post_texts(chunk), members, sentiment_cache, sentiment_workers)
+			post_totals += _source_totals(members, _post_activity(chunk), compound)
+			record.rows += len(chunk)
+	with stage("scoring.stream_comments") as record:
+		record.rows = 0
+		for chunk in comment_chunks:
+			if chunk.empty:
+				continue
+			members = index.membership(chunk, ["body"])
+			compound = _matched_compound(chunk["body"].fillna(""), members, sentiment_cache, sentiment_workers)
+			comment_totals += _source_totals(members, chunk["score"].fillna(0).to_numpy(dtype=float), compound)
+			record.rows += len(chunk)
+	yt_members = index.membership(yt_videos, ["title", "description"])
+	stat_totals = _place_totals(_stats_members(yt_videos, yt_stats, yt_members), _stat_values(yt_stats))
+	place_trends = place_trend_features(keyword_features(trends_df), location_keywords)
+	return _components_from_totals(places, post_totals, comment_totals, stat_totals, place_trends)
+
+
+@instrumented("scoring.aggregate_signal_streaming")
+def aggregate_signal_streaming(
+	post_chunks: Iterable[pd.DataFrame],
+	comment_chunks: Iterable[pd.DataFrame],
+	yt_videos: pd.DataFrame,
+	yt_stats: pd.DataFrame,
+	trends_df: pd.DataFrame,
+	location_keywords: Dict[str, List[str]],
+	sentiment_cache: SentimentCache | None = None,
+	sentiment_workers: int = 1,
+	weights: Dict[str, float] | None = None,
+) -> pd.DataFrame:
+	components = extract_components_streaming(post_chunks, comment_chunks, yt_videos, yt_stats, trends_df, location_keywords, sentiment_cache, sentiment_workers)
+	return combine_components(components, weights)
@@ -0,0 +1,70 @@
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from .scoring import DEFAULT_WEIGHTS, composite_parts
+
+# Weights scaled log-uniformly around their default in sample_weights
+SCALE_WEIGHTS = ["engagement_scale", "view", "like", "yt_comment"]
+
+
+def sample_weights(n: int = 5000, seed: int = 0, spread: float = 10.0) -> pd.DataFrame:
+	"""``n`` random weightings around DEFAULT_WEIGHTS, one row each.
+
+	The engagement/sentiment/trend weights are drawn from a flat Dirichlet (they sum to 1, as the
+	defaults do), the engagement scale and YouTube metric weights vary within a factor of
+	``spread`` either way, and the post/comment sentiment mix is uniform.
+	"""
+	rng = np.random.default_rng(seed)
+	top = rng.dirichlet(np.ones(3), size=n)
+	samples: Dict[str, np.ndarray] = {"engagement": top[:, 0], "sentiment": top[:, 1], "trend": top[:, 2]}
+	for key in SCALE_WEIGHTS:
+		samples[key] = DEFAULT_WEIGHTS[key] * spread ** rng.uniform(-1.0, 1.0, n)
+	mix = rng.uniform(0.0, 1.0, n)
+	samples["post_sentiment"] = mix
+	samples["comment_sentiment"] = 1.0 - mix
+	return pd.DataFrame(samples)[list(DEFAULT_WEIGHTS)]
+
+
+def sweep_scores(components: pd.DataFrame, weight_samples: pd.DataFrame) -> pd.DataFrame:
+	"""Composite score of every place under every weighting (samples x places) in one broadcast pass.
+
+	Columns missing from ``weight_samples`` stay at their default.
+	"""
+	unknown = sorted(set(weight_samples.columns) - set(DEFAULT_WEIGHTS))
+	if unknown:
+		raise ValueError(f"Unknown score weight(s): {', '.join(unknown)}")
+	weights = {
+		key: weight_samples[key].to_numpy(dtype=float)[:, None] if key in weight_samples.columns else value
+		for key, value in DEFAULT_WEIGHTS.items()
+	}
+	scores = composite_parts(components, weights)["score"]
+	scores = np.broadcast_to(scores, (len(weight_samples), len(components)))
+	return pd.DataFrame(scores, index=weight_samples.index, columns=components.index)
+
+
+def ranking_stability(scores: pd.DataFrame) -> pd.DataFrame:
+	"""Per place: share of weightings it ranks first, mean rank, and the 5th/50th/95th score percentiles."""
+	values = scores.to_numpy(dtype=float)
+	if values.size == 0:
+		return pd.DataFrame(columns=["place", "win_share", "mean_rank", "score_p05", "score_p50", "score_p95"])
+	ranks = (-values).argsort(axis=1).argsort(axis=1) + 1
+	wins = np.bincount(values.argmax(axis=1), minlength=values.shape[1])
+	p05, p50, p95 = np.percentile(values, [5, 50, 95], axis=0)
+	out = pd.DataFrame({
+		"place": scores.columns.to_list(),
+		"win_share": wins / len(values),
+		"mean_rank": ranks.mean(axis=0),
+		"score_p05": p05,
+		"score_p50": p50,
+		"score_p95": p95,
+	})
+	return out.sort_values(["win_share", "mean_rank"], ascending=[False, True]).reset_index(drop=True)
+
+
+def pairwise_share(scores: pd.DataFrame, first: str, second: str) -> float:
+	"""Share of weightings under which ``first`` scores strictly above ``second``."""
+	if scores.empty:
+		return float("nan")
+	return float((scores[first] > scores[second]).mean())
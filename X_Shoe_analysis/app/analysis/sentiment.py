@@ -0,0 +1,159 @@
+import atexit
+import hashlib
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+	from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+
+@lru_cache(maxsize=1)
+def get_analyzer() -> "SentimentIntensityAnalyzer":
+	# The analyzer parses its lexicon on construction; build it once per process, and only when
+	# something is actually scored (cached runs never import VADER)
+	from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+	return SentimentIntensityAnalyzer()
+
+
+def text_key(text: str) -> str:
+	return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class SentimentCache:
+	"""Content-hash -> VADER compound score, bounded LRU, optionally persisted as CSV."""
+
+	def __init__(self, path: str | None = None, max_entries: int = 200_000):
+		self.path = path
+		self.max_entries = max_entries
+		self._entries: "OrderedDict[str, float]" = OrderedDict()
+		self._dirty = False
+		if path and os.path.exists(path):
+			df = pd.read_csv(path, dtype={"key": str}, float_precision="round_trip")
+			self._entries.update(zip(df["key"], df["compound"].astype(float)))
+			self._trim()
+
+	def __len__(self) -> int:
+		return len(self._entries)
+
+	def get(self, key: str) -> float | None:
+		value = self._entries.get(key)
+		if value is not None:
+			self._entries.move_to_end(key)
+		return value
+
+	def put(self, key: str, value: float) -> None:
+		self._entries[key] = value
+		self._entries.move_to_end(key)
+		self._dirty = True
+		self._trim()
+
+	def _trim(self) -> None:
+		while len(self._entries) > self.max_entries:
+			self._entries.popitem(last=False)
+			self._dirty = True
+
+	def save(self) -> None:
+		if not self.path or not self._dirty:
+			return
+		os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+		df = pd.DataFrame({"key": list(self._entries.keys()), "compound": list(self._entries.values())})
+		tmp_path = self.path + ".tmp"
+		df.to_csv(tmp_path, index=False)
+		os.replace(tmp_path, self.path)
+		self._dirty = False
+
+
+def _score_chunk(texts: List[str]) -> List[float]:
+	# Runs inside pool workers too, on the analyzer their initializer built
+	analyzer = get_analyzer()
+	return [float(analyzer.polarity_scores(t)["compound"]) for t in texts]
+
+
+_pool: ProcessPoolExecutor | None = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _init_worker() -> None:
+	get_analyzer()
+
+
+def _shutdown_pool() -> None:
+	global _pool, _pool_workers
+	with _pool_lock:
+		if _pool is not None:
+			_pool.shutdown(cancel_futures=True)
+		_pool, _pool_workers = None, 0
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+	"""The shared scoring pool, created on first use and replaced only when ``workers`` changes.
+
+	Workers are started by a fork server (spawn where there is none), not forked from this
+	multi-threaded process, and each builds its analyzer once when it starts.
+	"""
+	global _pool, _pool_workers
+	with _pool_lock:
+		if _pool is None or _pool_workers != workers:
+			if _pool is not None:
+				_pool.shutdown(wait=False, cancel_futures=True)
+			method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+			_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method), initializer=_init_worker)
+			_pool_workers = workers
+		return _pool
+
+
+atexit.register(_shutdown_pool)
+
+
+def score_texts(texts: List[str], workers: int = 1, chunk_size: int | None = None, min_parallel: int = 2000) -> List[float]:
+	"""Compound score per text, in input order. ``workers > 1`` fans chunks out to the shared process pool."""
+	if not texts:
+		return []
+	if workers <= 1 or len(texts) < min_parallel:
+		return _score_chunk(texts)
+	if chunk_size is None:
+		# A few chunks per worker keeps the pool busy without paying pickling overhead per text
+		chunk_size = max(250, -(-len(texts) // (workers * 4)))
+	chunks = [texts[i : i + chunk_size] for i in range(0, len(texts), chunk_size)]
+	scores: List[float] = []
+	try:
+		for part in _get_pool(workers).map(_score_chunk, chunks):
+			scores.extend(part)
+	except BrokenProcessPool:
+		# A worker died; start a fresh pool on the next call instead of failing every one after
+		_shutdown_pool()
+		raise
+	return scores
+
+
+def score_compound(texts: List[str], cache: SentimentCache | None = None, workers: int = 1) -> np.ndarray:
+	"""VADER compound score per text, scoring each distinct uncached text once."""
+	out = np.empty(len(texts), dtype=float)
+	pending: Dict[str, str] = {}
+	positions: Dict[str, List[int]] = {}
+	for i, text in enumerate(texts):
+		text = text if isinstance(text, str) else ""
+		key = text_key(text)
+		cached = cache.get(key) if cache is not None else None
+		if cached is not None:
+			out[i] = cached
+			continue
+		pending.setdefault(key, text)
+		positions.setdefault(key, []).append(i)
+	values = score_texts(list(pending.values()), workers=workers)
+	for key, value in zip(pending, values):
+		out[positions[key]] = value
+		if cache is not None:
+			cache.put(key, value)
+	return out
@@ -0,0 +1,33 @@
+from typing import Dict
+
+import pandas as pd
+
+
+def describe_uncertainty(result_df: pd.DataFrame) -> str:
+	"""One sentence on how firm the leader is, from bootstrap columns if the result has them."""
+	if result_df.empty or "score_lo" not in result_df.columns:
+		return ""
+	best = result_df.iloc[0]
+	note = f"95% bootstrap interval {best['score_lo']:.2f}-{best['score_hi']:.2f}; ranks first in {best['win_share']:.0%} of resamples."
+	if len(result_df) > 1:
+		second = result_df.iloc[1]
+		if second["score_hi"] >= best["score_lo"]:
+			note += f" Its interval overlaps {second['place']}'s, so the lead is not yet decisive."
+	return note
+
+
+def summarize_for_ppt(result_df: pd.DataFrame) -> Dict[str, str]:
+	if result_df.empty:
+		return {"headline": "Insufficient data", "support": "Please run the analysis to populate results."}
+	best = result_df.iloc[0]
+	second = result_df.iloc[1] if len(result_df) > 1 else None
+	headline = f"Recommendation: {best['place']} first"
+	support = f"Highest composite fit score ({best['score']:.2f}), driven by engagement ({best['engagement']:.0f}) and positive sentiment ({best['sentiment']:.2f})."
+	if second is not None:
+		support += f" Next best: {second['place']} ({second['score']:.2f})."
+	note = describe_uncertainty(result_df)
+	if note:
+		support += " " + note
+	return {"headline": headline, "support": support}
+
+
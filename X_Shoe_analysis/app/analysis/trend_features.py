@@ -0,0 +1,84 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+FEATURE_COLUMNS = ["level", "slope", "growth", "seasonality"]
+
+
+def keyword_features(trends_df: pd.DataFrame, recent: int = 4, baseline: int = 12) -> pd.DataFrame:
+	"""Time-series features for every Trends column at once (keyword x feature).
+
+	- level: mean interest (the 0-100 value the composite score has always used)
+	- slope: least-squares change in interest per period
+	- growth: mean of the last ``recent`` periods over the mean of the ``baseline`` periods before them, minus 1
+	- seasonality: spread of the detrended, lightly smoothed series relative to its level
+	"""
+	if trends_df.empty:
+		return pd.DataFrame(columns=FEATURE_COLUMNS, dtype=float)
+	frame = trends_df.sort_values("date") if "date" in trends_df.columns else trends_df
+	values = frame.drop(columns=["date"], errors="ignore").apply(pd.to_numeric, errors="coerce")
+	if values.empty or values.shape[1] == 0:
+		return pd.DataFrame(columns=FEATURE_COLUMNS, dtype=float)
+	y = values.to_numpy(dtype=float)
+	level = np.nanmean(y, axis=0)
+
+	x = np.arange(len(y), dtype=float)
+	x_c = x - x.mean()
+	y_c = np.nan_to_num(y - level)
+	denom = float((x_c**2).sum()) or 1.0
+	slope = x_c @ y_c / denom
+
+	recent_mean = values.rolling(recent, min_periods=1).mean().iloc[-1].to_numpy(dtype=float)
+	baseline_mean = values.shift(recent).rolling(baseline, min_periods=1).mean().iloc[-1].to_numpy(dtype=float)
+	growth = np.divide(recent_mean, baseline_mean, out=np.ones_like(recent_mean), where=np.nan_to_num(baseline_mean) > 0) - 1.0
+
+	detrended = pd.DataFrame(y - (level + np.outer(x_c, slope)), index=values.index)
+	smoothed = detrended.rolling(recent, center=True, min_periods=1).mean().std(ddof=0).to_numpy(dtype=float)
+	seasonality = np.divide(smoothed, level, out=np.zeros_like(smoothed), where=level > 0)
+
+	return pd.DataFrame(
+		{"level": level, "slope": slope, "growth": np.nan_to_num(growth), "seasonality": np.nan_to_num(seasonality)},
+		index=pd.Index(values.columns, name="keyword"),
+	)
+
+
+def _place_columns(columns: List[str], location_keywords: Dict[str, List[str]]) -> Tuple[Dict[str, List[str]], List[str]]:
+	# Each place's own Trends columns (case-insensitive) and the remaining topic columns
+	by_name = {str(k).lower(): k for k in columns}
+	mapped = {place: [by_name[k.lower()] for k in kws if k.lower() in by_name] for place, kws in location_keywords.items()}
+	place_columns = {k for cols in mapped.values() for k in cols}
+	return mapped, [k for k in columns if k not in place_columns]
+
+
+def place_trend_features(features: pd.DataFrame, location_keywords: Dict[str, List[str]]) -> pd.DataFrame:
+	"""Average each place's own keyword features (matched case-insensitively to Trends columns).
+
+	Places without a location-specific Trends column fall back to the mean over the remaining
+	(topic) columns, which is the single global trend value used before per-place queries existed.
+	"""
+	places = list(location_keywords)
+	out = pd.DataFrame(0.0, index=pd.Index(places, name="place"), columns=[f"trend_{c}" if c != "level" else "trend" for c in FEATURE_COLUMNS])
+	if features.empty:
+		return out
+	mapped, topic_columns = _place_columns(list(features.index), location_keywords)
+	topic = features.loc[topic_columns]
+	fallback = (topic if not topic.empty else features).mean()
+	for place, cols in mapped.items():
+		row = features.loc[cols].mean() if cols else fallback
+		out.loc[place] = row[FEATURE_COLUMNS].to_numpy(dtype=float)
+	return out
+
+
+def place_trend_levels(trends_df: pd.DataFrame, location_keywords: Dict[str, List[str]]) -> pd.DataFrame:
+	"""Interest per date and place (date x place): the mean of the place's own columns, with the same
+	topic-column fallback as ``place_trend_features``."""
+	places = list(location_keywords)
+	if trends_df.empty or "date" not in trends_df.columns:
+		return pd.DataFrame(columns=places, index=pd.DatetimeIndex([], name="date"), dtype=float)
+	frame = trends_df.sort_values("date")
+	values = frame.drop(columns=["date"]).apply(pd.to_numeric, errors="coerce")
+	values.index = pd.DatetimeIndex(pd.to_datetime(frame["date"]), name="date")
+	mapped, topic_columns = _place_columns(list(values.columns), location_keywords)
+	fallback = values[topic_columns or list(values.columns)].mean(axis=1)
+	return pd.DataFrame({place: values[cols].mean(axis=1) if cols else fallback for place, cols in mapped.items()}, columns=places)
@@ -0,0 +1,108 @@
+"""Cities screened by the multi-city run: city -> Trends geo and place -> keywords.
+
+Run from X_Shoe_analysis/ to collect every city into data/cities/ and print the comparison:
+	python -m app.cities
+	python -m app.cities --cities my_cities.json --limit 100
+"""
+
+import argparse
+import json
+import os
+from typing import Any, Dict, List
+
+import pandas as pd
+
+try:
+	from app.analysis.comparison import compare_cities, extract_city_components
+	from app.analysis.sentiment import SentimentCache
+	from app.collection import run_city_collection, trends_store
+	from app.storage import DataStore
+except ModuleNotFoundError:
+	from analysis.comparison import compare_cities, extract_city_components
+	from analysis.sentiment import SentimentCache
+	from collection import run_city_collection, trends_store
+	from storage import DataStore
+
+CITIES: Dict[str, Dict[str, Any]] = {
+	"Chennai": {
+		"geo": "IN-TN",
+		"places": {
+			"Malls": ["Phoenix Marketcity Chennai", "VR Chennai", "Express Avenue", "Forum Vijaya Mall"],
+			"High Streets": ["T Nagar", "Nungambakkam", "Khader Nawaz Khan Road", "Anna Nagar"],
+		},
+	},
+	"Bangalore": {
+		"geo": "IN-KA",
+		"places": {
+			"Malls": ["Phoenix Marketcity Bangalore", "Orion Mall", "Mall of Asia", "UB City"],
+			"High Streets": ["Commercial Street", "Brigade Road", "Indiranagar", "Koramangala"],
+		},
+	},
+	"Mumbai": {
+		"geo": "IN-MH",
+		"places": {
+			"Malls": ["Phoenix Palladium", "Jio World Drive", "Infiniti Mall", "R City Mall"],
+			"High Streets": ["Linking Road", "Colaba Causeway", "Hill Road", "Fashion Street"],
+		},
+	},
+}
+DEFAULT_QUERIES = ["sneakers", "running shoes", "basketball shoes", "sportswear", "streetwear", "athleisure"]
+DEFAULT_SUBREDDITS = ["bangalore", "mumbai", "chennai", "india", "IndianStreetWear", "Sneakers"]
+
+
+def load_cities(path: str | None = None) -> Dict[str, Dict[str, Any]]:
+	"""CITIES, or the same structure read from a JSON file."""
+	if path is None:
+		return CITIES
+	with open(path, "r", encoding="utf-8") as f:
+		cities = json.load(f)
+	for city, spec in cities.items():
+		if "geo" not in spec or not spec.get("places"):
+			raise ValueError(f"City {city!r} needs a 'geo' and at least one place")
+	return cities
+
+
+def load_city_data(data_dir: str, cities: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+	"""The shared datasets of a multi-city run, with Trends per geo under "trends"."""
+	store = DataStore(data_dir)
+	frames: Dict[str, Any] = {name: store.read(name, compact=True) for name in ["reddit_posts", "reddit_comments", "youtube_videos", "youtube_stats"]}
+	frames["trends"] = {geo: trends_store(data_dir, geo).read("trends") for geo in {spec["geo"] for spec in cities.values()}}
+	return frames
+
+
+def score_cities(data_dir: str, cities: Dict[str, Dict[str, Any]], weights: Dict[str, float] | None = None, sentiment_workers: int = 1) -> pd.DataFrame:
+	frames = load_city_data(data_dir, cities)
+	sentiment_cache = SentimentCache(os.path.join(data_dir, "sentiment_cache.csv"))
+	components = extract_city_components(
+		frames["reddit_posts"],
+		frames["reddit_comments"],
+		frames["youtube_videos"],
+		frames["youtube_stats"],
+		frames["trends"],
+		cities,
+		sentiment_cache,
+		sentiment_workers,
+	)
+	sentiment_cache.save()
+	return compare_cities(components, weights)
+
+
+def main(argv: List[str] | None = None):
+	parser = argparse.ArgumentParser()
+	parser.add_argument("--cities", default=None, help="JSON file in the CITIES format (defaults to the built-in cities)")
+	parser.add_argument("--data-dir", default=os.path.join("data", "cities"))
+	parser.add_argument("--limit", type=int, default=150)
+	parser.add_argument("--workers", type=int, default=1, help="Sentiment worker processes")
+	parser.add_argument("--no-collect", action="store_true", help="Score what is stored in --data-dir")
+	args = parser.parse_args(argv)
+
+	cities = load_cities(args.cities)
+	if not args.no_collect:
+		outcome = run_city_collection(None, args.data_dir, cities, DEFAULT_QUERIES, DEFAULT_SUBREDDITS, args.limit)
+		for line in outcome["notes"] + outcome["warnings"]:
+			print(line)
+	print(score_cities(args.data_dir, cities, sentiment_workers=args.workers).to_string(index=False, float_format="{:.3f}".format))
+
+
+if __name__ == "__main__":
+	main()
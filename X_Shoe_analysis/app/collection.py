@@ -0,0 +1,206 @@
+import math
+import os
+from typing import Any, Callable, Dict, List
+
+import pandas as pd
+
+try:
+	from app.collectors.cache import RequestCache, normalize_params
+	from app.collectors.incremental import load_state, refresh_reddit_data, save_state, seed_state
+	from app.collectors.reddit import fetch_reddit_comments, fetch_reddit_posts
+	from app.collectors.trends import fetch_trends
+	from app.collectors.youtube import DAILY_QUOTA, QuotaMeter, fetch_video_stats, search_youtube_queries
+	from app.instrumentation import RunReport
+	from app.storage import DataStore
+except ModuleNotFoundError:
+	from collectors.cache import RequestCache, normalize_params
+	from collectors.incremental import load_state, refresh_reddit_data, save_state, seed_state
+	from collectors.reddit import fetch_reddit_comments, fetch_reddit_posts
+	from collectors.trends import fetch_trends
+	from collectors.youtube import DAILY_QUOTA, QuotaMeter, fetch_video_stats, search_youtube_queries
+	from instrumentation import RunReport
+	from storage import DataStore
+
+# Parameters each stored dataset was collected with; stored data is only reused while they match
+COLLECTED_FILE = "collected_params.json"
+# The single-city dashboard's city: its YouTube searches are "<topic> Chennai"
+DEFAULT_CITY = "Chennai"
+
+
+def has_api_keys() -> bool:
+	return bool(os.getenv("YOUTUBE_API_KEY") and os.getenv("REDDIT_CLIENT_ID") and os.getenv("REDDIT_CLIENT_SECRET"))
+
+
+def trends_queries(query_terms: List[str], places: Dict[str, List[str]]) -> List[str]:
+	# Place keywords are queried on Trends too so each place gets its own trend signal
+	return query_terms + [k for kws in places.values() for k in kws if k not in query_terms]
+
+
+def youtube_queries(query_terms: List[str], city_names: List[str]) -> List[str]:
+	# One search per topic and city, so no city crowds out the others as in a shared OR query ("|").
+	# Topic-major order: if the quota budget stops the run, every city has lost the same topics
+	return [f"{q} {city}" for q in query_terms for city in city_names]
+
+
+def youtube_query_limit(limit: int, city_names: List[str]) -> int:
+	"""Results per YouTube query: ``limit`` split across the cities, so a run fetches about as many
+	videos per topic as a single-city run (each query still costs at least one search page)."""
+	return max(1, math.ceil(limit / max(1, len(city_names))))
+
+
+def trends_plan(query_terms: List[str], cities: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
+	"""Trends queries per distinct geo: the topics plus the place keywords of every city in that geo."""
+	places_by_geo: Dict[str, Dict[str, List[str]]] = {}
+	for city, spec in cities.items():
+		places_by_geo.setdefault(spec["geo"], {}).update({f"{city} / {place}": kws for place, kws in spec["places"].items()})
+	return {geo: trends_queries(query_terms, places) for geo, places in places_by_geo.items()}
+
+
+def trends_store(data_dir: str, geo: str | None = None) -> DataStore:
+	"""Where the Trends of ``geo`` live: the data dir itself for single-city runs, ``trends/<geo>/`` under it for multi-city runs."""
+	return DataStore(data_dir if geo is None else os.path.join(data_dir, "trends", geo))
+
+
+def collection_params(query_terms: List[str], subreddits: List[str], cities: Dict[str, Dict[str, Any]], limit: int) -> Dict[str, Any]:
+	"""Normalized per-source parameters, as recorded in ``collected_params.json`` (Trends once per geo)."""
+	return {
+		"reddit": normalize_params({"query_terms": query_terms, "subreddits": subreddits, "limit": limit}),
+		"youtube": normalize_params({"queries": youtube_queries(query_terms, list(cities)), "limit": youtube_query_limit(limit, list(cities))}),
+		**{f"trends:{geo}": normalize_params({"queries": queries, "geo": geo}) for geo, queries in trends_plan(query_terms, cities).items()},
+	}
+
+
+def run_collection(
+	progress: Callable[[float, str], None] | None,
+	data_dir: str,
+	query_terms: List[str],
+	subreddits: List[str],
+	places: Dict[str, List[str]],
+	geo: str,
+	limit: int,
+	use_cached: bool = True,
+	incremental: bool = True,
+	trace_memory: bool = False,
+) -> Dict[str, Any]:
+	"""Collect Reddit, YouTube and Trends data for the dashboard's city into the store under ``data_dir``.
+
+	Each source is skipped when its stored data was collected with the same parameters (or when
+	there are no API keys and stored data exists); otherwise it is re-collected through the
+	request cache. Failures are reported per source, not raised. Takes the scheduler's
+	``progress(fraction, message)`` callback first so it can run as a JobScheduler job.
+	"""
+	cities = {DEFAULT_CITY: {"geo": geo, "places": places}}
+	return _collect(progress, data_dir, cities, query_terms, subreddits, limit, use_cached, incremental, trace_memory, per_geo=False)
+
+
+def run_city_collection(
+	progress: Callable[[float, str], None] | None,
+	data_dir: str,
+	cities: Dict[str, Dict[str, Any]],
+	query_terms: List[str],
+	subreddits: List[str],
+	limit: int,
+	use_cached: bool = True,
+	incremental: bool = True,
+	trace_memory: bool = False,
+) -> Dict[str, Any]:
+	"""``run_collection`` for several cities (city -> {"geo", "places"}) sharing one collection.
+
+	Reddit is searched once per subreddit for all cities and Trends once per distinct geo (stored
+	under ``trends/<geo>/``); each city picks its rows out of the shared data when scored. YouTube
+	is searched per topic and city with the result limit split across the cities, which costs one
+	search.list call (100 units) per query at least: 6 topics x 12 cities is 7,200 units against
+	1,800 for one city at the default limit. The run stops searching before YOUTUBE_QUOTA_BUDGET
+	(default: the 10,000-unit daily quota) would be exceeded, and says so in its warnings.
+	"""
+	return _collect(progress, data_dir, cities, query_terms, subreddits, limit, use_cached, incremental, trace_memory, per_geo=True)
+
+
+def _collect(
+	progress: Callable[[float, str], None] | None,
+	data_dir: str,
+	cities: Dict[str, Dict[str, Any]],
+	query_terms: List[str],
+	subreddits: List[str],
+	limit: int,
+	use_cached: bool,
+	incremental: bool,
+	trace_memory: bool,
+	per_geo: bool,
+) -> Dict[str, Any]:
+	progress = progress or (lambda fraction, message="": None)
+	store = DataStore(data_dir)
+	report = RunReport(trace_memory=trace_memory)
+	has_keys = has_api_keys()
+	params = collection_params(query_terms, subreddits, cities, limit)
+	collected_path = os.path.join(data_dir, COLLECTED_FILE)
+	collected = load_state(collected_path)
+	notes: List[str] = []
+	warnings: List[str] = []
+
+	def needs_collection(source: str, dataset: str, dataset_store: DataStore = store) -> bool:
+		if not (use_cached and dataset_store.exists(dataset)):
+			return True
+		# Without API keys the stored data is all there is; with keys, changed inputs re-collect
+		# through the request cache, which only calls the APIs for requests it has not seen
+		return has_keys and collected.get(source) != params[source]
+
+	os.makedirs(data_dir, exist_ok=True)
+	request_cache = RequestCache(os.path.join(data_dir, "request_cache"))
+	if not use_cached:
+		# Fresh API calls for everything: every cached response counts as expired (and is replaced)
+		request_cache.ttls = dict.fromkeys(request_cache.ttls, 0)
+
+	with report.activate():
+		progress(0.0, "Collecting Reddit")
+		if needs_collection("reddit", "reddit_posts"):
+			try:
+				if incremental:
+					refresh_reddit_data(data_dir, query_terms=query_terms, subreddits=subreddits, limit=limit, cache=request_cache)
+				else:
+					posts = fetch_reddit_posts(query_terms=query_terms, subreddits=subreddits, limit=limit, cache=request_cache)
+					comments = fetch_reddit_comments(posts["id"].tolist()[:20], cache=request_cache) if not posts.empty else pd.DataFrame()
+					store.write("reddit_posts", posts)
+					if not comments.empty:
+						store.write("reddit_comments", comments)
+					seed_state(data_dir, query_terms, subreddits, posts)
+				collected["reddit"] = params["reddit"]
+			except Exception as e:
+				warnings.append(f"Reddit collection failed: {e}")
+
+		progress(1 / 3, "Collecting YouTube")
+		if needs_collection("youtube", "youtube_videos"):
+			try:
+				yt_quota = QuotaMeter(budget=int(os.getenv("YOUTUBE_QUOTA_BUDGET", DAILY_QUOTA)))
+				ytv = search_youtube_queries(youtube_queries(query_terms, list(cities)), max_results=youtube_query_limit(limit, list(cities)), quota=yt_quota, cache=request_cache)
+				yts = fetch_video_stats(ytv["video_id"].dropna().unique().tolist(), quota=yt_quota, cache=request_cache) if not ytv.empty else pd.DataFrame()
+				notes.append(f"YouTube quota used this run: {yt_quota.units} units ({len(ytv)} videos, {len(yts)} with stats)")
+				if yt_quota.exhausted:
+					warnings.append(f"YouTube quota budget of {yt_quota.budget} units reached; the remaining searches were skipped (set YOUTUBE_QUOTA_BUDGET to change it)")
+				if not ytv.empty:
+					store.write("youtube_videos", ytv)
+				if not yts.empty:
+					store.write("youtube_stats", yts)
+				collected["youtube"] = params["youtube"]
+			except Exception as e:
+				warnings.append(f"YouTube collection failed: {e}")
+
+		plan = trends_plan(query_terms, cities)
+		for i, (geo, queries) in enumerate(plan.items()):
+			progress(2 / 3 + i / (3 * len(plan)), f"Collecting Google Trends ({geo})")
+			geo_store = trends_store(data_dir, geo if per_geo else None)
+			if needs_collection(f"trends:{geo}", "trends", geo_store):
+				try:
+					trends = fetch_trends(queries=queries, geo=geo, cache=request_cache)
+					if not trends.empty:
+						geo_store.write("trends", trends)
+					collected[f"trends:{geo}"] = params[f"trends:{geo}"]
+				except Exception as e:
+					warnings.append(f"Trends collection failed for {geo}: {e}")
+
+	request_cache.flush()
+	save_state(collected_path, collected)
+	if request_cache.hits or request_cache.misses:
+		notes.append(f"API request cache: {request_cache.hits} hits, {request_cache.misses} misses")
+	report.save(data_dir)
+	return {"notes": notes, "warnings": warnings, "seconds": round(sum(s.seconds for s in report.stages if s.depth == 0), 3)}
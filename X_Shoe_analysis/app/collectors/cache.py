@@ -0,0 +1,151 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict
+
+# Seconds a cached response stays fresh, per collector; unknown collectors use DEFAULT_TTL
+SOURCE_TTLS: Dict[str, int] = {
+	"reddit.search": 6 * 3600,
+	"reddit.comments": 3600,
+	"youtube.search": 24 * 3600,
+	"youtube.videos": 6 * 3600,
+	"trends.interest": 24 * 3600,
+}
+DEFAULT_TTL = 3600
+INDEX_FILE = "index.json"
+# Parameters holding search terms, matched regardless of whitespace and case
+TEXT_PARAMS = {"query", "query_terms", "queries", "batch"}
+
+
+def normalize_params(value: Any, text: bool = False) -> Any:
+	"""Canonical form of request parameters: sorted mapping keys, and trimmed, case-folded free text
+	(the values of TEXT_PARAMS). Identifiers such as video and post ids, subreddits and geos are
+	kept exactly: YouTube ids differing only in case are different videos."""
+	if isinstance(value, str):
+		return " ".join(value.split()).casefold() if text else value
+	if isinstance(value, dict):
+		return {str(k): normalize_params(v, text or k in TEXT_PARAMS) for k, v in sorted(value.items())}
+	if isinstance(value, (list, tuple)):
+		return [normalize_params(v, text) for v in value]
+	return value
+
+
+def request_key(collector: str, params: Dict[str, Any], window: Any = None) -> str:
+	spec = {"collector": collector, "params": normalize_params(params), "window": normalize_params(window, text=True)}
+	return hashlib.sha1(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class RequestCache:
+	"""Request-level cache of raw collector responses shared by all collectors.
+
+	Each request is keyed by collector, normalized parameters and time window. Payloads (any JSON
+	value) are gzip-compressed and stored once per distinct content under ``blobs/<sha1>.json.gz``,
+	so requests that return identical data share one file. ``index.json`` maps request keys to
+	blobs with their store and last-access times; entries expire after their collector's TTL, and
+	least recently used entries are evicted once the blobs exceed ``max_bytes``.
+	"""
+
+	def __init__(self, cache_dir: str, max_bytes: int = 256 * 2**20, ttls: Dict[str, int] | None = None):
+		self.cache_dir = cache_dir
+		self.max_bytes = max_bytes
+		self.ttls = {**SOURCE_TTLS, **(ttls or {})}
+		self.hits = 0
+		self.misses = 0
+		self._lock = threading.Lock()
+		self._index = self._load_index()
+
+	def _index_path(self) -> str:
+		return os.path.join(self.cache_dir, INDEX_FILE)
+
+	def _blob_path(self, digest: str) -> str:
+		return os.path.join(self.cache_dir, "blobs", f"{digest}.json.gz")
+
+	def _load_index(self) -> Dict[str, Dict[str, Any]]:
+		path = self._index_path()
+		if not os.path.exists(path):
+			return {}
+		try:
+			with open(path, encoding="utf-8") as f:
+				return json.load(f)
+		except (OSError, ValueError):
+			# A damaged index only costs refetches
+			return {}
+
+	def _save_index(self) -> None:
+		os.makedirs(self.cache_dir, exist_ok=True)
+		tmp_path = self._index_path() + f".{os.getpid()}.{threading.get_ident()}.tmp"
+		with open(tmp_path, "w", encoding="utf-8") as f:
+			json.dump(self._index, f)
+		os.replace(tmp_path, self._index_path())
+
+	def get(self, collector: str, params: Dict[str, Any], window: Any = None) -> Any:
+		"""The cached payload, or None when missing or older than the collector's TTL."""
+		key = request_key(collector, params, window)
+		with self._lock:
+			entry = self._index.get(key)
+			fresh = entry is not None and time.time() - entry["stored_at"] < self.ttls.get(collector, DEFAULT_TTL)
+			path = self._blob_path(entry["blob"]) if fresh else None
+			if path is None or not os.path.exists(path):
+				self.misses += 1
+				return None
+			entry["last_access"] = time.time()
+			self.hits += 1
+		with gzip.open(path, "rt", encoding="utf-8") as f:
+			return json.load(f)
+
+	def put(self, collector: str, params: Dict[str, Any], payload: Any, window: Any = None) -> None:
+		data = json.dumps(payload, sort_keys=True).encode("utf-8")
+		digest = hashlib.sha1(data).hexdigest()
+		path = self._blob_path(digest)
+		if not os.path.exists(path):
+			os.makedirs(os.path.dirname(path), exist_ok=True)
+			tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+			with gzip.open(tmp_path, "wb") as f:
+				f.write(data)
+			os.replace(tmp_path, path)
+		now = time.time()
+		with self._lock:
+			self._index[request_key(collector, params, window)] = {
+				"collector": collector,
+				"blob": digest,
+				"size": os.path.getsize(path),
+				"stored_at": now,
+				"last_access": now,
+			}
+			self._evict()
+			self._save_index()
+
+	def flush(self) -> None:
+		"""Persist last-access times recorded by ``get`` (``put`` persists on its own)."""
+		with self._lock:
+			self._save_index()
+
+	def _evict(self) -> None:
+		# Blob sizes count once however many requests share them
+		sizes = {e["blob"]: e["size"] for e in self._index.values()}
+		refs = Counter(e["blob"] for e in self._index.values())
+		total = sum(sizes.values())
+		for key, entry in sorted(self._index.items(), key=lambda item: item[1]["last_access"]):
+			if total <= self.max_bytes:
+				break
+			del self._index[key]
+			refs[entry["blob"]] -= 1
+			if refs[entry["blob"]] == 0:
+				total -= sizes[entry["blob"]]
+				try:
+					os.remove(self._blob_path(entry["blob"]))
+				except OSError:
+					pass
+
+	def cached(self, collector: str, params: Dict[str, Any], fetch: Callable[[], Any], window: Any = None) -> Any:
+		"""``get`` or, on a miss, ``fetch()`` and ``put`` its payload (None payloads are not stored)."""
+		payload = self.get(collector, params, window)
+		if payload is None:
+			payload = fetch()
+			if payload is not None:
+				self.put(collector, params, payload, window)
+		return payload
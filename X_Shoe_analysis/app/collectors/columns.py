@@ -0,0 +1,32 @@
+from typing import Any, Dict, List
+
+# Collector results as one list per column (also the cached JSON payload), never a dict per row
+Columns = Dict[str, List[Any]]
+
+
+def new_columns(names: List[str]) -> Columns:
+	return {name: [] for name in names}
+
+
+def num_rows(columns: Columns) -> int:
+	return len(next(iter(columns.values()), []))
+
+
+def as_columns(payload: Any, names: List[str]) -> Columns:
+	"""Columns from a cached payload; lists of row dicts cached by earlier versions are converted."""
+	if isinstance(payload, dict):
+		return {name: list(payload.get(name, [])) for name in names}
+	return {name: [row.get(name) for row in payload] for name in names}
+
+
+def extend_columns(target: Columns, part: Columns) -> None:
+	for name, values in target.items():
+		values.extend(part[name])
+
+
+def take(columns: Columns, rows: List[int]) -> Columns:
+	return {name: [values[i] for i in rows] for name, values in columns.items()}
+
+
+def head(columns: Columns, n: int) -> Columns:
+	return {name: values[:n] for name, values in columns.items()}
@@ -0,0 +1,130 @@
+import json
+import os
+import time
+from typing import Any, Dict, List, Tuple
+
+import pandas as pd
+
+from .cache import RequestCache, request_key
+from .reddit import RateLimiter, client_pool, fetch_reddit_comments, fetch_reddit_posts
+
+try:
+	from app.instrumentation import instrumented
+	from app.storage import DataStore
+except ModuleNotFoundError:
+	from instrumentation import instrumented
+	from storage import DataStore
+
+STATE_FILE = "reddit_state.json"
+
+
+def load_state(path: str) -> Dict[str, Any]:
+	if not os.path.exists(path):
+		return {}
+	with open(path, encoding="utf-8") as f:
+		return json.load(f)
+
+
+def save_state(path: str, state: Dict[str, Any]) -> None:
+	tmp_path = path + ".tmp"
+	with open(tmp_path, "w", encoding="utf-8") as f:
+		json.dump(state, f, indent=2, sort_keys=True)
+	os.replace(tmp_path, path)
+
+
+def _high_water_marks(df: pd.DataFrame, key: str) -> Dict[str, int]:
+	if df.empty or key not in df.columns or "created_utc" not in df.columns:
+		return {}
+	return {str(k): int(v) for k, v in df.groupby(key)["created_utc"].max().items()}
+
+
+def query_fingerprint(query_terms: List[str], subreddits: List[str]) -> str:
+	"""Identifies what a Reddit store was collected for: the OR-query and the set of subreddits."""
+	return request_key("reddit.store", {"query": " OR ".join(query_terms), "subreddits": sorted(subreddits)})
+
+
+def seed_state(data_dir: str, query_terms: List[str], subreddits: List[str], posts: pd.DataFrame) -> None:
+	"""Record the marks of a full pull, so the next incremental run continues from it."""
+	marks = _high_water_marks(posts, "subreddit")
+	save_state(os.path.join(data_dir, STATE_FILE), {"fingerprint": query_fingerprint(query_terms, subreddits), "query": " OR ".join(query_terms), "subreddits": marks, "updated_at": int(time.time())})
+
+
+def merge_dedup(existing: pd.DataFrame, new: pd.DataFrame, key: str) -> pd.DataFrame:
+	"""Append ``new`` to ``existing``, keeping the latest copy of each ``key``."""
+	if new.empty:
+		return existing
+	if existing.empty:
+		return new.reset_index(drop=True)
+	merged = pd.concat([existing, new], ignore_index=True)
+	return merged.drop_duplicates(subset=[key], keep="last").reset_index(drop=True)
+
+
+@instrumented("reddit.refresh_incremental")
+def refresh_reddit_data(
+	data_dir: str,
+	query_terms: List[str],
+	subreddits: List[str],
+	limit: int = 200,
+	comment_posts: int = 20,
+	active_window: int = 2 * 86400,
+	max_workers: int = 4,
+	reddit: Any = None,
+	cache: RequestCache | None = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+	"""Pull only posts/comments newer than the stored high-water marks and merge them into the store.
+
+	Post marks are kept per subreddit in ``reddit_state.json`` together with the fingerprint of the
+	query terms and subreddits they were collected for. When it differs (or is missing), the stored
+	posts and comments are dropped and every subreddit starts from a full search again. Comments
+	are polled for the new posts plus stored posts younger than ``active_window`` seconds, and
+	only comments newer than each post's latest stored comment are kept. ``cache`` serves the
+	full (unmarked) searches and comment listings; incremental requests always go to the API.
+	A subreddit whose newest-first listing ends before its mark gets a full search as well.
+	"""
+	store = DataStore(data_dir)
+	state_path = os.path.join(data_dir, STATE_FILE)
+	posts = store.read("reddit_posts")
+	comments = store.read("reddit_comments")
+
+	query = " OR ".join(query_terms)
+	fingerprint = query_fingerprint(query_terms, subreddits)
+	state = load_state(state_path)
+	reset = state.get("fingerprint") != fingerprint
+	if reset:
+		# Rows of another query (or of unknown provenance) would otherwise survive every merge
+		posts, comments, marks = pd.DataFrame(), pd.DataFrame(), {}
+	else:
+		marks = {k: int(v) for k, v in state.get("subreddits", {}).items()}
+
+	# Posts and comments draw on one pool, so worker clients (and their tokens) are reused
+	reddit = client_pool(reddit)
+	throttle = RateLimiter()
+	since = {s: marks[s] for s in subreddits if s in marks}
+	truncated: List[str] = []
+	new_posts = fetch_reddit_posts(query_terms, subreddits, limit=limit, max_workers=max_workers, reddit=reddit, throttle=throttle, since=since, cache=cache, truncated=truncated)
+	if truncated:
+		# Posts between the listing's end and the mark are out of reach of "new"; a fresh (uncached)
+		# full search covers them as far as a first pull would
+		full = fetch_reddit_posts(query_terms, truncated, limit=limit, max_workers=max_workers, reddit=reddit, throttle=throttle)
+		new_posts = merge_dedup(new_posts, full, "id")
+
+	poll_ids: List[str] = new_posts["id"].tolist()[:comment_posts] if not new_posts.empty else []
+	if not posts.empty:
+		recent = posts.loc[posts["created_utc"] >= time.time() - active_window, "id"]
+		poll_ids += [pid for pid in recent.astype(str) if pid not in poll_ids]
+	new_comments = pd.DataFrame()
+	if poll_ids:
+		comment_marks = _high_water_marks(comments, "post_id")
+		new_comments = fetch_reddit_comments(poll_ids, max_workers=max_workers, reddit=reddit, throttle=throttle, since=comment_marks, cache=cache)
+
+	posts = merge_dedup(posts, new_posts, "id")
+	comments = merge_dedup(comments, new_comments, "comment_id")
+	marks.update({s: max(marks.get(s, 0), v) for s, v in _high_water_marks(new_posts, "subreddit").items()})
+
+	os.makedirs(data_dir, exist_ok=True)
+	if reset or not posts.empty:
+		store.write("reddit_posts", posts)
+	if reset or not comments.empty:
+		store.write("reddit_comments", comments)
+	save_state(state_path, {"fingerprint": fingerprint, "query": query, "subreddits": marks, "updated_at": int(time.time())})
+	return posts, comments
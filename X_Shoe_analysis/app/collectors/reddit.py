@@ -1,11 +1,31 @@
 import os
-from typing import List, Dict, Any
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, TypeVar
 
 import pandas as pd
-import praw
 
+from .cache import RequestCache
+from .columns import Columns, as_columns, extend_columns, head, new_columns, num_rows, take
+
+try:
+	from app.instrumentation import instrumented
+except ModuleNotFoundError:
+	from instrumentation import instrumented
+
+if TYPE_CHECKING:
+	import praw
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def _create_reddit_client() -> "praw.Reddit":
+	# praw is only imported once a collection actually needs the API
+	import praw
 
-def _create_reddit_client() -> praw.Reddit:
 	client_id = os.getenv("REDDIT_CLIENT_ID")
 	client_secret = os.getenv("REDDIT_CLIENT_SECRET")
 	user_agent = os.getenv("REDDIT_USER_AGENT", "x-shoe-analysis/0.1")
@@ -18,46 +38,211 @@ def _create_reddit_client() -> praw.Reddit:
 	)
 
 
-def fetch_reddit_posts(query_terms: List[str], subreddits: List[str], limit: int = 200) -> pd.DataFrame:
-	reddit = _create_reddit_client()
-	rows: List[Dict[str, Any]] = []
+class RateLimiter:
+	"""Spaces request starts across threads and waits for the window reset when Reddit's quota runs low."""
+
+	def __init__(self, min_interval: float = 0.6, reserve: int = 5):
+		self.min_interval = min_interval
+		self.reserve = reserve
+		self._lock = threading.Lock()
+		self._next_at = 0.0
+
+	def wait(self, reddit: Any = None) -> None:
+		with self._lock:
+			delay = self._next_at - time.monotonic()
+			# praw exposes the X-Ratelimit-* headers of the last response here
+			limits = getattr(getattr(reddit, "auth", None), "limits", None) or {}
+			remaining, reset_at = limits.get("remaining"), limits.get("reset_timestamp")
+			if remaining is not None and reset_at is not None and remaining <= self.reserve:
+				delay = max(delay, reset_at - time.time())
+			if delay > 0:
+				time.sleep(delay)
+			self._next_at = time.monotonic() + self.min_interval
+
+
+class ClientPool:
+	"""Hands each worker thread a Reddit client of its own: praw.Reddit (its requests session and
+	token) is not thread-safe.
+
+	Clients come from ``factory`` on demand and are reused once returned. A pool over one given
+	``client`` has no factory, so its users take turns instead.
+	"""
+
+	def __init__(self, factory: Callable[[], Any] | None = None, client: Any = None):
+		self._factory = factory if client is None else None
+		self._idle: List[Any] = [] if client is None else [client]
+		self._returned = threading.Condition()
+
+	@contextmanager
+	def checkout(self) -> Iterator[Any]:
+		with self._returned:
+			while not self._idle and self._factory is None:
+				self._returned.wait()
+			client = self._idle.pop() if self._idle else None
+		if client is None:
+			client = self._factory()
+		try:
+			yield client
+		finally:
+			with self._returned:
+				self._idle.append(client)
+				self._returned.notify()
+
+
+def client_pool(reddit: Any = None) -> ClientPool:
+	"""``reddit`` as a ClientPool: as is, a pool sharing that one client, or (None) a pool of new clients."""
+	if isinstance(reddit, ClientPool):
+		return reddit
+	return ClientPool(client=reddit) if reddit is not None else ClientPool(_create_reddit_client)
+
+
+def _map_ordered(fn: Callable[[T], R], items: List[T], max_workers: int) -> List[R]:
+	# Results come back in input order regardless of which request finishes first
+	if max_workers <= 1 or len(items) <= 1:
+		return [fn(item) for item in items]
+	with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+		return list(pool.map(fn, items))
+
+
+POST_COLUMNS = ["id", "subreddit", "title", "selftext", "score", "num_comments", "created_utc", "url"]
+COMMENT_COLUMNS = ["post_id", "comment_id", "body", "score", "created_utc"]
+
+
+def _append_post(columns: Columns, post: Any, subreddit: str, created_utc: int) -> None:
+	columns["id"].append(post.id)
+	columns["subreddit"].append(subreddit)
+	columns["title"].append(post.title or "")
+	columns["selftext"].append(post.selftext or "")
+	columns["score"].append(int(getattr(post, "score", 0) or 0))
+	columns["num_comments"].append(int(getattr(post, "num_comments", 0) or 0))
+	columns["created_utc"].append(created_utc)
+	columns["url"].append(post.url)
+
+
+def _created_utc(item: Any) -> int:
+	return int(getattr(item, "created_utc", 0) or 0)
+
+
+def _time_filter_since(created_utc: int) -> str:
+	# Narrowest search window that still reaches back to the high-water mark
+	age = time.time() - created_utc
+	for time_filter, span in (("hour", 3600), ("day", 86400), ("week", 7 * 86400), ("month", 31 * 86400)):
+		if age < span:
+			return time_filter
+	return "year"
+
+
+def _append_comment(columns: Columns, comment: Any, post_id: str) -> None:
+	columns["post_id"].append(post_id)
+	columns["comment_id"].append(comment.id)
+	columns["body"].append(getattr(comment, "body", "") or "")
+	columns["score"].append(int(getattr(comment, "score", 0) or 0))
+	columns["created_utc"].append(_created_utc(comment))
+
+
+@instrumented("reddit.fetch_posts")
+def fetch_reddit_posts(
+	query_terms: List[str],
+	subreddits: List[str],
+	limit: int = 200,
+	max_workers: int = 4,
+	reddit: Any = None,
+	throttle: RateLimiter | None = None,
+	since: Dict[str, int] | None = None,
+	cache: RequestCache | None = None,
+	truncated: List[str] | None = None,
+) -> pd.DataFrame:
+	"""Search each subreddit; with ``since`` (subreddit -> created_utc), only return newer posts.
+
+	Incremental searches page past ``limit`` until they reach the mark. A listing that ends first
+	(Reddit serves only so many results) may have skipped posts; those subreddits are appended to
+	``truncated``, and their marks should not be advanced.
+
+	``reddit`` is a client or a ClientPool (see ``client_pool``); workers never share a client.
+
+	With ``cache``, each full search is cached under its subreddit and the joined OR-query, so
+	cached and uncached runs return the same posts. Incremental searches (subreddits in
+	``since``) always go to the API.
+	"""
+	clients = client_pool(reddit)
+	throttle = throttle or RateLimiter()
 	query = " OR ".join(query_terms)
-	for subreddit in subreddits:
-		subreddit_ref = reddit.subreddit(subreddit)
-		for post in subreddit_ref.search(query, limit=limit, sort="relevance", time_filter="year"):
-			rows.append(
-				{
-					"id": post.id,
-					"subreddit": subreddit,
-					"title": post.title or "",
-					"selftext": post.selftext or "",
-					"score": int(getattr(post, "score", 0) or 0),
-					"num_comments": int(getattr(post, "num_comments", 0) or 0),
-					"created_utc": int(getattr(post, "created_utc", 0) or 0),
-					"url": post.url,
-				}
-			)
-	return pd.DataFrame(rows)
-
-
-def fetch_reddit_comments(post_ids: List[str], limit_per_post: int = 200) -> pd.DataFrame:
-	reddit = _create_reddit_client()
-	rows: List[Dict[str, Any]] = []
-	for pid in post_ids:
-		post = reddit.submission(id=pid)
-		post.comments.replace_more(limit=0)
-		for i, comment in enumerate(post.comments.list()):
-			if i >= limit_per_post:
-				break
-			rows.append(
-				{
-					"post_id": pid,
-					"comment_id": comment.id,
-					"body": getattr(comment, "body", "") or "",
-					"score": int(getattr(comment, "score", 0) or 0),
-					"created_utc": int(getattr(comment, "created_utc", 0) or 0),
-				}
-			)
-	return pd.DataFrame(rows)
+	since = since or {}
+
+	def search(subreddit: str, q: str) -> Columns:
+		columns = new_columns(POST_COLUMNS)
+		with clients.checkout() as reddit:
+			throttle.wait(reddit)
+			for post in reddit.subreddit(subreddit).search(q, limit=limit, sort="relevance", time_filter="year"):
+				_append_post(columns, post, subreddit, _created_utc(post))
+		return columns
+
+	def collect(subreddit: str) -> Columns:
+		mark = since.get(subreddit)
+		if mark is None and cache is not None:
+			params = {"subreddit": subreddit, "query": query, "limit": limit, "sort": "relevance"}
+			return as_columns(cache.cached("reddit.search", params, lambda: search(subreddit, query), window="year"), POST_COLUMNS)
+		if mark is None:
+			return search(subreddit, query)
+		# Newest first, so stop at the first post we already have
+		columns = new_columns(POST_COLUMNS)
+		reached = False
+		with clients.checkout() as reddit:
+			throttle.wait(reddit)
+			for post in reddit.subreddit(subreddit).search(query, limit=None, sort="new", time_filter=_time_filter_since(mark)):
+				created_utc = _created_utc(post)
+				if created_utc <= mark:
+					reached = True
+					break
+				_append_post(columns, post, subreddit, created_utc)
+		if not reached and num_rows(columns) and truncated is not None:
+			truncated.append(subreddit)
+		return columns
+
+	columns = new_columns(POST_COLUMNS)
+	for part in _map_ordered(collect, subreddits, max_workers):
+		extend_columns(columns, part)
+	return pd.DataFrame(columns) if num_rows(columns) else pd.DataFrame()
+
+
+@instrumented("reddit.fetch_comments")
+def fetch_reddit_comments(
+	post_ids: List[str],
+	limit_per_post: int = 200,
+	max_workers: int = 4,
+	reddit: Any = None,
+	throttle: RateLimiter | None = None,
+	since: Dict[str, int] | None = None,
+	cache: RequestCache | None = None,
+) -> pd.DataFrame:
+	"""Fetch comments per post; with ``since`` (post_id -> created_utc), only return newer comments.
+
+	With ``cache``, posts without a ``since`` mark reuse their cached comment listing. ``reddit``
+	is a client or a ClientPool, as in ``fetch_reddit_posts``.
+	"""
+	clients = client_pool(reddit)
+	throttle = throttle or RateLimiter()
+	since = since or {}
+
+	def fetch(pid: str) -> Columns:
+		columns = new_columns(COMMENT_COLUMNS)
+		with clients.checkout() as reddit:
+			throttle.wait(reddit)
+			post = reddit.submission(id=pid)
+			post.comments.replace_more(limit=0)
+			for comment in post.comments.list():
+				_append_comment(columns, comment, pid)
+		return columns
 
+	def collect(pid: str) -> Columns:
+		mark = since.get(pid)
+		if mark is None and cache is not None:
+			return head(as_columns(cache.cached("reddit.comments", {"post_id": pid}, lambda: fetch(pid)), COMMENT_COLUMNS), limit_per_post)
+		mark = -1 if mark is None else mark
+		columns = fetch(pid)
+		return take(columns, [i for i, created_utc in enumerate(columns["created_utc"]) if created_utc > mark][:limit_per_post])
 
+	columns = new_columns(COMMENT_COLUMNS)
+	for part in _map_ordered(collect, post_ids, max_workers):
+		extend_columns(columns, part)
+	return pd.DataFrame(columns) if num_rows(columns) else pd.DataFrame()
@@ -0,0 +1,344 @@
+"""Record/replay of the collectors' HTTP traffic, for offline throughput, concurrency and retry tests.
+
+``record(path)`` captures every response the collectors' client libraries receive (praw and
+pytrends go through ``requests``, the YouTube client through ``httplib2``) into a gzip JSON-lines
+fixture archive. ``ReplayServer`` serves an archive from a local HTTP server with configurable
+latency, rate limits and error injection, and ``redirect(server.url)`` points the same libraries
+at it, so the unmodified collectors run end to end with no outside services.
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+# Query parameters that carry credentials or vary per call; never recorded or matched on
+VOLATILE_PARAMS = {"key", "access_token"}
+# Response headers worth replaying (bodies are stored decoded, so encodings and lengths are not)
+KEPT_HEADERS = {"content-type", "retry-after", "x-ratelimit-remaining", "x-ratelimit-reset", "x-ratelimit-used"}
+# Secrets inside recorded bodies: OAuth token responses are replayed with a placeholder token
+SCRUBBED_FIELDS = {"access_token", "refresh_token"}
+# Secrets inside request bodies (OAuth form posts such as praw's password grant, or JSON): never
+# recorded, and ignored when matching, so live requests still find their recording
+CREDENTIAL_FIELDS = {"username", "password", "client_id", "client_secret", "refresh_token", "access_token", "code", "code_verifier", "assertion"}
+
+
+def _split(url: str) -> Tuple[str, str, List[Tuple[str, str]]]:
+	parts = urlsplit(url)
+	query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in VOLATILE_PARAMS)
+	return parts.netloc, parts.path or "/", query
+
+
+def exchange_key(method: str, url: str, body: bytes | str | None = None) -> str:
+	"""Match key of a request: method, host, path, sorted query (minus VOLATILE_PARAMS) and body."""
+	host, path, query = _split(url)
+	body = _scrub_body(body)
+	spec = [method.upper(), host, path, query, hashlib.sha1(body).hexdigest() if body else ""]
+	return hashlib.sha1(json.dumps(spec).encode("utf-8")).hexdigest()
+
+
+def route_keys(method: str, url: str) -> List[str]:
+	"""Looser matches for requests that were never recorded, most specific first: the same path
+	with any parameters, then with its inner segments and then all but its first segment wildcarded
+	(ids in paths, such as /r/<subreddit>/search or /comments/<post id>); trailing slashes are ignored."""
+	host, path, _ = _split(url)
+	segments = path.strip("/").split("/")
+	inner = segments[:1] + ["*"] * max(0, len(segments) - 2) + segments[1:][-1:]
+	outer = segments[:1] + ["*"] * (len(segments) - 1)
+	keys = [f"{method.upper()} {host}/{'/'.join(parts)}" for parts in (segments, inner, outer)]
+	return list(dict.fromkeys(keys))
+
+
+def _scrub(content: bytes) -> bytes:
+	try:
+		payload = json.loads(content)
+	except ValueError:
+		return content
+	if not isinstance(payload, dict) or not SCRUBBED_FIELDS & set(payload):
+		return content
+	return json.dumps({k: ("replay-token" if k in SCRUBBED_FIELDS else v) for k, v in payload.items()}).encode("utf-8")
+
+
+def _scrub_body(body: bytes | str | None) -> bytes | None:
+	# Credential values of JSON or form-encoded request bodies become a placeholder; other bodies pass through
+	if isinstance(body, str):
+		body = body.encode("utf-8")
+	if not body:
+		return body
+	try:
+		payload = json.loads(body)
+	except ValueError:
+		payload = None
+	if isinstance(payload, dict):
+		if not CREDENTIAL_FIELDS & set(payload):
+			return body
+		return json.dumps({k: ("replay" if k in CREDENTIAL_FIELDS else v) for k, v in payload.items()}).encode("utf-8")
+	try:
+		fields = parse_qsl(body.decode("utf-8"), keep_blank_values=True, strict_parsing=True)
+	except ValueError:
+		return body
+	if not CREDENTIAL_FIELDS & {k for k, _ in fields}:
+		return body
+	return urlencode([(k, "replay" if k in CREDENTIAL_FIELDS else v) for k, v in fields]).encode("utf-8")
+
+
+def make_exchange(method: str, url: str, body: Any, status: int, headers: Dict[str, str], content: bytes) -> Dict[str, Any]:
+	"""One archive record, with credentials stripped from the URL and body."""
+	host, path, query = _split(url)
+	body = _scrub_body(body)
+	content = _scrub(content)
+	try:
+		encoded = {"text": content.decode("utf-8")}
+	except UnicodeDecodeError:
+		encoded = {"base64": base64.b64encode(content).decode("ascii")}
+	return {
+		"method": method.upper(),
+		"url": f"https://{host}{path}" + (f"?{urlencode(query)}" if query else ""),
+		"body": base64.b64encode(body).decode("ascii") if body else "",
+		"status": status,
+		"headers": {k.lower(): v for k, v in headers.items() if k.lower() in KEPT_HEADERS},
+		**encoded,
+	}
+
+
+def _error(status: int, message: str, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+	return status, {**headers, "content-type": "application/json"}, json.dumps({"error": status, "message": message}).encode("utf-8")
+
+
+def exchange_content(exchange: Dict[str, Any]) -> bytes:
+	if "base64" in exchange:
+		return base64.b64decode(exchange["base64"])
+	return exchange.get("text", "").encode("utf-8")
+
+
+def save_archive(path: str, exchanges: List[Dict[str, Any]]) -> str:
+	os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+	tmp_path = path + ".tmp"
+	with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+		for exchange in exchanges:
+			f.write(json.dumps(exchange, sort_keys=True) + "\n")
+	os.replace(tmp_path, path)
+	return path
+
+
+def load_archive(path: str) -> List[Dict[str, Any]]:
+	with gzip.open(path, "rt", encoding="utf-8") as f:
+		return [json.loads(line) for line in f if line.strip()]
+
+
+@contextmanager
+def _patched(rewrite: Callable[[str], str], on_response: Callable[[str, str, Any, int, Dict[str, str], bytes], None] | None = None) -> Iterator[None]:
+	# Hooks the two HTTP stacks the collector libraries use; restored on exit
+	import httplib2
+	import requests
+
+	send, http_request = requests.Session.send, httplib2.Http.request
+
+	def patched_send(session, request, **kwargs):
+		original = request.url
+		request.url = rewrite(original)
+		response = send(session, request, **kwargs)
+		if on_response is not None:
+			on_response(request.method, original, request.body, response.status_code, dict(response.headers), response.content)
+		return response
+
+	def patched_request(http, uri, method="GET", body=None, headers=None, *args, **kwargs):
+		response, content = http_request(http, rewrite(uri), method, body, headers, *args, **kwargs)
+		if on_response is not None:
+			on_response(method, uri, body, response.status, dict(response), content)
+		return response, content
+
+	requests.Session.send, httplib2.Http.request = patched_send, patched_request
+	try:
+		yield
+	finally:
+		requests.Session.send, httplib2.Http.request = send, http_request
+
+
+@contextmanager
+def record(path: str) -> Iterator[List[Dict[str, Any]]]:
+	"""Capture every collector HTTP response inside the block; saved to ``path`` on exit.
+
+	API keys and OAuth tokens are stripped; request headers (and so credentials sent in them) are
+	never stored.
+	"""
+	exchanges: List[Dict[str, Any]] = []
+	lock = threading.Lock()
+
+	def on_response(method, url, body, status, headers, content):
+		exchange = make_exchange(method, url, body, status, headers, content)
+		with lock:
+			exchanges.append(exchange)
+
+	try:
+		with _patched(lambda url: url, on_response):
+			yield exchanges
+	finally:
+		save_archive(path, exchanges)
+
+
+@contextmanager
+def redirect(base_url: str) -> Iterator[None]:
+	"""Send every collector HTTP request inside the block to ``base_url/<host><path>`` instead."""
+	base_url = base_url.rstrip("/")
+
+	def rewrite(url: str) -> str:
+		parts = urlsplit(url)
+		return f"{base_url}/{parts.netloc}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+
+	with _patched(rewrite):
+		yield
+
+
+class ReplayServer:
+	"""Serves a fixture archive on ``127.0.0.1`` as the APIs that were recorded into it.
+
+	Requests are matched on ``exchange_key``; repeated requests cycle through every response
+	recorded for them. Unless ``strict``, unrecorded requests are answered with a response recorded
+	for the same endpoint, so a small recording can drive a much larger workload.
+
+	- ``latency`` (+ up to ``jitter``) seconds are added to every response
+	- ``rate``/``burst`` set a token bucket; beyond it requests get 429 with Retry-After, and every
+	  response carries Reddit-style X-Ratelimit-Remaining/Used/Reset headers
+	- ``error_rate`` of the requests (seeded) fail with ``error_status`` instead
+	"""
+
+	def __init__(
+		self,
+		archive: str | List[Dict[str, Any]],
+		latency: float = 0.0,
+		jitter: float = 0.0,
+		rate: float | None = None,
+		burst: int = 10,
+		error_rate: float = 0.0,
+		error_status: int = 503,
+		strict: bool = False,
+		seed: int = 0,
+	):
+		exchanges = load_archive(archive) if isinstance(archive, str) else archive
+		self.exact: Dict[str, List[Dict[str, Any]]] = {}
+		self.routes: Dict[str, List[Dict[str, Any]]] = {}
+		for exchange in exchanges:
+			body = base64.b64decode(exchange["body"]) if exchange.get("body") else None
+			self.exact.setdefault(exchange_key(exchange["method"], exchange["url"], body), []).append(exchange)
+			for route in route_keys(exchange["method"], exchange["url"]):
+				self.routes.setdefault(route, []).append(exchange)
+		self.latency = latency
+		self.jitter = jitter
+		self.rate = rate
+		self.burst = burst
+		self.error_rate = error_rate
+		self.error_status = error_status
+		self.strict = strict
+		self.stats: Dict[str, int] = {"requests": 0, "served": 0, "approximate": 0, "throttled": 0, "errors": 0, "missing": 0}
+		self._random = random.Random(seed)
+		self._served: Dict[str, int] = {}
+		self._tokens = float(burst)
+		self._refilled_at = time.monotonic()
+		self._lock = threading.Lock()
+		self._server: ThreadingHTTPServer | None = None
+		self._thread: threading.Thread | None = None
+
+	@property
+	def url(self) -> str:
+		if self._server is None:
+			raise RuntimeError("ReplayServer is not running")
+		host, port = self._server.server_address[:2]
+		return f"http://{host}:{port}"
+
+	def start(self) -> "ReplayServer":
+		handler = type("Handler", (_ReplayHandler,), {"replay": self})
+		self._server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+		self._server.daemon_threads = True
+		self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+		self._thread.start()
+		return self
+
+	def stop(self) -> None:
+		if self._server is not None:
+			self._server.shutdown()
+			self._server.server_close()
+			self._server = None
+
+	def __enter__(self) -> "ReplayServer":
+		return self.start()
+
+	def __exit__(self, *exc) -> None:
+		self.stop()
+
+	def _take_token(self) -> Tuple[bool, Dict[str, str]]:
+		# Token bucket refilled at ``rate`` per second; the headers mirror Reddit's rate-limit headers
+		if self.rate is None:
+			return True, {}
+		now = time.monotonic()
+		self._tokens = min(float(self.burst), self._tokens + (now - self._refilled_at) * self.rate)
+		self._refilled_at = now
+		allowed = self._tokens >= 1
+		if allowed:
+			self._tokens -= 1
+		reset = max(0.0, (self.burst - self._tokens) / self.rate)
+		headers = {"x-ratelimit-remaining": f"{self._tokens:.0f}", "x-ratelimit-used": f"{self.burst - self._tokens:.0f}", "x-ratelimit-reset": f"{reset:.0f}"}
+		if not allowed:
+			headers["retry-after"] = f"{max(1.0, (1 - self._tokens) / self.rate):.0f}"
+		return allowed, headers
+
+	def respond(self, method: str, url: str, body: bytes | None) -> Tuple[int, Dict[str, str], bytes]:
+		"""Status, headers and body the server sends for one request (also usable without HTTP)."""
+		with self._lock:
+			self.stats["requests"] += 1
+			allowed, headers = self._take_token()
+			if not allowed:
+				self.stats["throttled"] += 1
+				return _error(429, "Too Many Requests", headers)
+			if self.error_rate and self._random.random() < self.error_rate:
+				self.stats["errors"] += 1
+				return _error(self.error_status, "Injected error", headers)
+			key = exchange_key(method, url, body)
+			candidates = self.exact.get(key)
+			if candidates is None and not self.strict:
+				key = next((route for route in route_keys(method, url) if route in self.routes), key)
+				candidates = self.routes.get(key)
+				if candidates is not None:
+					self.stats["approximate"] += 1
+			if candidates is None:
+				self.stats["missing"] += 1
+				return _error(404, f"Not recorded: {method} {url}", headers)
+			exchange = candidates[self._served.get(key, 0) % len(candidates)]
+			self._served[key] = self._served.get(key, 0) + 1
+			self.stats["served"] += 1
+			delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+		if delay > 0:
+			time.sleep(delay)
+		return exchange["status"], {**exchange["headers"], **headers}, exchange_content(exchange)
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+	# Keep-alive, so concurrent collectors reuse connections as they would against the real APIs
+	protocol_version = "HTTP/1.1"
+	replay: ReplayServer
+
+	def _handle(self) -> None:
+		length = int(self.headers.get("Content-Length") or 0)
+		body = self.rfile.read(length) if length else None
+		# Redirected paths are /<original host>/<original path>
+		host, _, path = self.path.lstrip("/").partition("/")
+		status, headers, content = self.replay.respond(self.command, f"https://{host}/{path}", body)
+		self.send_response(status)
+		for name, value in headers.items():
+			self.send_header(name, value)
+		self.send_header("Content-Length", str(len(content)))
+		self.end_headers()
+		self.wfile.write(content)
+
+	do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+	def log_message(self, format: str, *args: Any) -> None:
+		pass
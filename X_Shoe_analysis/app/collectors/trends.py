@@ -1,39 +1,149 @@
-from typing import List
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
 
 import pandas as pd
-from pytrends.request import TrendReq
+
+from .cache import RequestCache
+
+try:
+	from app.instrumentation import instrumented
+except ModuleNotFoundError:
+	from instrumentation import instrumented
+
+# Wider geo asked when a regional request keeps failing
+FALLBACK_GEO = "IN"
 
 
 def _batch_list(items: List[str], batch_size: int = 5) -> List[List[str]]:
 	return [items[i : i + batch_size] for i in range(0, len(items), batch_size)]
 
 
-def fetch_trends(queries: List[str], geo: str = "IN-TN", timeframe: str = "today 12-m") -> pd.DataFrame:
-	# Pytrends supports up to 5 keywords per request
-	batches = _batch_list(queries, 5) if queries else []
+def _anchored_batches(queries: List[str], anchor: str, batch_size: int = 5) -> List[List[str]]:
+	# Every batch carries the anchor so all of them can be put on the first batch's 0-100 scale
+	others = [q for q in queries if q != anchor]
+	first = [anchor] + others[: batch_size - 1]
+	rest = _batch_list(others[batch_size - 1 :], batch_size - 1)
+	return [first] + [[anchor] + batch for batch in rest]
+
+
+def _frame_payload(interest: pd.DataFrame) -> Dict[str, Any]:
+	return {
+		"dates": [d.isoformat() for d in pd.to_datetime(interest.index)],
+		"columns": {str(c): interest[c].astype(float).tolist() for c in interest.columns},
+	}
+
+
+def _payload_frame(payload: Dict[str, Any], batch: List[str]) -> pd.DataFrame:
+	frame = pd.DataFrame(payload["columns"], index=pd.DatetimeIndex(pd.to_datetime(payload["dates"]), name="date"))
+	# Cache keys ignore case, so label columns with this request's spelling of each keyword
+	names = {name.casefold(): name for name in batch}
+	return frame.rename(columns=lambda c: names.get(c.casefold(), c))
+
+
+def _interest(batch: List[str], geo: str, timeframe: str) -> pd.DataFrame | None:
+	from pytrends.request import TrendReq
+
+	# TrendReq keeps a requests session, so each concurrent batch gets its own
 	pytrends = TrendReq(hl="en-US", tz=330)
-	combined: pd.DataFrame | None = None
-	for batch in batches:
+	pytrends.build_payload(kw_list=batch, timeframe=timeframe, geo=geo)
+	interest = pytrends.interest_over_time()
+	if interest is None or interest.empty:
+		return None
+	# Drop isPartial if present to avoid duplicates on merge
+	if "isPartial" in interest.columns:
+		interest = interest.drop(columns=["isPartial"])  # type: ignore
+	return interest
+
+
+def _fetch_batch(batch: List[str], geo: str, timeframe: str, retries: int, backoff: float, cache: RequestCache | None) -> pd.DataFrame | None:
+	interest = _fetch_geo(batch, geo, timeframe, retries, backoff, cache)
+	if interest is None and geo != FALLBACK_GEO:
+		# Fallback: try wider geo if regional code fails (one attempt, cached under the wider geo)
+		interest = _fetch_geo(batch, FALLBACK_GEO, timeframe, 1, backoff, cache)
+	return interest
+
+
+def _fetch_geo(batch: List[str], geo: str, timeframe: str, retries: int, backoff: float, cache: RequestCache | None) -> pd.DataFrame | None:
+	if cache is None:
+		return _fetch_interest(batch, geo, timeframe, retries, backoff)
+
+	def fetch() -> Dict[str, Any] | None:
+		interest = _fetch_interest(batch, geo, timeframe, retries, backoff)
+		return _frame_payload(interest) if interest is not None else None
+
+	# Keyed on the geo that answered, so a fallback response never stands in for the regional one
+	payload = cache.cached("trends.interest", {"batch": batch, "geo": geo}, fetch, window=timeframe)
+	return _payload_frame(payload, batch) if payload is not None else None
+
+
+def _fetch_interest(batch: List[str], geo: str, timeframe: str, retries: int, backoff: float) -> pd.DataFrame | None:
+	for attempt in range(retries):
 		try:
-			pytrends.build_payload(kw_list=batch, timeframe=timeframe, geo=geo)
-			interest = pytrends.interest_over_time()
+			return _interest(batch, geo, timeframe)
 		except Exception:
-			# Fallback: try wider geo if regional code fails
-			try:
-				pytrends.build_payload(kw_list=batch, timeframe=timeframe, geo="IN")
-				interest = pytrends.interest_over_time()
-			except Exception:
-				interest = None
-		if interest is None or interest.empty:
-			continue
-		interest = interest.reset_index().rename(columns={"date": "date"})
-		# Drop isPartial if present to avoid duplicates on merge
-		if "isPartial" in interest.columns:
-			interest = interest.drop(columns=["isPartial"])  # type: ignore
-		combined = interest if combined is None else pd.merge(combined, interest, on="date", how="outer")
-	if combined is None:
+			if attempt < retries - 1:
+				time.sleep(backoff * 2**attempt)
+	return None
+
+
+def _rescale(frames: List[pd.DataFrame], anchor: str) -> List[pd.DataFrame]:
+	reference = next((f[anchor] for f in frames if anchor in f.columns and f[anchor].sum() > 0), None)
+	if reference is None:
+		return frames
+	scaled = []
+	for frame in frames:
+		if anchor in frame.columns and frame[anchor].sum() > 0:
+			aligned = frame[anchor].reindex(reference.index)
+			factor = reference.sum() / aligned.sum() if aligned.sum() > 0 else 1.0
+			frame = frame.astype(float) * factor
+		scaled.append(frame)
+	# A batch scaled up can peak above 100; bring every batch down together to keep their ratios
+	peak = max(float(frame.max().max()) for frame in scaled)
+	if peak > 100:
+		scaled = [frame.astype(float) * (100 / peak) for frame in scaled]
+	return scaled
+
+
+@instrumented("trends.fetch")
+def fetch_trends(
+	queries: List[str],
+	geo: str = "IN-TN",
+	timeframe: str = "today 12-m",
+	anchor: str | None = None,
+	max_workers: int = 4,
+	cache: RequestCache | None = None,
+	retries: int = 3,
+	backoff: float = 1.0,
+) -> pd.DataFrame:
+	"""Interest over time for ``queries``, one column per query, all on a common scale.
+
+	Pytrends supports up to 5 keywords per request and normalizes each request to its own 0-100
+	range. Batches share ``anchor`` (default: the first query) and are rescaled by the ratio of the
+	anchor's total interest to the first batch's; if that lifts any value above 100, every column
+	is scaled down by the same factor, so the result stays within 0-100 with the batches' ratios
+	intact. Batches run concurrently with exponential backoff; with ``cache`` each (batch, geo,
+	timeframe) response is reused while fresh.
+	"""
+	if not queries:
 		return pd.DataFrame()
-	combined = combined.sort_values("date").reset_index(drop=True)
-	return combined
+	anchor = anchor or queries[0]
+	batches = _anchored_batches(queries, anchor) if len(queries) > 5 else _batch_list(queries, 5)
 
+	def fetch(batch: List[str]) -> pd.DataFrame | None:
+		return _fetch_batch(batch, geo, timeframe, retries, backoff, cache)
 
+	with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(batches)))) as pool:
+		frames = [f for f in pool.map(fetch, batches) if f is not None and not f.empty]
+	if not frames:
+		return pd.DataFrame()
+	if len(frames) > 1:
+		frames = _rescale(frames, anchor)
+	# Single align-on-date concat; repeated anchor columns keep the reference batch's copy
+	combined = pd.concat(frames, axis=1, join="outer")
+	combined = combined.loc[:, ~combined.columns.duplicated()]
+	if anchor not in queries and anchor in combined.columns:
+		combined = combined.drop(columns=[anchor])
+	combined.index.name = "date"
+	combined = combined.sort_index().reset_index()
+	return combined
@@ -1,57 +1,163 @@
 import os
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import Any, Dict, List
 
 import pandas as pd
-from googleapiclient.discovery import build
+
+from .cache import RequestCache
+from .columns import Columns, as_columns, head, new_columns, num_rows
+
+try:
+	from app.instrumentation import instrumented
+except ModuleNotFoundError:
+	from instrumentation import instrumented
+
+# YouTube Data API v3 quota cost per call
+QUOTA_COSTS = {"search.list": 100, "videos.list": 1}
+PAGE_SIZE = 50
+# Default daily quota of a YouTube Data API project
+DAILY_QUOTA = 10_000
+VIDEO_COLUMNS = ["video_id", "title", "description", "channel", "published_at"]
+STAT_COLUMNS = ["video_id", "view_count", "like_count", "comment_count"]
+
+
+class QuotaExhausted(RuntimeError):
+	"""A call was refused because it would take its QuotaMeter past the budget."""
+
+
+class QuotaMeter:
+	"""Counts API calls and quota units spent during one collection run; with ``budget``, calls
+	that would go past it are refused (``allows`` is False) instead of exhausting the key."""
+
+	def __init__(self, budget: int | None = None):
+		self.budget = budget
+		self.units = 0
+		self.calls: Dict[str, int] = {}
+		self.exhausted = False
+
+	def allows(self, method: str) -> bool:
+		if self.budget is not None and self.units + QUOTA_COSTS.get(method, 1) > self.budget:
+			self.exhausted = True
+		return not self.exhausted
+
+	def charge(self, method: str) -> None:
+		self.units += QUOTA_COSTS.get(method, 1)
+		self.calls[method] = self.calls.get(method, 0) + 1
+
+	def as_dict(self) -> Dict[str, Any]:
+		return {"units": self.units, "calls": dict(self.calls), "budget": self.budget, "exhausted": self.exhausted}
+
+
+@lru_cache(maxsize=4)
+def _client_for_key(api_key: str):
+	# Imported on first use; the discovery document is the copy bundled with the client library
+	# (static_discovery), so building the client never fetches it over the network
+	from googleapiclient.discovery import build
+
+	return build("youtube", "v3", developerKey=api_key, static_discovery=True, cache_discovery=False)
 
 
 def _create_youtube_client():
 	api_key = os.getenv("YOUTUBE_API_KEY")
 	if not api_key:
 		raise RuntimeError("Missing YouTube API key. Set YOUTUBE_API_KEY in environment.")
-	return build("youtube", "v3", developerKey=api_key)
-
-
-def search_youtube_videos(query: str, max_results: int = 50) -> pd.DataFrame:
-	yt = _create_youtube_client()
-	search_response = (
-		yt.search()
-		.list(q=query, part="id,snippet", type="video", maxResults=min(max_results, 50))
-		.execute()
-	)
-	items = search_response.get("items", [])
-	rows: List[Dict[str, Any]] = []
-	for it in items:
-		video_id = it["id"]["videoId"]
-		snippet = it.get("snippet", {})
-		rows.append(
-			{
-				"video_id": video_id,
-				"title": snippet.get("title", ""),
-				"description": snippet.get("description", ""),
-				"channel": snippet.get("channelTitle", ""),
-				"published_at": snippet.get("publishedAt", ""),
-			}
-		)
-	return pd.DataFrame(rows)
+	return _client_for_key(api_key)
 
 
-def fetch_video_stats(video_ids: List[str]) -> pd.DataFrame:
-	yt = _create_youtube_client()
-	if not video_ids:
-		return pd.DataFrame()
-	resp = yt.videos().list(part="statistics", id=",".join(video_ids[:50])).execute()
-	rows: List[Dict[str, Any]] = []
-	for it in resp.get("items", []):
-		stats = it.get("statistics", {})
-		rows.append(
-			{
-				"video_id": it["id"],
-				"view_count": int(stats.get("viewCount", 0) or 0),
-				"like_count": int(stats.get("likeCount", 0) or 0),
-				"comment_count": int(stats.get("commentCount", 0) or 0),
-			}
+def search_youtube_videos(query: str, max_results: int = 50, yt: Any = None, quota: QuotaMeter | None = None, cache: RequestCache | None = None) -> pd.DataFrame:
+	if cache is not None:
+		columns = as_columns(cache.cached("youtube.search", {"query": query, "max_results": max_results}, lambda: _search_columns(query, max_results, yt, quota)), VIDEO_COLUMNS)
+	else:
+		columns = _search_columns(query, max_results, yt, quota)
+	return pd.DataFrame(columns) if num_rows(columns) else pd.DataFrame()
+
+
+def _search_columns(query: str, max_results: int, yt: Any, quota: QuotaMeter | None) -> Columns:
+	# The client is only built on a cache miss, so fully cached runs need no API key
+	yt = yt or _create_youtube_client()
+	columns = new_columns(VIDEO_COLUMNS)
+	page_token = None
+	while num_rows(columns) < max_results:
+		if quota is not None and not quota.allows("search.list"):
+			# Raised rather than returning a partial result, which the request cache would keep
+			raise QuotaExhausted(f"YouTube quota budget of {quota.budget} units reached")
+		request = yt.search().list(
+			q=query,
+			part="id,snippet",
+			type="video",
+			maxResults=min(max_results - num_rows(columns), PAGE_SIZE),
+			pageToken=page_token,
 		)
-	return pd.DataFrame(rows)
+		search_response = request.execute()
+		if quota is not None:
+			quota.charge("search.list")
+		for it in search_response.get("items", []):
+			snippet = it.get("snippet", {})
+			columns["video_id"].append(it["id"]["videoId"])
+			columns["title"].append(snippet.get("title", ""))
+			columns["description"].append(snippet.get("description", ""))
+			columns["channel"].append(snippet.get("channelTitle", ""))
+			columns["published_at"].append(snippet.get("publishedAt", ""))
+		page_token = search_response.get("nextPageToken")
+		if not page_token or not search_response.get("items"):
+			break
+	return head(columns, max_results)
+
+
+@instrumented("youtube.search")
+def search_youtube_queries(queries: List[str], max_results: int = 50, yt: Any = None, quota: QuotaMeter | None = None, cache: RequestCache | None = None) -> pd.DataFrame:
+	"""Results of every query in order; once ``quota`` runs out, the remaining queries are skipped
+	(``quota.exhausted`` tells), though cached ones are still served."""
+	frames = []
+	for q in queries:
+		try:
+			frames.append(search_youtube_videos(q, max_results=max_results, yt=yt, quota=quota, cache=cache))
+		except QuotaExhausted:
+			continue
+	frames = [f for f in frames if not f.empty]
+	return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
 
 
+@instrumented("youtube.fetch_stats")
+def fetch_video_stats(video_ids: List[str], yt: Any = None, quota: QuotaMeter | None = None, cache: RequestCache | None = None) -> pd.DataFrame:
+	"""Statistics for ``video_ids``; with ``cache`` each video is cached on its own and only the
+	missing ones are requested, still 50 per call."""
+	if not video_ids:
+		return pd.DataFrame()
+	unique_ids = list(dict.fromkeys(video_ids))
+	cached = {vid: cache.get("youtube.videos", {"id": vid}) for vid in unique_ids} if cache is not None else {}
+	missing = [vid for vid in unique_ids if cached.get(vid) is None]
+	fetched = new_columns(STAT_COLUMNS)
+	if missing:
+		yt = yt or _create_youtube_client()
+	for start in range(0, len(missing), PAGE_SIZE):
+		if quota is not None and not quota.allows("videos.list"):
+			break
+		batch = missing[start : start + PAGE_SIZE]
+		resp = yt.videos().list(part="statistics", id=",".join(batch)).execute()
+		if quota is not None:
+			quota.charge("videos.list")
+		for it in resp.get("items", []):
+			stats = it.get("statistics", {})
+			fetched["video_id"].append(it["id"])
+			fetched["view_count"].append(int(stats.get("viewCount", 0) or 0))
+			fetched["like_count"].append(int(stats.get("likeCount", 0) or 0))
+			fetched["comment_count"].append(int(stats.get("commentCount", 0) or 0))
+	if cache is None:
+		return pd.DataFrame(fetched) if num_rows(fetched) else pd.DataFrame()
+	# Each video is cached as its own one-record payload
+	position = {vid: i for i, vid in enumerate(fetched["video_id"])}
+	for vid, i in position.items():
+		cache.put("youtube.videos", {"id": vid}, {name: values[i] for name, values in fetched.items()})
+	# Cached and fetched rows in request order; videos the API did not return are left out
+	columns = new_columns(STAT_COLUMNS)
+	for vid in unique_ids:
+		if vid in position:
+			record = {name: values[position[vid]] for name, values in fetched.items()}
+		elif cached.get(vid) is not None:
+			record = cached[vid]
+		else:
+			continue
+		for name, values in columns.items():
+			values.append(record.get(name))
+	return pd.DataFrame(columns) if num_rows(columns) else pd.DataFrame()
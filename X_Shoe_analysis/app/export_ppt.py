@@ -5,8 +5,19 @@ import pandas as pd
 from pptx import Presentation
 from pptx.util import Inches, Pt
 
-from app.analysis.scoring import summarize_for_ppt
-from app.viz.charts import bar_scores, bar_components, donut_components, stacked_engagement, sentiment_density, save_fig
+from app.analysis.summary import summarize_for_ppt
+from app.instrumentation import RunReport, stage
+from app.storage import DataStore
+from app.viz.charts import bar_scores, bar_components, donut_components, stacked_engagement, sentiment_density, save_figs
+
+# (image name, slide title, figure builder) in slide order
+CHARTS = [
+	("fit_scores", "Fit Scores: Malls vs High Streets", bar_scores),
+	("components_bar", "Signal Components (Bar)", bar_components),
+	("components_donut", "Signal Components (Donut)", donut_components),
+	("engagement_sources", "Engagement Sources by Location", stacked_engagement),
+	("sentiment", "Sentiment by Location", sentiment_density),
+]
 
 
 def _add_title(prs, title: str, subtitle: str | None = None):
@@ -27,23 +38,22 @@ def _add_image_slide(prs, title: str, image_path: str):
 	return slide
 
 
-def build_ppt(data_dir: str = "data", out_path: str | None = None):
+def build_ppt(data_dir: str = "data", out_path: str | None = None, report: RunReport | None = None):
 	data_dir = os.path.abspath(data_dir)
-	# Load cached CSVs
-	posts = pd.read_csv(os.path.join(data_dir, "reddit_posts.csv")) if os.path.exists(os.path.join(data_dir, "reddit_posts.csv")) else pd.DataFrame()
-	comments = pd.read_csv(os.path.join(data_dir, "reddit_comments.csv")) if os.path.exists(os.path.join(data_dir, "reddit_comments.csv")) else pd.DataFrame()
-	ytv = pd.read_csv(os.path.join(data_dir, "youtube_videos.csv")) if os.path.exists(os.path.join(data_dir, "youtube_videos.csv")) else pd.DataFrame()
-	yts = pd.read_csv(os.path.join(data_dir, "youtube_stats.csv")) if os.path.exists(os.path.join(data_dir, "youtube_stats.csv")) else pd.DataFrame()
-	trends = pd.read_csv(os.path.join(data_dir, "trends.csv")) if os.path.exists(os.path.join(data_dir, "trends.csv")) else pd.DataFrame()
-
-	# Minimal result reconstruction for charts: expect an existing results CSV or compute quickly
-	# For PPT we just craft a light summary using engagement/sentiment/trend columns if present
-	# If not present, we skip chart generation
-	result_csv = os.path.join(data_dir, "result.csv")
-	if os.path.exists(result_csv):
-		result = pd.read_csv(result_csv)
-	else:
-		# Fallback: create a stub result if not available
+	report = report or RunReport()
+	with report.activate():
+		out_path = _build_ppt(data_dir, out_path)
+	report.save(data_dir)
+	return out_path
+
+
+def _build_ppt(data_dir: str, out_path: str | None) -> str:
+	# Only the scored result is needed for the deck; raw source tables are not loaded
+	# If no result has been saved yet, fall back to an empty stub and skip charts
+	with stage("ppt.load_result") as record:
+		result = DataStore(data_dir).read("result")
+		record.rows = len(result)
+	if result.empty:
 		result = pd.DataFrame(columns=["place", "score", "engagement", "reddit_engagement", "youtube_engagement", "sentiment", "trend"])
 
 	prs = Presentation()
@@ -60,40 +70,21 @@ def build_ppt(data_dir: str = "data", out_path: str | None = None):
 	p.text = summary["support"]
 	p.font.size = Pt(18)
 
-	# Generate figures and save images
+	# Generate figures and save images; unchanged figures reuse their cached image in _ppt_images/
 	img_dir = os.path.join(data_dir, "_ppt_images")
-	os.makedirs(img_dir, exist_ok=True)
-
-	fig_paths = []
-	fig = bar_scores(result)
-	if fig:
-		path = os.path.join(img_dir, "fit_scores.png")
-		save_fig(fig, path)
-		fig_paths.append(("Fit Scores: Malls vs High Streets", path))
-	fig = bar_components(result)
-	if fig:
-		path = os.path.join(img_dir, "components_bar.png")
-		save_fig(fig, path)
-		fig_paths.append(("Signal Components (Bar)", path))
-	fig = donut_components(result)
-	if fig:
-		path = os.path.join(img_dir, "components_donut.png")
-		save_fig(fig, path)
-		fig_paths.append(("Signal Components (Donut)", path))
-	fig = stacked_engagement(result)
-	if fig:
-		path = os.path.join(img_dir, "engagement_sources.png")
-		save_fig(fig, path)
-		fig_paths.append(("Engagement Sources by Location", path))
-	fig = sentiment_density(result)
-	if fig:
-		path = os.path.join(img_dir, "sentiment.png")
-		save_fig(fig, path)
-		fig_paths.append(("Average Sentiment by Location", path))
+	# The sentiment slide draws the bins the dashboard stored (for its date range), not the scored rows
+	with stage("ppt.load_sentiment_bins") as record:
+		bins = DataStore(data_dir).read("sentiment_bins")
+		record.rows = len(bins)
+	figs = {name: build(result, bins) if build is sentiment_density else build(result) for name, _, build in CHARTS}
+	with stage("ppt.render_images") as record:
+		images = save_figs(figs, img_dir)
+		record.extra["images"] = len(images)
 
 	# Add image slides
-	for title, path in fig_paths:
-		_add_image_slide(prs, title, path)
+	for name, title, _ in CHARTS:
+		if name in images:
+			_add_image_slide(prs, title, images[name])
 
 	# Recommendations slide
 	slide = prs.slides.add_slide(prs.slide_layouts[1])
@@ -113,7 +104,8 @@ def build_ppt(data_dir: str = "data", out_path: str | None = None):
 	# Save
 	if out_path is None:
 		out_path = os.path.join(data_dir, f"X_Shoe_Chennai_{datetime.now().strftime('%Y%m%d_%H%M')}.pptx")
-	prs.save(out_path)
+	with stage("ppt.save"):
+		prs.save(out_path)
 	return out_path
 
 
@@ -0,0 +1,133 @@
+import functools
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List
+
+import pandas as pd
+
+_active: ContextVar["RunReport | None"] = ContextVar("run_report", default=None)
+
+
+class StageRecord:
+	"""One timed stage; callers may set ``rows`` (and add ``extra`` fields) while it runs."""
+
+	def __init__(self, name: str, depth: int):
+		self.name = name
+		self.depth = depth
+		self.seconds = 0.0
+		self.rows: int | None = None
+		self.peak_mb: float | None = None
+		self.extra: Dict[str, Any] = {}
+
+	def as_dict(self) -> Dict[str, Any]:
+		return {"stage": self.name, "depth": self.depth, "seconds": round(self.seconds, 4), "rows": self.rows, "peak_mb": self.peak_mb, **self.extra}
+
+
+class RunReport:
+	"""Collects StageRecords for one pipeline run.
+
+	With ``trace_memory`` each stage also records its peak Python/NumPy allocation above the level
+	at stage entry (via tracemalloc, which slows pure-Python code, so it is opt-in).
+	"""
+
+	def __init__(self, trace_memory: bool = False):
+		self.trace_memory = trace_memory
+		self.started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+		self.stages: List[StageRecord] = []
+		self._depth = 0
+		self._peaks: List[int] = []
+
+	@contextmanager
+	def activate(self) -> Iterator["RunReport"]:
+		token = _active.set(self)
+		started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+		if started_tracing:
+			tracemalloc.start()
+		try:
+			yield self
+		finally:
+			if started_tracing:
+				tracemalloc.stop()
+			_active.reset(token)
+
+	@contextmanager
+	def stage(self, name: str) -> Iterator[StageRecord]:
+		record = StageRecord(name, self._depth)
+		self.stages.append(record)
+		tracing = self.trace_memory and tracemalloc.is_tracing()
+		if tracing:
+			current, peak = tracemalloc.get_traced_memory()
+			if self._peaks:
+				# Fold the enclosing stage's peak so far into it before resetting the counter
+				self._peaks[-1] = max(self._peaks[-1], peak)
+			tracemalloc.reset_peak()
+			self._peaks.append(current)
+			baseline = current
+		self._depth += 1
+		start = time.perf_counter()
+		try:
+			yield record
+		finally:
+			record.seconds = time.perf_counter() - start
+			self._depth -= 1
+			if tracing:
+				peak = max(tracemalloc.get_traced_memory()[1], self._peaks.pop())
+				record.peak_mb = round((peak - baseline) / 2**20, 3)
+				if self._peaks:
+					self._peaks[-1] = max(self._peaks[-1], peak)
+
+	def to_frame(self) -> pd.DataFrame:
+		return pd.DataFrame([s.as_dict() for s in self.stages])
+
+	def as_dict(self) -> Dict[str, Any]:
+		return {
+			"started_at": self.started_at,
+			"total_seconds": round(sum(s.seconds for s in self.stages if s.depth == 0), 4),
+			"stages": [s.as_dict() for s in self.stages],
+		}
+
+	def save(self, data_dir: str) -> str:
+		"""Write ``run_report.json`` (latest run) and append the run to ``run_history.jsonl``."""
+		os.makedirs(data_dir, exist_ok=True)
+		payload = self.as_dict()
+		path = os.path.join(data_dir, "run_report.json")
+		with open(path, "w", encoding="utf-8") as f:
+			json.dump(payload, f, indent=2)
+		with open(os.path.join(data_dir, "run_history.jsonl"), "a", encoding="utf-8") as f:
+			f.write(json.dumps(payload) + "\n")
+		return path
+
+
+@contextmanager
+def stage(name: str) -> Iterator[StageRecord]:
+	"""Time a block under the active RunReport; a detached record (not kept) when none is active."""
+	report = _active.get()
+	if report is None:
+		yield StageRecord(name, 0)
+		return
+	with report.stage(name) as record:
+		yield record
+
+
+def instrumented(name: str) -> Callable:
+	"""Decorator form of ``stage``. Rows are the returned DataFrame's length, else the first DataFrame argument's."""
+
+	def decorate(fn: Callable) -> Callable:
+		@functools.wraps(fn)
+		def wrapper(*args, **kwargs):
+			with stage(name) as record:
+				result = fn(*args, **kwargs)
+				if isinstance(result, pd.DataFrame):
+					record.rows = len(result)
+				elif args and isinstance(args[0], pd.DataFrame):
+					record.rows = len(args[0])
+				return result
+
+		return wrapper
+
+	return decorate
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+JOBS_FILE = "jobs.json"
+ACTIVE = ("queued", "running")
+
+
+def job_key(name: str, params: Dict[str, Any]) -> str:
+	"""Identity of a job for deduplication: same name and same (JSON) parameters."""
+	spec = json.dumps({"name": name, "params": params}, sort_keys=True, default=str)
+	return hashlib.sha1(spec.encode("utf-8")).hexdigest()
+
+
+class JobScheduler:
+	"""Runs collection jobs on background threads, off the Streamlit script thread.
+
+	A job is ``fn(progress, **params)``, where ``progress(fraction, message)`` reports how far it
+	got; its return value (JSON-serializable) becomes the job's ``result``. Submitting a job while
+	one with the same name and parameters is queued or running returns the in-flight job instead
+	of starting another, so concurrent dashboard sessions share one collection. Job state is
+	persisted to ``jobs.json`` under ``data_dir`` on every change; jobs left queued or running by
+	a previous process are marked ``interrupted`` on load. Jobs run one at a time by default,
+	since collection jobs write the same store.
+	"""
+
+	def __init__(self, data_dir: str, max_workers: int = 1, keep: int = 50):
+		self.data_dir = data_dir
+		self.keep = keep
+		self._lock = threading.Lock()
+		self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="collector-job")
+		self._schedules: Dict[str, Tuple[str, float, threading.Event]] = {}
+		self._jobs: Dict[str, Dict[str, Any]] = self._load()
+
+	def _path(self) -> str:
+		return os.path.join(self.data_dir, JOBS_FILE)
+
+	def _load(self) -> Dict[str, Dict[str, Any]]:
+		path = self._path()
+		if not os.path.exists(path):
+			return {}
+		try:
+			with open(path, encoding="utf-8") as f:
+				jobs = {job["id"]: job for job in json.load(f)}
+		except (OSError, ValueError, KeyError, TypeError):
+			return {}
+		for job in jobs.values():
+			if job["status"] in ACTIVE:
+				job["status"] = "interrupted"
+		return jobs
+
+	def _save(self) -> None:
+		# Callers hold self._lock; in-flight jobs and the newest ``keep`` finished ones are kept
+		jobs = sorted(self._jobs.values(), key=lambda j: j["submitted_at"])
+		finished = [j for j in jobs if j["status"] not in ACTIVE][-self.keep :]
+		jobs = [j for j in jobs if j["status"] in ACTIVE or j in finished]
+		self._jobs = {job["id"]: job for job in jobs}
+		os.makedirs(self.data_dir, exist_ok=True)
+		tmp_path = self._path() + f".{os.getpid()}.tmp"
+		with open(tmp_path, "w", encoding="utf-8") as f:
+			json.dump(jobs, f, indent=2, default=str)
+		os.replace(tmp_path, self._path())
+
+	def _update(self, job_id: str, **fields: Any) -> None:
+		with self._lock:
+			self._jobs[job_id].update(fields)
+			self._save()
+
+	def submit(self, name: str, fn: Callable[..., Any], params: Dict[str, Any]) -> str:
+		"""Queue ``fn`` with ``params`` and return its job id (or the id of an identical in-flight job)."""
+		key = job_key(name, params)
+		with self._lock:
+			for job in self._jobs.values():
+				if job["key"] == key and job["status"] in ACTIVE:
+					return job["id"]
+			job_id = uuid.uuid4().hex[:12]
+			self._jobs[job_id] = {
+				"id": job_id,
+				"key": key,
+				"name": name,
+				"params": params,
+				"status": "queued",
+				"progress": 0.0,
+				"message": "",
+				"submitted_at": time.time(),
+				"started_at": None,
+				"finished_at": None,
+				"result": None,
+				"error": None,
+			}
+			self._save()
+		self._pool.submit(self._run, job_id, fn, params)
+		return job_id
+
+	def _run(self, job_id: str, fn: Callable[..., Any], params: Dict[str, Any]) -> None:
+		self._update(job_id, status="running", started_at=time.time())
+
+		def progress(fraction: float, message: str = "") -> None:
+			self._update(job_id, progress=round(min(max(fraction, 0.0), 1.0), 3), message=message)
+
+		try:
+			result = fn(progress, **params)
+		except Exception as e:
+			self._update(job_id, status="failed", finished_at=time.time(), error=f"{e}\n{traceback.format_exc(limit=5)}")
+			return
+		self._update(job_id, status="done", progress=1.0, finished_at=time.time(), result=result)
+
+	def schedule(self, name: str, fn: Callable[..., Any], params: Dict[str, Any], interval: float) -> None:
+		"""Submit the job now and then every ``interval`` seconds, replacing any other schedule for
+		``name``; re-scheduling the same parameters and interval is a no-op, so it is safe to call on
+		every dashboard rerun. An interval of 0 (or less) only cancels the existing schedule.
+		"""
+		key = job_key(name, params)
+		with self._lock:
+			current = self._schedules.get(name)
+			if current is not None and current[:2] == (key, interval):
+				return
+			if current is not None:
+				current[2].set()
+				del self._schedules[name]
+			if interval <= 0:
+				return
+			stop = threading.Event()
+			self._schedules[name] = (key, interval, stop)
+
+		def loop() -> None:
+			while not stop.is_set():
+				self.submit(name, fn, params)
+				stop.wait(interval)
+
+		threading.Thread(target=loop, name=f"schedule-{name}", daemon=True).start()
+
+	def get(self, job_id: str) -> Dict[str, Any] | None:
+		with self._lock:
+			job = self._jobs.get(job_id)
+			return dict(job) if job is not None else None
+
+	def jobs(self, name: str | None = None) -> List[Dict[str, Any]]:
+		"""Snapshots of known jobs, newest first."""
+		with self._lock:
+			jobs = [dict(j) for j in self._jobs.values() if name is None or j["name"] == name]
+		return sorted(jobs, key=lambda j: j["submitted_at"], reverse=True)
+
+	def active(self, name: str | None = None) -> List[Dict[str, Any]]:
+		return [j for j in self.jobs(name) if j["status"] in ACTIVE]
+
+	def latest(self, name: str, status: str = "done") -> Dict[str, Any] | None:
+		return next((j for j in self.jobs(name) if j["status"] == status), None)
+
+	def shutdown(self, wait: bool = True) -> None:
+		with self._lock:
+			for _, _, stop in self._schedules.values():
+				stop.set()
+			self._schedules.clear()
+		self._pool.shutdown(wait=wait)
@@ -0,0 +1,258 @@
+import os
+from typing import Dict, Iterator, List, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Typed column schema per dataset; columns not listed (e.g. one per Trends keyword) are inferred
+SCHEMAS: Dict[str, Dict[str, str]] = {
+	"reddit_posts": {
+		"id": "str",
+		"subreddit": "str",
+		"title": "str",
+		"selftext": "str",
+		"score": "int64",
+		"num_comments": "int64",
+		"created_utc": "int64",
+		"url": "str",
+	},
+	"reddit_comments": {
+		"post_id": "str",
+		"comment_id": "str",
+		"body": "str",
+		"score": "int64",
+		"created_utc": "int64",
+	},
+	"youtube_videos": {
+		"video_id": "str",
+		"title": "str",
+		"description": "str",
+		"channel": "str",
+		"published_at": "str",
+	},
+	"youtube_stats": {
+		"video_id": "str",
+		"view_count": "int64",
+		"like_count": "int64",
+		"comment_count": "int64",
+	},
+	"trends": {
+		"date": "datetime",
+	},
+	"components": {
+		"place": "str",
+		"post_engagement": "float64",
+		"post_sentiment": "float64",
+		"comment_engagement": "float64",
+		"comment_sentiment": "float64",
+		"view_count": "float64",
+		"like_count": "float64",
+		"comment_count": "float64",
+	},
+	"cube": {
+		"place": "str",
+		"week": "datetime",
+		"source": "str",
+		"engagement": "float64",
+		"compound": "float64",
+		"rows": "float64",
+		"view_count": "float64",
+		"like_count": "float64",
+		"comment_count": "float64",
+	},
+	"cube_digests": {
+		"source": "str",
+		"week": "datetime",
+		"digest": "int64",
+	},
+	"sentiment_bins": {
+		"place": "str",
+		"compound": "float64",
+		"count": "float64",
+		"density": "float64",
+	},
+	"result": {
+		"place": "str",
+		"score": "float64",
+		"engagement": "float64",
+		"reddit_engagement": "float64",
+		"youtube_engagement": "float64",
+		"sentiment": "float64",
+		"trend": "float64",
+	},
+}
+
+
+# In-memory form of ``DataStore.read(..., compact=True)``: labels repeated across rows become
+# categoricals, other strings are Arrow-backed, integers take the narrowest dtype that holds them
+CATEGORICAL_COLUMNS: Dict[str, List[str]] = {
+	"reddit_posts": ["subreddit"],
+	"reddit_comments": ["post_id"],
+	"youtube_videos": ["channel"],
+	"cube": ["place", "source"],
+	"cube_digests": ["source"],
+}
+# Combined text columns built once per compact frame: name -> (first, separator, second)
+COMBINED_TEXT: Dict[str, Dict[str, Tuple[str, str, str]]] = {
+	"reddit_posts": {"text": ("title", ". ", "selftext")},
+}
+ARROW_STRING = pd.StringDtype("pyarrow")
+# Parquet types of the SCHEMAS kinds
+ARROW_TYPES = {"str": pa.string(), "int64": pa.int64(), "float64": pa.float64(), "datetime": pa.timestamp("ns")}
+
+
+def compact_frame(name: str, df: pd.DataFrame) -> pd.DataFrame:
+	"""``df`` with the compact dtypes of dataset ``name`` and its combined text columns."""
+	out = df.copy(deep=False)
+	categorical = CATEGORICAL_COLUMNS.get(name, [])
+	for col in out.columns:
+		series = out[col]
+		if col in categorical:
+			out[col] = series.astype("category")
+		elif series.dtype == object or isinstance(series.dtype, pd.StringDtype):
+			out[col] = series.astype(ARROW_STRING)
+		elif pd.api.types.is_integer_dtype(series.dtype):
+			out[col] = pd.to_numeric(series, downcast="integer")
+	for col, (first, sep, second) in COMBINED_TEXT.get(name, {}).items():
+		if first in out.columns and second in out.columns:
+			out[col] = out[first].fillna("") + sep + out[second].fillna("")
+	return out
+
+
+def apply_schema(name: str, df: pd.DataFrame) -> pd.DataFrame:
+	"""Coerce the known columns of ``df`` to the dataset's declared dtypes."""
+	return _coerce(df, SCHEMAS.get(name, {}))
+
+
+def _coerce(df: pd.DataFrame, kinds: Dict[str, str]) -> pd.DataFrame:
+	out = df.copy()
+	for col, kind in kinds.items():
+		if col not in out.columns:
+			continue
+		if kind == "str":
+			out[col] = out[col].astype(object).where(out[col].notna(), None)
+			out[col] = out[col].map(lambda v: v if v is None or isinstance(v, str) else str(v))
+		elif kind == "int64":
+			out[col] = pd.to_numeric(out[col], errors="coerce").fillna(0).astype("int64")
+		elif kind == "float64":
+			out[col] = pd.to_numeric(out[col], errors="coerce").astype("float64")
+		elif kind == "datetime":
+			out[col] = pd.to_datetime(out[col], errors="coerce")
+	return out
+
+
+class DataStore:
+	"""Parquet-backed datasets under ``data_dir``.
+
+	Legacy ``<name>.csv`` files are migrated to ``<name>.parquet`` on first read, so existing
+	collection runs keep working unchanged. Once a Parquet copy exists the CSV is ignored: the app
+	no longer writes CSV, so a newer one (e.g. from a checkout) is stale, not fresher data.
+	"""
+
+	def __init__(self, data_dir: str, memory_map: bool = True):
+		self.data_dir = data_dir
+		self.memory_map = memory_map
+
+	def parquet_path(self, name: str) -> str:
+		return os.path.join(self.data_dir, f"{name}.parquet")
+
+	def csv_path(self, name: str) -> str:
+		return os.path.join(self.data_dir, f"{name}.csv")
+
+	def exists(self, name: str) -> bool:
+		return os.path.exists(self.parquet_path(name)) or os.path.exists(self.csv_path(name))
+
+	def fingerprint(self, names: List[str]) -> Tuple[Tuple[str, int, int], ...]:
+		"""(file, mtime_ns, size) of the Parquet file of every dataset in ``names``; changes whenever one is rewritten."""
+		out = []
+		for name in names:
+			# Migrate first so the fingerprint does not change on the first read of a legacy CSV
+			if self._needs_migration(name):
+				self.migrate(name)
+			path = self.parquet_path(name)
+			if os.path.exists(path):
+				stat = os.stat(path)
+				out.append((os.path.basename(path), stat.st_mtime_ns, stat.st_size))
+		return tuple(out)
+
+	def _needs_migration(self, name: str) -> bool:
+		return os.path.exists(self.csv_path(name)) and not os.path.exists(self.parquet_path(name))
+
+	def _csv_schema(self, name: str, chunk_rows: int) -> Tuple[pa.Schema, Dict[str, str]]:
+		# Declared columns take their declared type; the others are unified over every chunk, so a
+		# column that is empty early on still gets the type of its later values
+		csv_path = self.csv_path(name)
+		declared = SCHEMAS.get(name, {})
+		header = list(pd.read_csv(csv_path, nrows=0).columns)
+		others = [c for c in header if c not in declared]
+		inferred: Dict[str, pa.DataType] = {}
+		if others:
+			for chunk in pd.read_csv(csv_path, usecols=others, chunksize=chunk_rows):
+				for field in pa.Schema.from_pandas(chunk, preserve_index=False):
+					seen = inferred.get(field.name)
+					try:
+						inferred[field.name] = field.type if seen is None else pa.unify_schemas([pa.schema([(field.name, seen)]), pa.schema([field])], promote_options="permissive").field(0).type
+					except (pa.ArrowTypeError, pa.ArrowInvalid):
+						inferred[field.name] = pa.string()
+		# Undeclared columns that end up as strings are coerced like declared ones
+		kinds = {**declared, **{c: "str" for c, t in inferred.items() if pa.types.is_string(t)}}
+		schema = pa.schema([(c, ARROW_TYPES[declared[c]] if c in declared else inferred[c]) for c in header])
+		return schema, kinds
+
+	def migrate(self, name: str, chunk_rows: int = 200_000) -> None:
+		"""Convert the legacy CSV of ``name`` to Parquet; an existing Parquet file is never replaced."""
+		path = self.parquet_path(name)
+		if os.path.exists(path) or not os.path.exists(self.csv_path(name)):
+			return
+		# Converted chunk by chunk so a large legacy CSV never has to fit in memory
+		schema, kinds = self._csv_schema(name, chunk_rows)
+		dtypes = {c: str for c, kind in kinds.items() if kind == "str"}
+		tmp_path = path + ".tmp"
+		with pq.ParquetWriter(tmp_path, schema) as writer:
+			for chunk in pd.read_csv(self.csv_path(name), dtype=dtypes, chunksize=chunk_rows):
+				writer.write_table(pa.Table.from_pandas(_coerce(chunk, kinds), schema=schema, preserve_index=False))
+		os.replace(tmp_path, path)
+
+	def _to_pandas(self, name: str, table: pa.Table, compact: bool) -> pd.DataFrame:
+		if not compact:
+			return table.to_pandas()
+		# Strings stay in Arrow buffers instead of becoming one Python object per cell
+		return compact_frame(name, table.to_pandas(types_mapper={pa.string(): ARROW_STRING, pa.large_string(): ARROW_STRING}.get))
+
+	def read(self, name: str, columns: List[str] | None = None, compact: bool = False) -> pd.DataFrame:
+		"""Load a dataset, optionally projecting to ``columns``; missing datasets load as empty.
+
+		With ``compact`` the frame uses the dataset's compact in-memory dtypes (see ``compact_frame``).
+		"""
+		if self._needs_migration(name):
+			self.migrate(name)
+		path = self.parquet_path(name)
+		if not os.path.exists(path):
+			return pd.DataFrame()
+		if columns is not None:
+			available = set(pq.read_schema(path).names)
+			columns = [c for c in columns if c in available]
+		return self._to_pandas(name, pq.read_table(path, columns=columns, memory_map=self.memory_map), compact)
+
+	def iter_chunks(self, name: str, columns: List[str] | None = None, chunk_rows: int = 100_000, compact: bool = False) -> Iterator[pd.DataFrame]:
+		"""Stream a dataset as DataFrames of at most ``chunk_rows`` rows."""
+		if self._needs_migration(name):
+			self.migrate(name)
+		path = self.parquet_path(name)
+		if not os.path.exists(path):
+			return
+		parquet = pq.ParquetFile(path, memory_map=self.memory_map)
+		if columns is not None:
+			columns = [c for c in columns if c in parquet.schema_arrow.names]
+		for batch in parquet.iter_batches(batch_size=chunk_rows, columns=columns):
+			yield self._to_pandas(name, pa.Table.from_batches([batch]), compact)
+
+	def write(self, name: str, df: pd.DataFrame) -> str:
+		os.makedirs(self.data_dir, exist_ok=True)
+		path = self.parquet_path(name)
+		table = pa.Table.from_pandas(apply_schema(name, df), preserve_index=False)
+		tmp_path = path + ".tmp"
+		pq.write_table(table, tmp_path)
+		os.replace(tmp_path, path)
+		return path
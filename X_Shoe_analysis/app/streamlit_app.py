@@ -14,17 +14,35 @@ for p in [PROJECT_ROOT, CURRENT_DIR]:
 		sys.path.insert(0, p)
 
 try:
-	from app.collectors.reddit import fetch_reddit_posts, fetch_reddit_comments
-	from app.collectors.youtube import search_youtube_videos, fetch_video_stats
-	from app.collectors.trends import fetch_trends
-	from app.analysis.scoring import aggregate_signal
-	from app.viz.charts import bar_scores, radar_components, bar_components, donut_components, stacked_engagement, sentiment_density
+	from app.cities import CITIES
+	from app.collection import has_api_keys, run_city_collection, run_collection, trends_store
+	from app.scheduler import JobScheduler
+	from app.analysis.scoring import DEFAULT_WEIGHTS, combine_components, extract_components_streaming, extract_signals
+	from app.analysis.summary import describe_uncertainty
+	from app.analysis.bootstrap import bootstrap_intervals
+	from app.analysis.comparison import compare_cities, extract_city_components
+	from app.analysis.cube import ScoreCube
+	from app.analysis.distribution import BIN_COLUMNS, sentiment_bins
+	from app.analysis.sensitivity import pairwise_share, ranking_stability, sample_weights, sweep_scores
+	from app.analysis.sentiment import SentimentCache
+	from app.storage import DataStore
+	from app.instrumentation import RunReport, stage
+	from app.viz.charts import bar_scores, radar_components, bar_components, donut_components, stacked_engagement, sentiment_density, ranking_stability_bar, score_history_line, city_scores_bar
 except ModuleNotFoundError:
-	from collectors.reddit import fetch_reddit_posts, fetch_reddit_comments
-	from collectors.youtube import search_youtube_videos, fetch_video_stats
-	from collectors.trends import fetch_trends
-	from analysis.scoring import aggregate_signal
-	from viz.charts import bar_scores, radar_components, bar_components, donut_components, stacked_engagement, sentiment_density
+	from cities import CITIES
+	from collection import has_api_keys, run_city_collection, run_collection, trends_store
+	from scheduler import JobScheduler
+	from analysis.scoring import DEFAULT_WEIGHTS, combine_components, extract_components_streaming, extract_signals
+	from analysis.summary import describe_uncertainty
+	from analysis.bootstrap import bootstrap_intervals
+	from analysis.comparison import compare_cities, extract_city_components
+	from analysis.cube import ScoreCube
+	from analysis.distribution import BIN_COLUMNS, sentiment_bins
+	from analysis.sensitivity import pairwise_share, ranking_stability, sample_weights, sweep_scores
+	from analysis.sentiment import SentimentCache
+	from storage import DataStore
+	from instrumentation import RunReport, stage
+	from viz.charts import bar_scores, radar_components, bar_components, donut_components, stacked_engagement, sentiment_density, ranking_stability_bar, score_history_line, city_scores_bar
 
 
 load_dotenv()
@@ -46,18 +64,45 @@ high_street_keywords = [
 	"Anna Nagar",
 ]
 
+places: Dict[str, List[str]] = {
+	"Malls": mall_keywords,
+	"High Streets": high_street_keywords,
+}
+
 default_queries = ["sneakers", "running shoes", "basketball shoes", "sportswear", "streetwear", "athleisure"]
 
 query_terms: List[str] = st.sidebar.multiselect("Search topics", default_queries, default=default_queries)
 geo = st.sidebar.selectbox("Google Trends geo", ["IN-TN", "IN-TN-CH"], index=0)
 reddit_subs = st.sidebar.text_input("Reddit subs (comma)", value="bangalore,mumbai,chennai,india,IndianStreetWear,Sneakers")
 limit = st.sidebar.slider("Results per source", 50, 300, 150, step=50)
+sentiment_workers = int(st.sidebar.number_input("Sentiment workers", min_value=1, max_value=max(1, os.cpu_count() or 1), value=1, step=1))
 auto_run = st.sidebar.checkbox("Auto-run on load (once)", value=True)
-use_cached = st.sidebar.checkbox("Use cached CSVs in data/ if available", value=True)
+use_cached = st.sidebar.checkbox("Use cached data and API responses in data/ if available", value=True)
+incremental_reddit = st.sidebar.checkbox("Incremental Reddit refresh (only fetch newer posts)", value=True)
+trace_memory = st.sidebar.checkbox("Trace memory per stage (slower)", value=False)
+streaming = st.sidebar.checkbox("Streaming scoring (bounded memory, for large Reddit dumps)", value=False)
+with st.sidebar.expander("Score weights"):
+	# Reweighting only recombines the cached component matrix; nothing is re-collected or re-scored
+	weights = {
+		"engagement": st.number_input("Engagement weight", 0.0, 1.0, DEFAULT_WEIGHTS["engagement"], 0.05),
+		"sentiment": st.number_input("Sentiment weight", 0.0, 1.0, DEFAULT_WEIGHTS["sentiment"], 0.05),
+		"trend": st.number_input("Trend weight", 0.0, 1.0, DEFAULT_WEIGHTS["trend"], 0.05),
+		"engagement_scale": st.number_input("Engagement saturation scale", 1.0, 1e7, DEFAULT_WEIGHTS["engagement_scale"], 1000.0),
+		"view": st.number_input("YouTube weight per view", 0.0, 10.0, DEFAULT_WEIGHTS["view"], 0.001, format="%.4f"),
+		"like": st.number_input("YouTube weight per like", 0.0, 10.0, DEFAULT_WEIGHTS["like"], 0.01, format="%.3f"),
+		"yt_comment": st.number_input("YouTube weight per comment", 0.0, 10.0, DEFAULT_WEIGHTS["yt_comment"], 0.05),
+	}
+	sweep_samples = int(st.number_input("What-if weightings to sample", 100, 100_000, 5000, 500))
+	bootstrap_samples = int(st.number_input("Bootstrap resamples (0 = no intervals)", 0, 20_000, 2000, 500))
+refresh_minutes = int(st.sidebar.number_input("Background refresh every N minutes (0 = off)", min_value=0, max_value=24 * 60, value=0, step=15))
 run_button = st.sidebar.button("Run Analysis")
+cities_button = st.sidebar.button(f"Collect all cities ({len(CITIES)})", help="One shared collection for every city in app/cities.py, stored in data/cities/")
+subs = [s.strip() for s in reddit_subs.split(",") if s.strip()]
+if st.sidebar.button("Clear cached results"):
+	st.cache_data.clear()
 
 # Trigger once on first load if auto_run is enabled and credentials exist
-has_keys = bool(os.getenv("YOUTUBE_API_KEY") and os.getenv("REDDIT_CLIENT_ID") and os.getenv("REDDIT_CLIENT_SECRET"))
+has_keys = has_api_keys()
 if "_first_load_done" not in st.session_state:
 	st.session_state["_first_load_done"] = False
 run_trigger = run_button or (auto_run and not st.session_state["_first_load_done"] and has_keys)
@@ -66,120 +111,313 @@ if run_trigger and not st.session_state["_first_load_done"]:
 
 placeholder = st.empty()
 
-if run_trigger:
-	with st.spinner("Collecting data..."):
-		data_dir = os.path.join(PROJECT_ROOT, "data")
-		os.makedirs(data_dir, exist_ok=True)
-
-		# Reddit
-		posts_csv = os.path.join(data_dir, "reddit_posts.csv")
-		comments_csv = os.path.join(data_dir, "reddit_comments.csv")
-		if use_cached and os.path.exists(posts_csv):
-			posts = pd.read_csv(posts_csv)
-			comments = pd.read_csv(comments_csv) if os.path.exists(comments_csv) else pd.DataFrame()
-		else:
-			try:
-				posts = fetch_reddit_posts(query_terms=query_terms, subreddits=[s.strip() for s in reddit_subs.split(",") if s.strip()], limit=limit)
-				comments = fetch_reddit_comments(posts["id"].tolist()[:20]) if not posts.empty else pd.DataFrame()
-				posts.to_csv(posts_csv, index=False)
-				if not comments.empty:
-					comments.to_csv(comments_csv, index=False)
-			except Exception as e:
-				st.warning(f"Reddit collection failed: {e}")
-				posts, comments = pd.DataFrame(), pd.DataFrame()
-
-		# YouTube
-		ytv_csv = os.path.join(data_dir, "youtube_videos.csv")
-		yts_csv = os.path.join(data_dir, "youtube_stats.csv")
-		if use_cached and os.path.exists(ytv_csv):
-			ytv = pd.read_csv(ytv_csv)
-			yts = pd.read_csv(yts_csv) if os.path.exists(yts_csv) else pd.DataFrame()
-		else:
-			try:
-				yt_df_list = []
-				for q in query_terms:
-					yt_df_list.append(search_youtube_videos(f"{q} Chennai", max_results=min(50, limit)))
-				ytv = pd.concat(yt_df_list, ignore_index=True) if yt_df_list else pd.DataFrame()
-				yts = fetch_video_stats(ytv["video_id"].dropna().unique().tolist()) if not ytv.empty else pd.DataFrame()
-				if not ytv.empty:
-					ytv.to_csv(ytv_csv, index=False)
-				if not yts.empty:
-					yts.to_csv(yts_csv, index=False)
-			except Exception as e:
-				st.warning(f"YouTube collection failed: {e}")
-				ytv, yts = pd.DataFrame(), pd.DataFrame()
-
-		# Trends
-		trends_csv = os.path.join(data_dir, "trends.csv")
-		if use_cached and os.path.exists(trends_csv):
-			trends = pd.read_csv(trends_csv)
-		else:
-			try:
-				trends = fetch_trends(queries=query_terms, geo=geo)
-				if not trends.empty:
-					trends.to_csv(trends_csv, index=False)
-			except Exception as e:
-				st.warning(f"Trends collection failed: {e}")
-				trends = pd.DataFrame()
-
-		# Scoring
-		places: Dict[str, List[str]] = {
-			"Malls": mall_keywords,
-			"High Streets": high_street_keywords,
-		}
-		result = aggregate_signal(reddit_posts=posts, reddit_comments=comments, yt_videos=ytv, yt_stats=yts, trends_df=trends, location_keywords=places)
-
-		st.subheader("Fit Score: Malls vs High Streets")
-		fig = bar_scores(result)
-		if fig:
-			st.plotly_chart(fig, use_container_width=True)
-
-		st.subheader("Signal Components")
-		chart_type = st.selectbox("Component chart type", ["Radar", "Bar", "Donut"], index=1)
-		if chart_type == "Radar":
-			fig2 = radar_components(result)
-		elif chart_type == "Bar":
-			fig2 = bar_components(result)
-		else:
-			fig2 = donut_components(result)
-		if fig2:
-			st.plotly_chart(fig2, use_container_width=True)
-
-		st.subheader("Engagement Breakdown")
-		fig3 = stacked_engagement(result)
-		if fig3:
-			st.plotly_chart(fig3, use_container_width=True)
-
-		st.subheader("Sentiment Overview")
-		fig4 = sentiment_density(result)
-		if fig4:
-			st.plotly_chart(fig4, use_container_width=True)
-
-		st.subheader("Data Snapshots")
-		col1, col2, col3 = st.columns(3)
-		with col1:
-			st.caption("Reddit posts")
-			st.dataframe(posts.head(20))
-		with col2:
-			st.caption("YouTube videos")
-			st.dataframe(ytv.head(20))
-		with col3:
-			st.caption("Google Trends")
-			st.dataframe(trends.tail(10))
-
-		# Insight
-		st.subheader("Sharp Insight")
-		if not result.empty:
-			best = result.iloc[0]
-			insight = f"{best['place']} show the strongest composite signal driven by engagement ({best['engagement']:.0f}) and sentiment ({best['sentiment']:.2f})."
-			st.success(insight)
-
-		st.subheader("Authentic Launch Suggestions")
-		st.markdown(
-			"- Collaborate with local sneaker and streetwear communities in Chennai for pop-ups and UGC.\n"
-			"- Influencer runs from T Nagar to EA Mall showcasing everyday-to-premium product transitions.\n"
-			"- Limited-edition Chennai colorway drop tied to local sports culture (CSK/Marina)."
+data_dir = os.path.join(PROJECT_ROOT, "data")
+cities_dir = os.path.join(data_dir, "cities")
+store = DataStore(data_dir)
+report = RunReport(trace_memory=trace_memory)
+
+# Cached results expire after CACHE_TTL seconds; "Clear cached results" drops them immediately.
+# Every loader/scorer takes the data files' fingerprint, so rewritten data is never served stale.
+CACHE_TTL = 3600
+SOURCES = ["reddit_posts", "reddit_comments", "youtube_videos", "youtube_stats", "trends"]
+# Streaming scoring reads Reddit in chunks of STREAM_CHUNK_ROWS, projected to the columns it uses
+STREAM_CHUNK_ROWS = 100_000
+STREAM_COLUMNS = {"reddit_posts": ["title", "selftext", "score", "num_comments"], "reddit_comments": ["body", "score"]}
+FIGURES = {
+	"scores": bar_scores,
+	"Radar": radar_components,
+	"Bar": bar_components,
+	"Donut": donut_components,
+	"engagement": stacked_engagement,
+}
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def load_dataset(data_dir: str, name: str, fingerprint: tuple) -> pd.DataFrame:
+	# Compact dtypes (categoricals, Arrow strings, narrow ints) keep cached corpora small
+	return DataStore(data_dir).read(name, compact=True)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner="Scoring places...")
+def extract_place_components(data_dir: str, places: Dict[str, List[str]], params: tuple, fingerprint: tuple, sentiment_workers: int, streaming: bool = False):
+	# params (query terms, subreddits, geo, limit) only key the cache; the data comes from the store
+	sentiment_cache = SentimentCache(os.path.join(data_dir, "sentiment_cache.csv"))
+	if streaming:
+		# Reddit is never fully materialized (nor held in the load_dataset cache); YouTube/Trends are small
+		store = DataStore(data_dir)
+		components = extract_components_streaming(
+			post_chunks=store.iter_chunks("reddit_posts", STREAM_COLUMNS["reddit_posts"], STREAM_CHUNK_ROWS, compact=True),
+			comment_chunks=store.iter_chunks("reddit_comments", STREAM_COLUMNS["reddit_comments"], STREAM_CHUNK_ROWS, compact=True),
+			yt_videos=load_dataset(data_dir, "youtube_videos", fingerprint),
+			yt_stats=load_dataset(data_dir, "youtube_stats", fingerprint),
+			trends_df=load_dataset(data_dir, "trends", fingerprint),
+			location_keywords=places,
+			sentiment_cache=sentiment_cache,
+			sentiment_workers=sentiment_workers,
+		)
+		# Streaming keeps only running totals, so there are no per-row signals to bootstrap
+		signals = None
+	else:
+		frames = {name: load_dataset(data_dir, name, fingerprint) for name in SOURCES}
+		signals = extract_signals(
+			reddit_posts=frames["reddit_posts"],
+			reddit_comments=frames["reddit_comments"],
+			yt_videos=frames["youtube_videos"],
+			yt_stats=frames["youtube_stats"],
+			trends_df=frames["trends"],
+			location_keywords=places,
+			sentiment_cache=sentiment_cache,
+			sentiment_workers=sentiment_workers,
 		)
+		components = signals.components()
+	sentiment_cache.save()
+	# Binned per-row sentiment for the distribution chart; the deck (export_ppt) reuses the stored bins
+	bins = sentiment_bins(signals) if signals is not None else pd.DataFrame(columns=BIN_COLUMNS)
+	return components, signals, bins
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner="Updating score history...")
+def update_score_cube(data_dir: str, places: Dict[str, List[str]], fingerprint: tuple, sentiment_workers: int) -> ScoreCube:
+	# Only weeks whose rows changed since the stored cube are re-matched and re-scored; the caller saves it
+	cube = ScoreCube.load(DataStore(data_dir), places)
+	sentiment_cache = SentimentCache(os.path.join(data_dir, "sentiment_cache.csv"))
+	frames = {name: load_dataset(data_dir, name, fingerprint) for name in SOURCES}
+	if cube.update(frames["reddit_posts"], frames["reddit_comments"], frames["youtube_videos"], frames["youtube_stats"], sentiment_cache, sentiment_workers):
+		sentiment_cache.save()
+	return cube
+
+
+def changed_since_last_write(name: str, key: tuple) -> bool:
+	"""True the first time ``key`` is seen for ``name`` in this session; cached results are reused, so
+	whether to write them again is decided here rather than inside the cached functions."""
+	if st.session_state.get(f"_written_{name}") == key:
+		return False
+	st.session_state[f"_written_{name}"] = key
+	return True
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner="Scoring cities...")
+def extract_cities(cities_dir: str, cities: Dict[str, Dict], fingerprint: tuple, sentiment_workers: int) -> pd.DataFrame:
+	# One match and sentiment pass over the shared collection for every city's places
+	frames = {name: load_dataset(cities_dir, name, fingerprint) for name in SOURCES if name != "trends"}
+	trends_by_geo = {geo: trends_store(cities_dir, geo).read("trends") for geo in {spec["geo"] for spec in cities.values()}}
+	sentiment_cache = SentimentCache(os.path.join(cities_dir, "sentiment_cache.csv"))
+	components = extract_city_components(
+		frames["reddit_posts"], frames["reddit_comments"], frames["youtube_videos"], frames["youtube_stats"], trends_by_geo, cities, sentiment_cache, sentiment_workers
+	)
+	sentiment_cache.save()
+	return components
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def score_places(components: pd.DataFrame, _signals, weights: Dict[str, float], bootstrap_samples: int) -> pd.DataFrame:
+	# _signals is not hashed: it comes from the same cached extraction as components, which keys the cache
+	result = combine_components(components, weights)
+	if _signals is not None and bootstrap_samples > 0:
+		intervals = bootstrap_intervals(_signals, weights, n_boot=bootstrap_samples)
+		result = result.merge(intervals, on="place", how="left")
+	return result
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def weight_sweep(components: pd.DataFrame, samples: int) -> pd.DataFrame:
+	return sweep_scores(components, sample_weights(samples))
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def build_figure(kind: str, result: pd.DataFrame):
+	return FIGURES[kind](result)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def sentiment_figure(result: pd.DataFrame, bins: pd.DataFrame):
+	return sentiment_density(result, bins)
+
+
+@st.cache_resource
+def get_scheduler(data_dir: str) -> JobScheduler:
+	# One scheduler per server process, shared by every session, so identical runs are collected once
+	return JobScheduler(data_dir)
+
+
+scheduler = get_scheduler(data_dir)
+job_params = {
+	"data_dir": data_dir,
+	"query_terms": query_terms,
+	"subreddits": subs,
+	"places": places,
+	"geo": geo,
+	"limit": limit,
+	"use_cached": use_cached,
+	"incremental": incremental_reddit,
+	"trace_memory": trace_memory,
+}
+# Collection runs in the background; the page keeps showing the latest completed snapshot meanwhile
+scheduler.schedule("collect", run_collection, job_params, refresh_minutes * 60 if has_keys else 0)
+if run_trigger:
+	scheduler.submit("collect", run_collection, job_params)
+if cities_button:
+	# Shares the sidebar's topics, subreddits and limits; each city brings its own geo and places
+	city_params = {key: job_params[key] for key in ["query_terms", "subreddits", "limit", "use_cached", "incremental", "trace_memory"]}
+	scheduler.submit("collect_cities", run_city_collection, {"data_dir": cities_dir, "cities": CITIES, **city_params})
+
+fragment = getattr(st, "fragment", None) or st.experimental_fragment
+
+
+@fragment(run_every=2)
+def collection_status():
+	active = scheduler.active("collect") + scheduler.active("collect_cities")
+	if active:
+		job = active[0]
+		label = "queued" if job["status"] == "queued" else job["message"]
+		what = "all cities" if job["name"] == "collect_cities" else "in background"
+		st.progress(job["progress"], text=f"Collecting {what}: {label}")
+		st.session_state["_collecting"] = True
+	elif st.session_state.pop("_collecting", False):
+		# A job just finished: rerun the whole page on the new snapshot
+		st.rerun()
+	last = next((j for j in scheduler.jobs("collect") if j["status"] not in ("queued", "running")), None)
+	if last is None:
+		return
+	if last["status"] == "done":
+		for note in last["result"]["notes"]:
+			st.caption(note)
+		for warning in last["result"]["warnings"]:
+			st.warning(warning)
+	else:
+		error = (last["error"] or "").splitlines()
+		st.warning(f"Last collection {last['status']}" + (f": {error[0]}" if error else ""))
+
+
+collection_status()
+
+if any(store.exists(name) for name in SOURCES):
+	with report.activate():
+		fingerprint = store.fingerprint(SOURCES)
+		params = (tuple(query_terms), tuple(subs), geo, limit)
+		with stage("dashboard.score") as record:
+			components, signals, bins = extract_place_components(data_dir, places, params, fingerprint, sentiment_workers, streaming)
+			# The cube needs whole datasets, so streaming mode goes without history and date filtering
+			cube = None if streaming else update_score_cube(data_dir, places, fingerprint, sentiment_workers)
+			if cube is not None and changed_since_last_write("cube", fingerprint):
+				cube.save(store)
+			date_key = None
+			first_week, last_week = cube.date_span() if cube is not None else (pd.NaT, pd.NaT)
+			if pd.notna(first_week):
+				span = (first_week.date(), (last_week + pd.Timedelta(days=6)).date())
+				date_range = st.sidebar.date_input("Score date range", value=span, min_value=span[0], max_value=span[1])
+				if len(date_range) == 2 and tuple(date_range) != span:
+					# Answered from the cube's weekly sums; bootstrap intervals need full-range rows
+					components = cube.components(load_dataset(data_dir, "trends", fingerprint), *date_range)
+					# Re-binned over the same weeks, so the chart and the deck's stored bins follow the filter
+					bins = sentiment_bins(signals, start=date_range[0], end=date_range[1])
+					signals = None
+					date_key = tuple(date_range)
+			result = score_places(components, signals, weights, bootstrap_samples)
+			# The deck (export_ppt) reads what the dashboard last scored; rewritten only when its inputs change,
+			# not on reruns from widgets (chart type, ...) that leave them as they were
+			inputs_key = (params, fingerprint, streaming, date_key)
+			if changed_since_last_write("components", inputs_key) or not store.exists("components"):
+				store.write("components", components.reset_index())
+				store.write("sentiment_bins", bins)
+			if changed_since_last_write("result", (inputs_key, tuple(sorted(weights.items())), bootstrap_samples)) or not store.exists("result"):
+				store.write("result", result)
+			record.rows = len(result)
+		with stage("dashboard.sensitivity"):
+			sweep = weight_sweep(components, sweep_samples)
+			stability = ranking_stability(sweep)
+		with stage("dashboard.load_snapshots"):
+			posts = load_dataset(data_dir, "reddit_posts", fingerprint)
+			ytv = load_dataset(data_dir, "youtube_videos", fingerprint)
+			trends = load_dataset(data_dir, "trends", fingerprint)
+		with stage("dashboard.figures"):
+			figures = {kind: build_figure(kind, result) for kind in FIGURES}
+			figures["sentiment"] = sentiment_figure(result, bins)
+			figures["stability"] = ranking_stability_bar(stability)
+
+	st.subheader("Fit Score: Malls vs High Streets")
+	fig = figures["scores"]
+	if fig:
+		st.plotly_chart(fig, use_container_width=True)
+
+	st.subheader("Signal Components")
+	chart_type = st.selectbox("Component chart type", ["Radar", "Bar", "Donut"], index=1)
+	fig2 = figures[chart_type]
+	if fig2:
+		st.plotly_chart(fig2, use_container_width=True)
+
+	st.subheader("Engagement Breakdown")
+	fig3 = figures["engagement"]
+	if fig3:
+		st.plotly_chart(fig3, use_container_width=True)
+
+	st.subheader("Sentiment Overview")
+	fig4 = figures["sentiment"]
+	if fig4:
+		st.plotly_chart(fig4, use_container_width=True)
+
+	if cube is not None:
+		st.subheader("Score History")
+		freq = st.radio("History granularity", ["Weekly", "Monthly"], horizontal=True)
+		history = cube.history(trends, weights, freq="W" if freq == "Weekly" else "M")
+		fig_history = score_history_line(history)
+		if fig_history:
+			st.plotly_chart(fig_history, use_container_width=True)
+
+	st.subheader("Ranking Stability Across Weightings")
+	first, second = list(places)[:2]
+	st.caption(
+		f"{first} outrank {second} under {pairwise_share(sweep, first, second):.0%} of {len(sweep)} sampled weightings "
+		"(component weights summing to 1; YouTube and saturation weights within 10x of the defaults)."
+	)
+	if figures["stability"]:
+		st.plotly_chart(figures["stability"], use_container_width=True)
+	st.dataframe(stability, use_container_width=True)
+
+	st.subheader("Data Snapshots")
+	col1, col2, col3 = st.columns(3)
+	with col1:
+		st.caption("Reddit posts")
+		st.dataframe(posts.head(20))
+	with col2:
+		st.caption("YouTube videos")
+		st.dataframe(ytv.head(20))
+	with col3:
+		st.caption("Google Trends")
+		st.dataframe(trends.tail(10))
+
+	# Insight
+	st.subheader("Sharp Insight")
+	if not result.empty:
+		best = result.iloc[0]
+		insight = f"{best['place']} show the strongest composite signal driven by engagement ({best['engagement']:.0f}) and sentiment ({best['sentiment']:.2f})."
+		note = describe_uncertainty(result)
+		if note:
+			insight += " " + note
+		st.success(insight)
+
+	st.subheader("Authentic Launch Suggestions")
+	st.markdown(
+		"- Collaborate with local sneaker and streetwear communities in Chennai for pop-ups and UGC.\n"
+		"- Influencer runs from T Nagar to EA Mall showcasing everyday-to-premium product transitions.\n"
+		"- Limited-edition Chennai colorway drop tied to local sports culture (CSK/Marina)."
+	)
+
+	with st.expander("Run diagnostics (per-stage timing, rows, memory)"):
+		st.dataframe(report.to_frame(), use_container_width=True)
+		st.caption(f"Stages run this rerun: {len(report.stages)}; cached stages show near-zero time.")
+	if run_trigger:
+		report.save(data_dir)
+
+city_store = DataStore(cities_dir)
+if any(city_store.exists(name) for name in SOURCES if name != "trends"):
+	st.subheader("Cross-City Comparison")
+	city_fingerprint = city_store.fingerprint(SOURCES) + tuple(f for geo in sorted({spec["geo"] for spec in CITIES.values()}) for f in trends_store(cities_dir, geo).fingerprint(["trends"]))
+	comparison = compare_cities(extract_cities(cities_dir, CITIES, city_fingerprint, sentiment_workers), weights)
+	fig_cities = city_scores_bar(comparison)
+	if fig_cities:
+		st.plotly_chart(fig_cities, use_container_width=True)
+	st.dataframe(comparison, use_container_width=True)
 
 if not (os.getenv("YOUTUBE_API_KEY") and os.getenv("REDDIT_CLIENT_ID") and os.getenv("REDDIT_CLIENT_SECRET")):
 	st.info("Set environment variables YOUTUBE_API_KEY, REDDIT_CLIENT_ID, REDDIT_CLIENT_SECRET, and optionally REDDIT_USER_AGENT. Then run: streamlit run app/streamlit_app.py")
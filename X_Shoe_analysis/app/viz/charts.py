@@ -1,62 +1,159 @@
+import hashlib
+import json
+import os
+import re
+from typing import Dict
+
 import pandas as pd
-import plotly.express as px
-import plotly.io as pio
 
+try:
+	from app.instrumentation import instrumented
+except ModuleNotFoundError:
+	from instrumentation import instrumented
+
+# Export size for deck images; part of the image cache key
+IMAGE_SIZE = {"scale": 2, "width": 1200, "height": 700}
+# Files save_figs owns in its image dir (finished or interrupted renders)
+IMAGE_NAME = re.compile(r".+-[0-9a-f]{16}\.png(\.tmp)?$")
+
+
+def _px():
+	# Plotly loads with the first chart, not when the dashboard or deck exporter starts
+	import plotly.express as px
+
+	return px
 
+
+def _error_bars(df: pd.DataFrame, column: str):
+	# Asymmetric bootstrap error bars when the result carries <column>_lo / <column>_hi
+	if f"{column}_lo" not in df.columns:
+		return df, {}
+	out = df.assign(**{f"{column}_plus": df[f"{column}_hi"] - df[column], f"{column}_minus": df[column] - df[f"{column}_lo"]})
+	return out, {"error_y": f"{column}_plus", "error_y_minus": f"{column}_minus"}
+
+
+@instrumented("charts.bar_scores")
 def bar_scores(df: pd.DataFrame):
 	if df.empty:
 		return None
-	return px.bar(df, x="place", y="score", title="Location Fit Scores")
+	df, errors = _error_bars(df, "score")
+	return _px().bar(df, x="place", y="score", title="Location Fit Scores", **errors)
 
 
+@instrumented("charts.radar_components")
 def radar_components(df: pd.DataFrame):
 	if df.empty:
 		return None
 	sub = df.melt(id_vars=["place"], value_vars=["engagement", "sentiment", "trend"], var_name="metric", value_name="value")
-	fig = px.line_polar(sub, r="value", theta="metric", color="place", line_close=True, title="Signal Components by Location")
+	fig = _px().line_polar(sub, r="value", theta="metric", color="place", line_close=True, title="Signal Components by Location")
 	fig.update_traces(fill="toself")
 	return fig
 
 
+@instrumented("charts.bar_components")
 def bar_components(df: pd.DataFrame):
 	if df.empty:
 		return None
 	sub = df.melt(id_vars=["place"], value_vars=["engagement", "sentiment", "trend"], var_name="metric", value_name="value")
-	return px.bar(sub, x="metric", y="value", color="place", barmode="group", title="Signal Components (Bar)")
+	return _px().bar(sub, x="metric", y="value", color="place", barmode="group", title="Signal Components (Bar)")
 
 
+@instrumented("charts.donut_components")
 def donut_components(df: pd.DataFrame):
 	if df.empty:
 		return None
 	# Share of each component within each place
-	rows = []
-	for _, row in df.iterrows():
-		total = float(row["engagement"] + row["sentiment"] + row["trend"]) or 1.0
-		for metric in ["engagement", "sentiment", "trend"]:
-			rows.append({"place": row["place"], "metric": metric, "share": float(row[metric]) / total})
-	sub = pd.DataFrame(rows)
-	fig = px.pie(sub, names="metric", values="share", facet_col="place", hole=0.6, title="Signal Components Share (Donut)")
+	metrics = ["engagement", "sentiment", "trend"]
+	total = df[metrics].sum(axis=1).replace(0, 1.0)
+	shares = df[metrics].div(total, axis=0).assign(place=df["place"].to_numpy())
+	sub = shares.melt(id_vars=["place"], value_vars=metrics, var_name="metric", value_name="share")
+	fig = _px().pie(sub, names="metric", values="share", facet_col="place", hole=0.6, title="Signal Components Share (Donut)")
 	return fig
 
 
+@instrumented("charts.stacked_engagement")
 def stacked_engagement(df: pd.DataFrame):
 	if df.empty:
 		return None
 	# Stacked bar of Reddit vs YouTube engagement by place
 	sub = df.melt(id_vars=["place"], value_vars=["reddit_engagement", "youtube_engagement"], var_name="source", value_name="value")
-	return px.bar(sub, x="place", y="value", color="source", barmode="stack", title="Engagement Sources by Location")
+	return _px().bar(sub, x="place", y="value", color="source", barmode="stack", title="Engagement Sources by Location")
+
+
+@instrumented("charts.ranking_stability")
+def ranking_stability_bar(stability: pd.DataFrame):
+	if stability.empty:
+		return None
+	return _px().bar(stability, x="place", y="win_share", title="Share of Weightings Ranking Each Place First", range_y=[0, 1])
+
+
+@instrumented("charts.score_history")
+def score_history_line(history: pd.DataFrame):
+	if history.empty:
+		return None
+	return _px().line(history, x="period", y="score", color="place", markers=True, title="Fit Score Over Time")
+
 
+@instrumented("charts.city_scores")
+def city_scores_bar(comparison: pd.DataFrame):
+	if comparison.empty:
+		return None
+	return _px().bar(comparison, x="city", y="score", color="place", barmode="group", title="Fit Scores Across Cities")
+
+
+@instrumented("charts.sentiment_density")
+def sentiment_density(df: pd.DataFrame, bins: pd.DataFrame | None = None):
+	"""Per-place sentiment distribution from precomputed bins (``analysis.distribution.sentiment_bins``).
 
-def sentiment_density(df: pd.DataFrame):
+	Only the binned KDE grid is drawn, as WebGL traces, so the figure stays the same size however
+	many rows were scored. Without bins (streaming scores) it falls back to the mean sentiment per
+	place.
+	"""
+	if bins is not None and not bins.empty:
+		return _px().line(
+			bins, x="compound", y="density", color="place", render_mode="webgl", range_x=[-1, 1], title="Sentiment Distribution by Location", hover_data=["count"]
+		)
 	if df.empty:
 		return None
-	# Sentiment distribution proxy (bar per place). If more granular data available, this can be a KDE.
-	return px.bar(df, x="place", y="sentiment", title="Average Sentiment by Location", range_y=[-1, 1])
+	df, errors = _error_bars(df, "sentiment")
+	return _px().bar(df, x="place", y="sentiment", title="Average Sentiment by Location", range_y=[-1, 1], **errors)
+
+
+def figure_key(fig) -> str:
+	"""Hash of the full figure spec and export size; equal keys render identical images."""
+	spec = fig.to_json() + json.dumps(IMAGE_SIZE, sort_keys=True)
+	return hashlib.sha1(spec.encode("utf-8")).hexdigest()
 
 
+@instrumented("charts.save_fig")
 def save_fig(fig, path: str):
 	if fig is None:
 		return
-	pio.write_image(fig, path, scale=2, width=1200, height=700)
+	import plotly.io as pio
+
+	# Render to a temp file first so an interrupted export never leaves a truncated cached image
+	tmp_path = path + ".tmp"
+	pio.write_image(fig, tmp_path, format="png", **IMAGE_SIZE)
+	os.replace(tmp_path, path)
+
+
+@instrumented("charts.save_figs")
+def save_figs(figs: Dict[str, object], img_dir: str) -> Dict[str, str]:
+	"""Render ``figs`` (name -> figure or None) to ``img_dir/<name>-<spec hash>.png``; returns name -> path.
+
+	An image whose spec hash is already on disk is reused without rendering. Misses are rendered
+	one after another, since plotly drives a single Kaleido process; it stays warm for every later
+	export in the same process. Images of earlier figure sets are removed.
+	"""
+	os.makedirs(img_dir, exist_ok=True)
+	paths = {name: os.path.join(img_dir, f"{name}-{figure_key(fig)[:16]}.png") for name, fig in figs.items() if fig is not None}
+	current = {os.path.basename(path) for path in paths.values()}
+	for entry in os.listdir(img_dir):
+		if IMAGE_NAME.match(entry) and entry not in current:
+			os.remove(os.path.join(img_dir, entry))
+	for name, path in paths.items():
+		if not os.path.exists(path):
+			save_fig(figs[name], path)
+	return paths
 
 
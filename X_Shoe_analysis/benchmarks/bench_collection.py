@@ -0,0 +1,118 @@
+"""End-to-end collector throughput against a local replay of the Reddit, YouTube and Trends APIs.
+
+The unmodified collectors (praw, the YouTube client and pytrends underneath) are pointed at an
+``app.collectors.transport.ReplayServer``; no network or real API keys are used. The archive is a
+recording made with --record (needs live keys once) or, by default, a synthetic one.
+
+Run from X_Shoe_analysis/:
+	python benchmarks/bench_collection.py --workers 1 4 8 --latency 0.05
+	python benchmarks/bench_collection.py --rate 20 --burst 10 --error-rate 0.05
+	python benchmarks/bench_collection.py --record benchmarks/fixtures/collection.jsonl.gz
+	python benchmarks/bench_collection.py --archive benchmarks/fixtures/collection.jsonl.gz --strict
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+import pandas as pd
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if PROJECT_ROOT not in sys.path:
+	sys.path.insert(0, PROJECT_ROOT)
+
+from app.cities import CITIES, DEFAULT_QUERIES, DEFAULT_SUBREDDITS  # noqa: E402
+from app.collection import trends_plan, youtube_queries, youtube_query_limit  # noqa: E402
+from app.collectors.reddit import RateLimiter, fetch_reddit_comments, fetch_reddit_posts  # noqa: E402
+from app.collectors.transport import ReplayServer, record, redirect  # noqa: E402
+from app.collectors.trends import fetch_trends  # noqa: E402
+from app.collectors.youtube import fetch_video_stats, search_youtube_queries  # noqa: E402
+from app.instrumentation import RunReport, stage  # noqa: E402
+from synthetic_api import api_archive  # noqa: E402
+
+
+def run_workload(cities: Dict[str, Dict[str, Any]], subreddits: List[str], limit: int, comment_posts: int, workers: int, min_interval: float, backoff: float) -> List[Dict[str, Any]]:
+	"""One collection in the shape of ``run_city_collection`` (no request cache); stage records."""
+	report = RunReport()
+	throttle = RateLimiter(min_interval=min_interval)
+	with report.activate():
+		for name, collect in [
+			("reddit.posts", lambda: fetch_reddit_posts(DEFAULT_QUERIES, subreddits, limit=limit, max_workers=workers, throttle=throttle)),
+			("reddit.comments", lambda: fetch_reddit_comments(posts["id"].tolist()[:comment_posts], max_workers=workers, throttle=throttle) if not posts.empty else pd.DataFrame()),
+			("youtube.search", lambda: search_youtube_queries(youtube_queries(DEFAULT_QUERIES, list(cities)), max_results=youtube_query_limit(limit, list(cities)))),
+			("youtube.stats", lambda: fetch_video_stats(videos["video_id"].dropna().unique().tolist()) if not videos.empty else pd.DataFrame()),
+			(
+				"trends",
+				lambda: pd.concat([fetch_trends(queries, geo=geo, max_workers=workers, backoff=backoff) for geo, queries in trends_plan(DEFAULT_QUERIES, cities).items()], ignore_index=True),
+			),
+		]:
+			with stage(f"bench.{name}") as record:
+				try:
+					frame = collect()
+					record.rows = len(frame)
+				except Exception as e:
+					# Injected errors and throttling surface here the way they would in a real run
+					frame = pd.DataFrame()
+					record.extra["error"] = f"{type(e).__name__}: {str(e).splitlines()[0][:80]}"
+			if name == "reddit.posts":
+				posts = frame
+			elif name == "youtube.search":
+				videos = frame
+	return [{"stage": s.name, "seconds": round(s.seconds, 4), "rows": s.rows, "error": s.extra.get("error", "")} for s in report.stages if s.depth == 0]
+
+
+def main():
+	parser = argparse.ArgumentParser()
+	parser.add_argument("--archive", default=None, help="Fixture archive to replay (default: synthetic)")
+	parser.add_argument("--record", default=None, help="Run the workload against the live APIs and save their responses here")
+	parser.add_argument("--cities", type=int, default=len(CITIES), help="First N cities of app/cities.py")
+	parser.add_argument("--subreddits", type=int, default=len(DEFAULT_SUBREDDITS), help="Subreddits searched (cycled past the defaults)")
+	parser.add_argument("--limit", type=int, default=100, help="Results per Reddit search and YouTube query")
+	parser.add_argument("--comment-posts", type=int, default=20)
+	parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+	parser.add_argument("--min-interval", type=float, default=0.0, help="Reddit RateLimiter spacing (the collector default is 0.6)")
+	parser.add_argument("--backoff", type=float, default=0.1, help="Trends retry backoff base, seconds")
+	parser.add_argument("--latency", type=float, default=0.0)
+	parser.add_argument("--jitter", type=float, default=0.0)
+	parser.add_argument("--rate", type=float, default=None, help="Replay rate limit, requests per second")
+	parser.add_argument("--burst", type=int, default=10)
+	parser.add_argument("--error-rate", type=float, default=0.0)
+	parser.add_argument("--error-status", type=int, default=503)
+	parser.add_argument("--strict", action="store_true", help="Only serve exactly recorded requests")
+	parser.add_argument("--seed", type=int, default=0)
+	args = parser.parse_args()
+
+	cities = dict(list(CITIES.items())[: args.cities])
+	subreddits = [DEFAULT_SUBREDDITS[i % len(DEFAULT_SUBREDDITS)] for i in range(args.subreddits)]
+	workload = dict(cities=cities, subreddits=subreddits, limit=args.limit, comment_posts=args.comment_posts, min_interval=args.min_interval, backoff=args.backoff)
+	if args.record:
+		with record(args.record) as exchanges:
+			rows = run_workload(workers=args.workers[0], **workload)
+		print(pd.DataFrame(rows).to_string(index=False))
+		print(f"Recorded {len(exchanges)} responses to {args.record}")
+		return
+
+	# The clients still refuse to start without credentials; the replay server ignores them
+	for var in ("YOUTUBE_API_KEY", "REDDIT_CLIENT_ID", "REDDIT_CLIENT_SECRET"):
+		os.environ.setdefault(var, "replay")
+	archive = args.archive or api_archive(trends_plan(DEFAULT_QUERIES, cities), seed=args.seed)
+	results = []
+	for workers in args.workers:
+		server = ReplayServer(
+			archive, latency=args.latency, jitter=args.jitter, rate=args.rate, burst=args.burst, error_rate=args.error_rate, error_status=args.error_status, strict=args.strict, seed=args.seed
+		)
+		with server, redirect(server.url):
+			start = time.perf_counter()
+			rows = run_workload(workers=workers, **workload)
+			seconds = time.perf_counter() - start
+		for row in rows:
+			results.append({"workers": workers, **row})
+		stats = server.stats
+		print(f"workers={workers}: {stats['requests']} requests in {seconds:.2f}s ({stats['requests'] / seconds:.1f}/s); " + ", ".join(f"{k} {v}" for k, v in stats.items() if k != "requests"))
+	print(pd.DataFrame(results).to_string(index=False))
+
+
+if __name__ == "__main__":
+	main()
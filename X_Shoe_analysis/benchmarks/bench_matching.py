@@ -0,0 +1,71 @@
+"""Compare per-place str.contains masks with the single-pass KeywordIndex.
+
+Run from X_Shoe_analysis/:
+	python benchmarks/bench_matching.py --rows 50000 --places 40
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if PROJECT_ROOT not in sys.path:
+	sys.path.insert(0, PROJECT_ROOT)
+
+from app.analysis.matching import KeywordIndex  # noqa: E402
+
+VOCAB = ["sneakers", "running", "shoes", "drop", "store", "mall", "weekend", "price", "fit", "street", "launch", "queue", "size", "retail", "chennai"]
+
+
+def _places(n_places: int) -> Dict[str, List[str]]:
+	return {f"Place {i}": [f"Locality{i} Road", f"Area{i} Market", f"Hub{i}"] for i in range(n_places)}
+
+
+def _corpus(n_rows: int, places: Dict[str, List[str]], seed: int = 7) -> pd.Series:
+	rng = np.random.default_rng(seed)
+	keywords = [k for kws in places.values() for k in kws]
+	texts = []
+	for _ in range(n_rows):
+		words = list(rng.choice(VOCAB, size=rng.integers(8, 40)))
+		if rng.random() < 0.05:
+			words.insert(int(rng.integers(0, len(words))), str(rng.choice(keywords)).lower())
+		texts.append(" ".join(words))
+	return pd.Series(texts)
+
+
+def per_place_masks(texts: pd.Series, places: Dict[str, List[str]]) -> np.ndarray:
+	cols = [texts.str.contains("|".join(kws), case=False, na=False).to_numpy() for kws in places.values()]
+	return np.column_stack(cols)
+
+
+def main():
+	parser = argparse.ArgumentParser()
+	parser.add_argument("--rows", type=int, default=50000)
+	parser.add_argument("--places", type=int, default=40)
+	args = parser.parse_args()
+
+	places = _places(args.places)
+	texts = _corpus(args.rows, places)
+
+	t0 = time.perf_counter()
+	baseline = per_place_masks(texts, places)
+	t_baseline = time.perf_counter() - t0
+
+	t0 = time.perf_counter()
+	index = KeywordIndex(places)
+	indexed = index.match(texts)
+	t_index = time.perf_counter() - t0
+
+	assert np.array_equal(baseline, indexed), "KeywordIndex disagrees with per-place masks"
+	print(f"rows={args.rows} places={args.places} matched_rows={int(indexed.any(axis=1).sum())}")
+	print(f"per-place str.contains: {t_baseline:.3f}s")
+	print(f"KeywordIndex:           {t_index:.3f}s  ({t_baseline / max(t_index, 1e-9):.1f}x)")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,49 @@
+"""Resident footprint of stored corpora loaded as plain object frames vs compact frames.
+
+Run from X_Shoe_analysis/:
+	python benchmarks/bench_memory.py --comments 1000000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if PROJECT_ROOT not in sys.path:
+	sys.path.insert(0, PROJECT_ROOT)
+
+from app.storage import DataStore  # noqa: E402
+from synthetic import reddit_comments, reddit_posts  # noqa: E402
+
+
+def main():
+	parser = argparse.ArgumentParser()
+	parser.add_argument("--comments", type=int, default=1_000_000)
+	parser.add_argument("--posts", type=int, default=None, help="Defaults to a tenth of --comments")
+	args = parser.parse_args()
+
+	posts = reddit_posts(args.posts or max(1, args.comments // 10))
+	datasets = {"reddit_posts": posts, "reddit_comments": reddit_comments(args.comments, posts["id"].tolist())}
+	with tempfile.TemporaryDirectory() as tmp:
+		store = DataStore(tmp)
+		rows = []
+		for name, df in datasets.items():
+			store.write(name, df)
+			plain = store.read(name)
+			compact = store.read(name, compact=True)
+			for col in compact.columns:
+				plain_bytes = int(plain[col].memory_usage(deep=True, index=False)) if col in plain.columns else 0
+				compact_bytes = int(compact[col].memory_usage(deep=True, index=False))
+				rows.append({"dataset": name, "column": col, "plain_dtype": str(plain[col].dtype) if col in plain.columns else "-", "compact_dtype": str(compact[col].dtype), "plain_mb": plain_bytes / 2**20, "compact_mb": compact_bytes / 2**20})
+	table = pd.DataFrame(rows)
+	print(table.to_string(index=False, float_format="{:.1f}".format))
+	totals = table.groupby("dataset")[["plain_mb", "compact_mb"]].sum()
+	totals["ratio"] = totals["plain_mb"] / totals["compact_mb"]
+	print(totals.to_string(float_format="{:.2f}".format))
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,174 @@
+"""End-to-end pipeline benchmark on seeded synthetic data, with a stored baseline to compare against.
+
+Every stage (generation, store round trip, matching, sentiment, trend features, scoring,
+bootstrap, weight sweep, chart building) is timed under a RunReport; a second pass with
+tracemalloc records each stage's peak memory. Results are written as JSON.
+
+Run from X_Shoe_analysis/:
+	python benchmarks/bench_pipeline.py --sizes 1000 10000 100000 --out bench_results.json
+	python benchmarks/bench_pipeline.py --baseline benchmarks/baseline.json
+	python benchmarks/bench_pipeline.py --save-baseline benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if PROJECT_ROOT not in sys.path:
+	sys.path.insert(0, PROJECT_ROOT)
+
+from app.analysis.bootstrap import bootstrap_intervals  # noqa: E402
+from app.analysis.distribution import sentiment_bins  # noqa: E402
+from app.analysis.scoring import combine_components, extract_signals  # noqa: E402
+from app.analysis.sensitivity import ranking_stability, sample_weights, sweep_scores  # noqa: E402
+from app.instrumentation import RunReport, stage  # noqa: E402
+from app.storage import DataStore  # noqa: E402
+from app.viz.charts import bar_components, bar_scores, donut_components, radar_components, sentiment_density, stacked_engagement  # noqa: E402
+from synthetic import PLACES, make_dataset  # noqa: E402
+
+CHARTS = [bar_scores, radar_components, bar_components, donut_components, stacked_engagement, sentiment_density]
+
+
+def run_pipeline(rows: int, seed: int, workers: int, bootstrap_samples: int, sweep_samples: int) -> None:
+	"""One full pass; every step runs under ``bench.*`` stages of the active RunReport."""
+	with stage("bench.generate") as record:
+		data = make_dataset(rows, seed)
+		record.rows = sum(len(df) for df in data.values())
+	with tempfile.TemporaryDirectory() as tmp, stage("bench.store_roundtrip") as record:
+		store = DataStore(tmp)
+		for name, df in data.items():
+			store.write(name, df)
+		data = {name: store.read(name) for name in data}
+		record.rows = sum(len(df) for df in data.values())
+	with stage("bench.extract") as record:
+		signals = extract_signals(
+			data["reddit_posts"],
+			data["reddit_comments"],
+			data["youtube_videos"],
+			data["youtube_stats"],
+			data["trends"],
+			PLACES,
+			sentiment_workers=workers,
+		)
+		components = signals.components()
+		record.rows = len(data["reddit_posts"]) + len(data["reddit_comments"]) + len(data["youtube_videos"])
+	with stage("bench.combine") as record:
+		result = combine_components(components)
+		record.rows = len(result)
+	with stage("bench.bootstrap") as record:
+		result = result.merge(bootstrap_intervals(signals, n_boot=bootstrap_samples, seed=seed), on="place", how="left")
+		record.rows = bootstrap_samples
+	with stage("bench.sweep") as record:
+		ranking_stability(sweep_scores(components, sample_weights(sweep_samples, seed=seed)))
+		record.rows = sweep_samples
+	with stage("bench.sentiment_bins") as record:
+		bins = sentiment_bins(signals)
+		record.rows = len(signals.posts.members) + len(signals.comments.members)
+	with stage("bench.charts") as record:
+		for build in CHARTS:
+			build(result)
+		sentiment_density(result, bins)
+		record.rows = len(CHARTS)
+
+
+def bench_size(rows: int, args: argparse.Namespace) -> List[Dict[str, Any]]:
+	"""Stage records for one size: best-of-``repeat`` seconds, plus peak MB from a traced pass."""
+	timings: Dict[str, List[float]] = {}
+	stages: Dict[str, Dict[str, Any]] = {}
+	for _ in range(args.repeat):
+		report = RunReport()
+		with report.activate():
+			run_pipeline(rows, args.seed, args.workers, args.bootstrap_samples, args.sweep_samples)
+		for record in report.stages:
+			timings.setdefault(record.name, []).append(record.seconds)
+			stages.setdefault(record.name, {"size": rows, "stage": record.name, "depth": record.depth, "rows": record.rows})
+	peaks: Dict[str, float | None] = {}
+	if args.memory:
+		report = RunReport(trace_memory=True)
+		with report.activate():
+			run_pipeline(rows, args.seed, args.workers, args.bootstrap_samples, args.sweep_samples)
+		peaks = {record.name: record.peak_mb for record in report.stages}
+	return [{**info, "seconds": round(min(timings[name]), 4), "peak_mb": peaks.get(name)} for name, info in stages.items()]
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float, min_seconds: float) -> List[str]:
+	"""Print current vs baseline per stage and return the stages slower than ``1 + tolerance`` times
+	their baseline (stages under ``min_seconds`` in both runs are treated as noise)."""
+	reference = {(r["size"], r["stage"]): r for r in baseline.get("results", [])}
+	regressions = []
+	print(f"{'size':>8} {'stage':<40} {'base s':>8} {'now s':>8} {'ratio':>6} {'base MB':>8} {'now MB':>8}")
+	for r in results:
+		base = reference.get((r["size"], r["stage"]))
+		if base is None:
+			continue
+		ratio = r["seconds"] / base["seconds"] if base["seconds"] > 0 else float("inf")
+		flag = ""
+		if ratio > 1 + tolerance and max(r["seconds"], base["seconds"]) >= min_seconds:
+			regressions.append(f"{r['stage']} @ {r['size']} rows: {base['seconds']:.3f}s -> {r['seconds']:.3f}s")
+			flag = "  SLOWER"
+		print(f"{r['size']:>8} {r['stage']:<40} {base['seconds']:>8.3f} {r['seconds']:>8.3f} {ratio:>6.2f} {base.get('peak_mb') or 0:>8.1f} {r.get('peak_mb') or 0:>8.1f}{flag}")
+	return regressions
+
+
+def main():
+	parser = argparse.ArgumentParser()
+	parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000], help="Reddit posts (and comments) per run, 1k to 1M")
+	parser.add_argument("--repeat", type=int, default=3)
+	parser.add_argument("--seed", type=int, default=0)
+	parser.add_argument("--workers", type=int, default=1, help="Sentiment worker processes")
+	parser.add_argument("--bootstrap-samples", type=int, default=2000)
+	parser.add_argument("--sweep-samples", type=int, default=5000)
+	parser.add_argument("--no-memory", dest="memory", action="store_false", help="Skip the tracemalloc pass")
+	parser.add_argument("--out", default="bench_results.json")
+	parser.add_argument("--baseline", help="Compare against this results file; exits 1 on regressions")
+	parser.add_argument("--save-baseline", help="Also write the results here as the new baseline")
+	parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before a stage counts as regressed")
+	parser.add_argument("--min-seconds", type=float, default=0.05, help="Stages faster than this are not compared")
+	args = parser.parse_args()
+
+	results = []
+	for rows in args.sizes:
+		print(f"size={rows} ...", flush=True)
+		results.extend(bench_size(rows, args))
+	payload = {
+		"meta": {
+			"created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+			"python": platform.python_version(),
+			"numpy": np.__version__,
+			"pandas": pd.__version__,
+			"platform": platform.platform(),
+			"cpus": os.cpu_count(),
+			"repeat": args.repeat,
+			"seed": args.seed,
+			"workers": args.workers,
+			"bootstrap_samples": args.bootstrap_samples,
+			"sweep_samples": args.sweep_samples,
+		},
+		"results": results,
+	}
+	for path in filter(None, [args.out, args.save_baseline]):
+		with open(path, "w", encoding="utf-8") as f:
+			json.dump(payload, f, indent=2)
+	print(pd.DataFrame(results).to_string(index=False))
+
+	if args.baseline:
+		with open(args.baseline, encoding="utf-8") as f:
+			baseline = json.load(f)
+		regressions = compare(results, baseline, args.tolerance, args.min_seconds)
+		if regressions:
+			print("Regressions:\n  " + "\n  ".join(regressions))
+			sys.exit(1)
+		print("No regressions against baseline.")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,50 @@
+"""Scaling benchmark for process-pool VADER scoring.
+
+Run from X_Shoe_analysis/:
+	python benchmarks/bench_sentiment.py --rows 40000 --workers 1 2 4 8
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import List
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if PROJECT_ROOT not in sys.path:
+	sys.path.insert(0, PROJECT_ROOT)
+
+from app.analysis.sentiment import score_texts  # noqa: E402
+
+WORDS = ["love", "great", "hate", "awful", "sneakers", "queue", "price", "mall", "street", "not", "really", "good", "bad", "drop", "fit", "comfy", "overpriced", "!", "lol"]
+
+
+def _corpus(n_rows: int, seed: int = 11) -> List[str]:
+	rng = np.random.default_rng(seed)
+	return [" ".join(rng.choice(WORDS, size=rng.integers(10, 60))) for _ in range(n_rows)]
+
+
+def main():
+	parser = argparse.ArgumentParser()
+	parser.add_argument("--rows", type=int, default=40000)
+	parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+	args = parser.parse_args()
+
+	texts = _corpus(args.rows)
+	reference: List[float] | None = None
+	serial_time = None
+	print(f"rows={args.rows} cpus={os.cpu_count()}")
+	for workers in args.workers:
+		t0 = time.perf_counter()
+		scores = score_texts(texts, workers=workers)
+		elapsed = time.perf_counter() - t0
+		if reference is None:
+			reference, serial_time = scores, elapsed
+		assert scores == reference, f"workers={workers} changed output order or values"
+		print(f"workers={workers}: {elapsed:.2f}s  ({serial_time / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,86 @@
+"""Cold-start cost of the dashboard and PPT exporter, each measured in a fresh interpreter.
+
+Reports the time to import each entry point's module graph and which heavy collector/NLP/chart
+libraries that pulled in. With --app it also times a first full dashboard run (Streamlit AppTest)
+on whatever is stored in data/, which is the cached-data path: no API calls are made without keys.
+
+Run from X_Shoe_analysis/:
+	python benchmarks/bench_startup.py --repeat 5
+	python benchmarks/bench_startup.py --repeat 3 --app
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+# Modules each entry point imports before it can draw anything
+ENTRY_POINTS = {
+	"dashboard": [
+		"streamlit",
+		"dotenv",
+		"app.cities",
+		"app.collection",
+		"app.scheduler",
+		"app.analysis.scoring",
+		"app.analysis.bootstrap",
+		"app.analysis.comparison",
+		"app.analysis.cube",
+		"app.analysis.sensitivity",
+		"app.analysis.sentiment",
+		"app.storage",
+		"app.instrumentation",
+		"app.viz.charts",
+	],
+	"export_ppt": ["app.export_ppt"],
+}
+HEAVY = ["praw", "googleapiclient", "pytrends", "vaderSentiment", "plotly", "pptx"]
+
+IMPORT_PROBE = """
+import importlib, json, sys, time
+start = time.perf_counter()
+for name in {modules!r}:
+	importlib.import_module(name)
+print(json.dumps({{"seconds": time.perf_counter() - start, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+APP_PROBE = """
+import json, sys, time, warnings
+warnings.simplefilter("ignore")
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("app/streamlit_app.py", default_timeout=600)
+at.run()
+print(json.dumps({{"seconds": time.perf_counter() - start, "loaded": [m for m in {heavy!r} if m in sys.modules], "exceptions": len(at.exception)}}))
+"""
+
+
+def _probe(code: str) -> Dict[str, Any]:
+	out = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+	return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _report(name: str, runs: List[Dict[str, Any]]) -> None:
+	seconds = [r["seconds"] for r in runs]
+	print(f"{name:<12} median {statistics.median(seconds):.3f}s  min {min(seconds):.3f}s  heavy modules loaded: {', '.join(runs[-1]['loaded']) or 'none'}")
+
+
+def main():
+	parser = argparse.ArgumentParser()
+	parser.add_argument("--repeat", type=int, default=5)
+	parser.add_argument("--app", action="store_true", help="Also time a first dashboard run on data/ (writes caches there)")
+	args = parser.parse_args()
+
+	for name, modules in ENTRY_POINTS.items():
+		_report(name, [_probe(IMPORT_PROBE.format(modules=modules, heavy=HEAVY)) for _ in range(args.repeat)])
+	if args.app:
+		_report("first run", [_probe(APP_PROBE.format(heavy=HEAVY)) for _ in range(args.repeat)])
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,132 @@
+"""Seeded synthetic data shaped like the collector outputs, for offline benchmarks.
+
+Every generator is deterministic for a given size and seed, needs no network or API keys, and
+returns frames with the same columns and dtypes as the collectors write to the store.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+PLACES: Dict[str, List[str]] = {
+	"Malls": ["Phoenix Marketcity Chennai", "VR Chennai", "Express Avenue", "Forum Vijaya Mall"],
+	"High Streets": ["T Nagar", "Nungambakkam", "Khader Nawaz Khan Road", "Anna Nagar"],
+}
+TOPICS = ["sneakers", "running shoes", "basketball shoes", "sportswear", "streetwear", "athleisure"]
+WORDS = np.array(
+	[
+		"love", "great", "hate", "awful", "sneakers", "queue", "price", "mall", "street", "not",
+		"really", "good", "bad", "drop", "fit", "comfy", "overpriced", "store", "weekend", "launch",
+		"size", "retail", "chennai", "shoes", "running", "crowd", "parking", "deal", "sale", "!",
+	]
+)
+SUBREDDITS = ["bangalore", "mumbai", "chennai", "india", "IndianStreetWear", "Sneakers"]
+START_UTC = 1_700_000_000
+
+
+def _texts(rng: np.random.Generator, n: int, low: int, high: int, keywords: List[str], hit_rate: float) -> List[str]:
+	lengths = rng.integers(low, high, size=n)
+	words = WORDS[rng.integers(0, len(WORDS), size=(n, high))]
+	hits = rng.random(n) < hit_rate
+	picks = rng.integers(0, len(keywords), size=n)
+	texts = []
+	for i in range(n):
+		row = words[i, : lengths[i]].tolist()
+		if hits[i]:
+			row.insert(len(row) // 2, keywords[picks[i]])
+		texts.append(" ".join(row))
+	return texts
+
+
+def _keywords(places: Dict[str, List[str]]) -> List[str]:
+	return [k for kws in places.values() for k in kws]
+
+
+def reddit_posts(n: int, places: Dict[str, List[str]] = PLACES, seed: int = 0, hit_rate: float = 0.05) -> pd.DataFrame:
+	rng = np.random.default_rng(seed)
+	keywords = _keywords(places)
+	return pd.DataFrame(
+		{
+			"id": [f"p{i:07x}" for i in range(n)],
+			"subreddit": np.array(SUBREDDITS)[rng.integers(0, len(SUBREDDITS), size=n)],
+			"title": _texts(rng, n, 4, 14, keywords, hit_rate),
+			"selftext": _texts(rng, n, 0, 60, keywords, hit_rate),
+			"score": rng.zipf(2.0, size=n).clip(max=100_000).astype("int64"),
+			"num_comments": rng.zipf(2.2, size=n).clip(max=10_000).astype("int64"),
+			"created_utc": START_UTC + rng.integers(0, 365 * 86400, size=n),
+			"url": [f"https://reddit.com/p{i:07x}" for i in range(n)],
+		}
+	)
+
+
+def reddit_comments(n: int, post_ids: List[str], places: Dict[str, List[str]] = PLACES, seed: int = 1, hit_rate: float = 0.05) -> pd.DataFrame:
+	rng = np.random.default_rng(seed)
+	return pd.DataFrame(
+		{
+			"post_id": np.asarray(post_ids)[rng.integers(0, len(post_ids), size=n)],
+			"comment_id": [f"c{i:07x}" for i in range(n)],
+			"body": _texts(rng, n, 3, 40, _keywords(places), hit_rate),
+			"score": rng.zipf(2.0, size=n).clip(max=50_000).astype("int64"),
+			"created_utc": START_UTC + rng.integers(0, 365 * 86400, size=n),
+		}
+	)
+
+
+def youtube_videos(n: int, places: Dict[str, List[str]] = PLACES, seed: int = 2, hit_rate: float = 0.1) -> pd.DataFrame:
+	rng = np.random.default_rng(seed)
+	keywords = _keywords(places)
+	published = pd.to_datetime(START_UTC + rng.integers(0, 365 * 86400, size=n), unit="s")
+	return pd.DataFrame(
+		{
+			"video_id": [f"v{i:010d}" for i in range(n)],
+			"title": _texts(rng, n, 4, 14, keywords, hit_rate),
+			"description": _texts(rng, n, 0, 40, keywords, hit_rate),
+			"channel": [f"channel{c}" for c in rng.integers(0, max(1, n // 20), size=n)],
+			"published_at": published.strftime("%Y-%m-%dT%H:%M:%SZ"),
+		}
+	)
+
+
+def youtube_stats(videos: pd.DataFrame, seed: int = 3) -> pd.DataFrame:
+	rng = np.random.default_rng(seed)
+	views = rng.lognormal(9.0, 2.0, size=len(videos)).astype("int64")
+	return pd.DataFrame(
+		{
+			"video_id": videos["video_id"].to_numpy(),
+			"view_count": views,
+			"like_count": (views * rng.uniform(0.005, 0.05, size=len(videos))).astype("int64"),
+			"comment_count": (views * rng.uniform(0.0002, 0.002, size=len(videos))).astype("int64"),
+		}
+	)
+
+
+def trends(weeks: int = 52, keywords: List[str] | None = None, seed: int = 4) -> pd.DataFrame:
+	"""Weekly 0-100 interest with trend, yearly seasonality and noise, one column per keyword."""
+	rng = np.random.default_rng(seed)
+	keywords = keywords if keywords is not None else TOPICS + _keywords(PLACES)
+	t = np.arange(weeks)[:, None]
+	level = rng.uniform(5, 60, size=len(keywords))
+	slope = rng.normal(0, 0.2, size=len(keywords))
+	season = rng.uniform(0, 10, size=len(keywords)) * np.sin(2 * np.pi * t / 52 + rng.uniform(0, 2 * np.pi, size=len(keywords)))
+	values = np.clip(level + slope * t + season + rng.normal(0, 3, size=(weeks, len(keywords))), 0, 100).round()
+	frame = pd.DataFrame(values.astype("int64"), columns=keywords)
+	frame.insert(0, "date", pd.date_range("2024-01-07", periods=weeks, freq="W"))
+	return frame
+
+
+def make_dataset(rows: int, seed: int = 0, places: Dict[str, List[str]] = PLACES) -> Dict[str, pd.DataFrame]:
+	"""All five collector datasets for a run of ``rows`` Reddit posts.
+
+	Comments match the post count; YouTube gets a tenth as many videos (at least 10); Trends is
+	one year of weekly points for the topics and every place keyword.
+	"""
+	posts = reddit_posts(rows, places, seed=seed)
+	videos = youtube_videos(max(10, rows // 10), places, seed=seed + 2)
+	return {
+		"reddit_posts": posts,
+		"reddit_comments": reddit_comments(rows, posts["id"].tolist(), places, seed=seed + 1),
+		"youtube_videos": videos,
+		"youtube_stats": youtube_stats(videos, seed=seed + 3),
+		"trends": trends(keywords=TOPICS + _keywords(places), seed=seed + 4),
+	}
@@ -0,0 +1,124 @@
+"""Synthetic fixture archive in the wire format of the Reddit, YouTube and Google Trends APIs.
+
+Stands in for a recording (``app.collectors.transport.record``) when none is available, so the
+collectors can be replayed end to end offline. Reddit and YouTube responses are a pool per
+endpoint, which the replay server serves for any parameters; Trends responses are generated for
+the exact batches ``fetch_trends`` will request, since their columns must match the batch.
+"""
+
+import json
+import os
+import sys
+from typing import Any, Dict, List
+from urllib.parse import urlencode
+
+import pandas as pd
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if PROJECT_ROOT not in sys.path:
+	sys.path.insert(0, PROJECT_ROOT)
+
+from app.collectors.trends import _anchored_batches, _batch_list  # noqa: E402
+from app.collectors.transport import make_exchange  # noqa: E402
+from synthetic import SUBREDDITS, reddit_comments, reddit_posts, trends, youtube_stats, youtube_videos  # noqa: E402
+
+JSON = {"content-type": "application/json; charset=UTF-8"}
+TRENDS_URL = "https://trends.google.com/trends"
+# TrendReq settings used by app.collectors.trends._interest
+TRENDS_HL = "en-US"
+TRENDS_TZ = 330
+
+
+def _json(method: str, url: str, payload: Any, body: str | None = None, prefix: str = "") -> Dict[str, Any]:
+	return make_exchange(method, url, body, 200, JSON, (prefix + json.dumps(payload)).encode("utf-8"))
+
+
+def _listing(kind: str, children: List[Dict[str, Any]]) -> Dict[str, Any]:
+	return {"kind": "Listing", "data": {"after": None, "before": None, "dist": len(children), "children": [{"kind": kind, "data": c} for c in children]}}
+
+
+def _post_data(post: Dict[str, Any]) -> Dict[str, Any]:
+	return {**post, "name": f"t3_{post['id']}", "author": "replay_user", "permalink": f"/r/{post['subreddit']}/comments/{post['id']}/", "subreddit_name_prefixed": f"r/{post['subreddit']}"}
+
+
+def _comment_data(comment: Dict[str, Any]) -> Dict[str, Any]:
+	return {
+		"id": comment["comment_id"],
+		"name": f"t1_{comment['comment_id']}",
+		"body": comment["body"],
+		"score": comment["score"],
+		"created_utc": comment["created_utc"],
+		"author": "replay_user",
+		"link_id": f"t3_{comment['post_id']}",
+		"parent_id": f"t3_{comment['post_id']}",
+		"replies": "",
+	}
+
+
+def reddit_exchanges(listings_per_subreddit: int = 4, posts_per_listing: int = 100, comments_per_post: int = 50, comment_listings: int = 20, seed: int = 0) -> List[Dict[str, Any]]:
+	out = [_json("POST", "https://www.reddit.com/api/v1/access_token", {"access_token": "replay-token", "token_type": "bearer", "expires_in": 86400, "scope": "*"}, "grant_type=client_credentials")]
+	n = len(SUBREDDITS) * listings_per_subreddit * posts_per_listing
+	posts = reddit_posts(n, seed=seed).to_dict("records")
+	for i, start in enumerate(range(0, n, posts_per_listing)):
+		subreddit = SUBREDDITS[i % len(SUBREDDITS)]
+		listing = [_post_data({**p, "subreddit": subreddit}) for p in posts[start : start + posts_per_listing]]
+		out.append(_json("GET", f"https://oauth.reddit.com/r/{subreddit}/search/", _listing("t3", listing)))
+	comments = reddit_comments(comment_listings * comments_per_post, [p["id"] for p in posts[:comment_listings]], seed=seed + 1)
+	for post in posts[:comment_listings]:
+		rows = comments[comments["post_id"] == post["id"]].to_dict("records")
+		payload = [_listing("t3", [_post_data(post)]), _listing("t1", [_comment_data(c) for c in rows])]
+		out.append(_json("GET", f"https://oauth.reddit.com/comments/{post['id']}/", payload))
+	return out
+
+
+def youtube_exchanges(pages: int = 10, page_size: int = 50, seed: int = 2) -> List[Dict[str, Any]]:
+	videos = youtube_videos(pages * page_size, seed=seed)
+	stats = youtube_stats(videos, seed=seed + 1)
+	out = []
+	for page, start in enumerate(range(0, len(videos), page_size)):
+		items = [
+			{"kind": "youtube#searchResult", "id": {"kind": "youtube#video", "videoId": v["video_id"]}, "snippet": {"title": v["title"], "description": v["description"], "channelTitle": v["channel"], "publishedAt": v["published_at"]}}
+			for v in videos.iloc[start : start + page_size].to_dict("records")
+		]
+		out.append(_json("GET", "https://youtube.googleapis.com/youtube/v3/search", {"kind": "youtube#searchListResponse", "nextPageToken": f"page{page + 1}", "items": items}))
+		items = [
+			{"kind": "youtube#video", "id": s["video_id"], "statistics": {"viewCount": str(s["view_count"]), "likeCount": str(s["like_count"]), "commentCount": str(s["comment_count"])}}
+			for s in stats.iloc[start : start + page_size].to_dict("records")
+		]
+		out.append(_json("GET", "https://youtube.googleapis.com/youtube/v3/videos", {"kind": "youtube#videoListResponse", "items": items}))
+	return out
+
+
+def _trends_batches(queries: List[str]) -> List[List[str]]:
+	# The batches fetch_trends requests for ``queries`` with its default anchor
+	return _anchored_batches(queries, queries[0]) if len(queries) > 5 else _batch_list(queries, 5)
+
+
+def trends_exchanges(plan: Dict[str, List[str]], timeframe: str = "today 12-m", weeks: int = 52, seed: int = 4) -> List[Dict[str, Any]]:
+	"""Explore and interest-over-time responses for every batch of ``plan`` (geo -> queries)."""
+	out = [make_exchange("GET", f"{TRENDS_URL}/explore/?geo={TRENDS_HL[-2:]}", None, 200, {"content-type": "text/html"}, b"")]
+	for g, (geo, queries) in enumerate(plan.items()):
+		frame = trends(weeks, queries, seed=seed + g)
+		for b, batch in enumerate(_trends_batches(queries)):
+			# json.dumps with default separators, exactly as pytrends encodes the request
+			req = json.dumps({"comparisonItem": [{"keyword": kw, "time": timeframe, "geo": geo} for kw in batch], "category": 0, "property": ""})
+			widget_request = {"time": timeframe, "resolution": "WEEK", "locale": TRENDS_HL, "comparisonItem": [{"geo": {"region": geo}, "keyword": kw} for kw in batch]}
+			token = f"{geo}-{b}"
+			explore = {"widgets": [{"id": "TIMESERIES", "token": token, "request": widget_request}]}
+			out.append(_json("POST", f"{TRENDS_URL}/api/explore?" + urlencode({"hl": TRENDS_HL, "tz": TRENDS_TZ, "req": req}), explore, prefix=")]}'"))
+			timeline = [
+				{"time": str(int(pd.Timestamp(date).timestamp())), "value": [int(frame.at[i, kw]) for kw in batch], "hasData": [True] * len(batch)}
+				for i, date in enumerate(frame["date"])
+			]
+			params = {"req": json.dumps(widget_request), "token": token, "tz": TRENDS_TZ}
+			out.append(_json("GET", f"{TRENDS_URL}/api/widgetdata/multiline?" + urlencode(params), {"default": {"timelineData": timeline}}, prefix=")]}',\n"))
+	return out
+
+
+def api_archive(trends_plan: Dict[str, List[str]], seed: int = 0, **sizes: int) -> List[Dict[str, Any]]:
+	"""Every exchange the collectors need for a run whose Trends queries are ``trends_plan``.
+
+	``sizes`` are passed to ``reddit_exchanges`` (listings_per_subreddit, posts_per_listing,
+	comments_per_post, comment_listings).
+	"""
+	return reddit_exchanges(seed=seed, **sizes) + youtube_exchanges(seed=seed + 2) + trends_exchanges(trends_plan, seed=seed + 4)
@@ -0,0 +1,7 @@
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+for path in (PROJECT_ROOT, os.path.join(PROJECT_ROOT, "benchmarks")):
+	if path not in sys.path:
+		sys.path.insert(0, path)
@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+from app.collection import youtube_query_limit
+from app.collectors.cache import RequestCache, request_key
+from app.collectors.youtube import QuotaMeter, fetch_video_stats, search_youtube_queries
+
+
+class FakeYouTube:
+	"""Stands in for the YouTube client: videos().list(id=...).execute() returns per-id statistics."""
+
+	def __init__(self, views):
+		self.views = views
+		self.requested = []
+
+	def videos(self):
+		return SimpleNamespace(list=self.list)
+
+	def list(self, part, id):
+		ids = id.split(",")
+		self.requested.extend(ids)
+		items = [{"id": vid, "statistics": {"viewCount": str(self.views[vid])}} for vid in ids]
+		return SimpleNamespace(execute=lambda: {"items": items})
+
+
+def test_search_text_is_normalized_but_identifiers_are_not():
+	assert request_key("youtube.search", {"query": " Sneakers  Chennai"}) == request_key("youtube.search", {"query": "sneakers chennai"})
+	assert request_key("youtube.videos", {"id": "abcDEF12345"}) != request_key("youtube.videos", {"id": "abcdef12345"})
+
+
+def test_video_ids_differing_in_case_are_cached_apart(tmp_path):
+	views = {"abcDEF12345": 10, "abcdef12345": 99}
+	cache = RequestCache(str(tmp_path))
+	fetch_video_stats(["abcDEF12345"], yt=FakeYouTube(views), cache=cache)
+	yt = FakeYouTube(views)
+	stats = fetch_video_stats(["abcdef12345", "abcDEF12345"], yt=yt, cache=cache)
+	assert yt.requested == ["abcdef12345"]
+	assert dict(zip(stats["video_id"], stats["view_count"])) == views
+
+
+class FakeSearch:
+	def __init__(self):
+		self.queries = []
+
+	def search(self):
+		return SimpleNamespace(list=self.list)
+
+	def list(self, q, part, type, maxResults, pageToken):
+		self.queries.append(q)
+		items = [{"id": {"videoId": f"{q}-{pageToken}-{i}"}, "snippet": {}} for i in range(maxResults)]
+		return SimpleNamespace(execute=lambda: {"items": items, "nextPageToken": f"{pageToken or 0}+"})
+
+
+def test_searches_stop_at_the_quota_budget_without_caching_partial_results(tmp_path):
+	cache = RequestCache(str(tmp_path))
+	yt = FakeSearch()
+	quota = QuotaMeter(budget=250)
+	videos = search_youtube_queries(["a Chennai", "a Mumbai", "b Chennai"], max_results=100, yt=yt, quota=quota, cache=cache)
+	# Two pages fit the budget: the first query completes, the second is refused mid-way
+	assert quota.units == 200 and quota.exhausted
+	assert len(videos) == 100 and yt.queries == ["a Chennai", "a Chennai"]
+	assert cache.get("youtube.search", {"query": "a Mumbai", "max_results": 100}) is None
+
+
+def test_youtube_query_limit_splits_the_limit_across_cities():
+	assert youtube_query_limit(150, ["Chennai"]) == 150
+	assert youtube_query_limit(150, ["Chennai", "Bangalore", "Mumbai"]) == 50
+	assert youtube_query_limit(150, [f"city{i}" for i in range(12)]) == 13
@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+
+from app.analysis.cube import week_in_range, week_start
+from app.analysis.distribution import sentiment_bins
+from app.analysis.scoring import extract_signals
+from synthetic import PLACES, make_dataset
+
+
+def _signals(frames):
+	return extract_signals(frames["reddit_posts"], frames["reddit_comments"], frames["youtube_videos"], frames["youtube_stats"], frames["trends"], PLACES)
+
+
+def test_date_filtered_bins_match_bins_of_filtered_rows():
+	frames = make_dataset(3000, seed=5)
+	created = pd.to_datetime(frames["reddit_posts"]["created_utc"], unit="s")
+	start, end = created.quantile(0.3).date(), created.quantile(0.7).date()
+	filtered = dict(frames)
+	for name in ["reddit_posts", "reddit_comments"]:
+		weeks = week_start(pd.to_datetime(frames[name]["created_utc"], unit="s"))
+		filtered[name] = frames[name][week_in_range(weeks, start, end)].reset_index(drop=True)
+	assert 0 < len(filtered["reddit_posts"]) < len(frames["reddit_posts"])
+	expected = sentiment_bins(_signals(filtered))
+	actual = sentiment_bins(_signals(frames), start=start, end=end)
+	pd.testing.assert_frame_equal(actual, expected)
+	assert not np.allclose(sentiment_bins(_signals(frames))["count"], actual["count"])
@@ -0,0 +1,137 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pandas as pd
+
+from app.collectors import reddit as reddit_module
+from app.collectors.cache import RequestCache
+from app.collectors.incremental import STATE_FILE, load_state, refresh_reddit_data, seed_state
+from app.collectors.reddit import RateLimiter, fetch_reddit_comments, fetch_reddit_posts
+
+
+class FakeSubreddit:
+	def __init__(self, reddit, name):
+		self.reddit = reddit
+		self.name = name
+
+	def search(self, query, limit, sort, time_filter):
+		self.reddit.queries.append((self.name, query))
+		self.reddit.sorts.append(sort)
+		# Every term matches its own posts, so an OR query and per-term queries hit the limit differently
+		terms = query.split(" OR ")
+		count = 100 if limit is None else limit
+		posts = [SimpleNamespace(id=f"{self.name}-{t}-{i}", title=t, selftext="", score=i, num_comments=1, created_utc=1000 + i, url="u") for i in range(count) for t in terms]
+		return posts[:count]
+
+
+class FakeReddit:
+	"""Stands in for praw.Reddit: subreddit(name).search(...) yields post-like objects."""
+
+	def __init__(self):
+		self.auth = SimpleNamespace(limits={})
+		self.queries = []
+		self.sorts = []
+
+	def subreddit(self, name):
+		return FakeSubreddit(self, name)
+
+	def submission(self, id):
+		return SimpleNamespace(comments=SimpleNamespace(replace_more=lambda limit: None, list=lambda: [SimpleNamespace(id=f"c-{id}", body="b", score=1, created_utc=2000)]))
+
+
+def test_cached_search_returns_uncached_posts(tmp_path):
+	terms, subreddits = ["sneakers", "running shoes", "streetwear"], ["india", "chennai"]
+	uncached = fetch_reddit_posts(terms, subreddits, limit=10, max_workers=1, reddit=FakeReddit(), throttle=RateLimiter(min_interval=0))
+	cached = fetch_reddit_posts(terms, subreddits, limit=10, max_workers=1, reddit=FakeReddit(), throttle=RateLimiter(min_interval=0), cache=RequestCache(str(tmp_path)))
+	pd.testing.assert_frame_equal(uncached, cached)
+	# A second cached run is served without searching
+	reddit = FakeReddit()
+	again = fetch_reddit_posts(terms, subreddits, limit=10, max_workers=1, reddit=reddit, throttle=RateLimiter(min_interval=0), cache=RequestCache(str(tmp_path)))
+	pd.testing.assert_frame_equal(uncached, again)
+	assert reddit.queries == []
+
+
+def test_incremental_refresh_drops_rows_of_another_query(tmp_path):
+	posts, comments = refresh_reddit_data(str(tmp_path), ["sneakers"], ["india"], limit=5, reddit=FakeReddit())
+	assert set(posts["title"]) == {"sneakers"} and len(comments) == 5
+	posts, comments = refresh_reddit_data(str(tmp_path), ["streetwear"], ["india"], limit=5, reddit=FakeReddit())
+	assert set(posts["title"]) == {"streetwear"}
+	assert set(comments["post_id"]) == set(posts["id"])
+	# Same query again: continues from the marks instead of a full search
+	reddit = FakeReddit()
+	refresh_reddit_data(str(tmp_path), ["streetwear"], ["india"], limit=5, reddit=reddit)
+	assert reddit.queries == [("india", "streetwear")] and reddit.sorts == ["new"]
+
+
+class ListingReddit(FakeReddit):
+	"""One subreddit of ``total`` posts created at 1..total; "new" serves at most ``listing`` of them, newest first."""
+
+	def __init__(self, total, listing=1000):
+		super().__init__()
+		self.total = total
+		self.listing = listing
+
+	def subreddit(self, name):
+		reddit = self
+
+		class Subreddit:
+			def search(self, query, limit, sort, time_filter):
+				reddit.sorts.append(sort)
+				created = range(reddit.total, 0, -1) if sort == "new" else range(1, reddit.total + 1)
+				cap = reddit.listing if limit is None else min(limit, reddit.listing)
+				return [SimpleNamespace(id=f"p{c}", title="t", selftext="", score=1, num_comments=0, created_utc=c, url="u") for c in created][:cap]
+
+		return Subreddit()
+
+
+def test_incremental_refresh_pages_past_limit(tmp_path):
+	seed_state(str(tmp_path), ["sneakers"], ["india"], pd.DataFrame({"subreddit": ["india"], "created_utc": [10]}))
+	# 20 posts since the mark and a limit of 5: all of them are collected
+	reddit = ListingReddit(30)
+	posts, _ = refresh_reddit_data(str(tmp_path), ["sneakers"], ["india"], limit=5, comment_posts=0, reddit=reddit)
+	assert sorted(posts["created_utc"]) == list(range(11, 31)) and reddit.sorts == ["new"]
+	assert load_state(str(tmp_path / STATE_FILE))["subreddits"] == {"india": 30}
+	# The listing ends before the mark: falls back to a full search instead of skipping the gap
+	reddit = ListingReddit(100, listing=50)
+	posts, _ = refresh_reddit_data(str(tmp_path), ["sneakers"], ["india"], limit=5, comment_posts=0, reddit=reddit)
+	assert reddit.sorts == ["new", "relevance"]
+	assert set(range(51, 101)) | set(range(1, 6)) <= set(posts["created_utc"])
+
+
+class ThreadCheckingReddit(FakeReddit):
+	"""Fails like a shared praw session would if two threads use it at once."""
+
+	def __init__(self):
+		super().__init__()
+		self.lock = threading.Lock()
+
+	def subreddit(self, name):
+		assert self.lock.acquire(blocking=False), "client used by two threads at once"
+		try:
+			time.sleep(0.02)
+		finally:
+			self.lock.release()
+		return super().subreddit(name)
+
+	def submission(self, id):
+		assert self.lock.acquire(blocking=False), "client used by two threads at once"
+		try:
+			time.sleep(0.02)
+		finally:
+			self.lock.release()
+		return super().submission(id)
+
+
+def test_workers_never_share_a_client(monkeypatch):
+	created = []
+	monkeypatch.setattr(reddit_module, "_create_reddit_client", lambda: created.append(ThreadCheckingReddit()) or created[-1])
+	subreddits = [f"sub{i}" for i in range(8)]
+	posts = fetch_reddit_posts(["sneakers"], subreddits, limit=3, max_workers=4, throttle=RateLimiter(min_interval=0))
+	comments = fetch_reddit_comments(posts["id"].tolist(), max_workers=4, throttle=RateLimiter(min_interval=0))
+	assert len(posts) == 24 and len(comments) == 24
+	assert 1 < len(created) <= 8
+	# A single client handed in is taken in turns
+	shared = ThreadCheckingReddit()
+	posts = fetch_reddit_posts(["sneakers"], subreddits, limit=3, max_workers=4, reddit=shared, throttle=RateLimiter(min_interval=0))
+	assert len(posts) == 24 and len(shared.queries) == 8
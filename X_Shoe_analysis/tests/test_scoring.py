@@ -0,0 +1,91 @@
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from app.analysis.cube import ScoreCube
+from app.analysis.matching import KeywordIndex
+from app.analysis import sentiment
+from app.analysis.scoring import combine_components, compute_sentiment_scores, extract_components, extract_components_streaming
+from synthetic import PLACES, make_dataset, reddit_posts
+
+SOURCES = ["reddit_posts", "reddit_comments", "youtube_videos", "youtube_stats", "trends"]
+
+
+def per_keyword_masks(texts: pd.Series, places: Dict[str, List[str]]) -> np.ndarray:
+	# One str.contains per keyword, OR-ed per place: what the trie union has to reproduce
+	return np.column_stack([np.logical_or.reduce([texts.str.contains(k, case=False, na=False).to_numpy() for k in kws]) for kws in places.values()])
+
+
+def loop_scores(posts: pd.DataFrame, comments: pd.DataFrame, videos: pd.DataFrame, stats: pd.DataFrame, places: Dict[str, List[str]]) -> pd.DataFrame:
+	"""The original per-place scoring loop (without Trends), one place and one subset at a time."""
+	rows = []
+	for place, keywords in places.items():
+		pattern = "|".join(keywords)
+		posts_subset = posts[posts["title"].str.contains(pattern, case=False, na=False) | posts["selftext"].str.contains(pattern, case=False, na=False)]
+		post_engagement = float(posts_subset["score"].sum() + posts_subset["num_comments"].sum())
+		post_sentiment = compute_sentiment_scores((posts_subset["title"] + ". " + posts_subset["selftext"]).tolist())["compound"].mean() if not posts_subset.empty else 0.0
+		comments_subset = comments[comments["body"].str.contains(pattern, case=False, na=False)]
+		comment_engagement = float(comments_subset["score"].sum())
+		comment_sentiment = compute_sentiment_scores(comments_subset["body"].tolist())["compound"].mean() if not comments_subset.empty else 0.0
+		videos_subset = videos[videos["title"].str.contains(pattern, case=False, na=False) | videos["description"].str.contains(pattern, case=False, na=False)]
+		stats_subset = stats[stats["video_id"].isin(videos_subset["video_id"])]
+		reddit_engagement = post_engagement + comment_engagement
+		youtube_engagement = stats_subset["view_count"].sum() * 0.001 + stats_subset["like_count"].sum() * 0.01 + stats_subset["comment_count"].sum() * 0.1
+		engagement = reddit_engagement + youtube_engagement
+		sentiment = post_sentiment * 0.6 + comment_sentiment * 0.4
+		score = np.tanh(engagement / 10000.0) * 0.6 + ((sentiment + 1) / 2.0) * 0.2
+		rows.append({"place": place, "score": score, "engagement": engagement, "reddit_engagement": reddit_engagement, "youtube_engagement": youtube_engagement, "sentiment": sentiment})
+	return pd.DataFrame(rows).sort_values("score", ascending=False)
+
+
+def _chunks(df: pd.DataFrame, rows: int = 97):
+	return (df.iloc[i : i + rows] for i in range(0, len(df), rows))
+
+
+def test_keyword_index_matches_per_keyword_scan():
+	# Shared prefixes, nested keywords, regex syntax and missing text
+	places = {**PLACES, "Nested": ["T Nagar Road", "Nagar", "Express"], "Regex": ["Anna (?:Nagar|Salai)", "V.R"], "Case": ["chennai"]}
+	texts = pd.concat([reddit_posts(3000, places, seed=11, hit_rate=0.2)["title"], pd.Series([None, np.nan, "", "T NAGAR", "anna salai", "VxR", "t nagar road"])], ignore_index=True)
+	index = KeywordIndex(places)
+	np.testing.assert_array_equal(index.match(texts), per_keyword_masks(texts, places))
+
+
+def test_vectorized_scoring_matches_loop():
+	frames = make_dataset(1500, seed=6)
+	frames["trends"] = pd.DataFrame()
+	expected = loop_scores(*[frames[name] for name in SOURCES[:4]], PLACES)
+	actual = combine_components(extract_components(*[frames[name] for name in SOURCES], PLACES))
+	pd.testing.assert_frame_equal(actual[expected.columns].reset_index(drop=True), expected.reset_index(drop=True), check_exact=False, rtol=1e-12)
+
+
+def test_streaming_extraction_matches_full_extraction():
+	frames = make_dataset(2000, seed=7)
+	expected = extract_components(*[frames[name] for name in SOURCES], PLACES)
+	actual = extract_components_streaming(_chunks(frames["reddit_posts"]), _chunks(frames["reddit_comments"]), frames["youtube_videos"], frames["youtube_stats"], frames["trends"], PLACES)
+	pd.testing.assert_frame_equal(actual, expected, check_exact=False, rtol=1e-12)
+
+
+def test_cube_matches_direct_extraction():
+	frames = make_dataset(2000, seed=8)
+	cube = ScoreCube(PLACES)
+	cube.update(*[frames[name] for name in SOURCES[:4]])
+	expected = extract_components(*[frames[name] for name in SOURCES], PLACES)
+	pd.testing.assert_frame_equal(cube.components(frames["trends"])[expected.columns], expected, check_exact=False, rtol=1e-12)
+	# After an incremental update (changed and added posts) it still matches a fresh extraction
+	posts = frames["reddit_posts"].copy()
+	posts.loc[0, "score"] += 100
+	added = make_dataset(200, seed=9)["reddit_posts"].assign(id=lambda df: "n" + df["id"])
+	posts = pd.concat([posts, added], ignore_index=True)
+	assert cube.update(posts, *[frames[name] for name in SOURCES[1:4]]) > 0
+	expected = extract_components(posts, *[frames[name] for name in SOURCES[1:]], PLACES)
+	pd.testing.assert_frame_equal(cube.components(frames["trends"])[expected.columns], expected, check_exact=False, rtol=1e-12)
+
+
+def test_parallel_scoring_reuses_one_pool():
+	texts = reddit_posts(600, PLACES, seed=12)["title"].tolist()
+	serial = sentiment.score_texts(texts)
+	assert sentiment.score_texts(texts, workers=2, min_parallel=0) == serial
+	pool = sentiment._pool
+	assert sentiment.score_texts(texts[::-1], workers=2, min_parallel=0) == serial[::-1]
+	assert sentiment._pool is pool
@@ -0,0 +1,46 @@
+import os
+import time
+
+import pandas as pd
+
+from app.analysis.scoring import _post_activity, extract_components
+from app.storage import DataStore
+from synthetic import PLACES, make_dataset
+
+
+def test_compact_post_activity_does_not_overflow(tmp_path):
+	store = DataStore(str(tmp_path))
+	store.write("reddit_posts", pd.DataFrame({"id": ["a"], "title": ["t"], "selftext": [""], "score": [30000], "num_comments": [5000], "created_utc": [1], "url": ["u"], "subreddit": ["s"]}))
+	compact = store.read("reddit_posts", compact=True)
+	assert _post_activity(compact).tolist() == [35000.0]
+
+
+def test_compact_read_scores_like_plain_read(tmp_path):
+	store = DataStore(str(tmp_path))
+	for name, df in make_dataset(2000, seed=3).items():
+		store.write(name, df)
+	frames = {compact: {name: store.read(name, compact=compact) for name in ["reddit_posts", "reddit_comments", "youtube_videos", "youtube_stats", "trends"]} for compact in (False, True)}
+	plain, compact = (extract_components(*[frames[c][n] for n in ["reddit_posts", "reddit_comments", "youtube_videos", "youtube_stats", "trends"]], PLACES) for c in (False, True))
+	pd.testing.assert_frame_equal(plain, compact)
+
+
+def test_newer_legacy_csv_never_replaces_parquet(tmp_path):
+	store = DataStore(str(tmp_path))
+	pd.DataFrame({"post_id": ["p1", "p2"], "comment_id": ["c1", "c2"], "body": ["old", "old"], "score": [1, 2], "created_utc": [1, 2]}).to_csv(store.csv_path("reddit_comments"), index=False)
+	assert len(store.read("reddit_comments")) == 2
+	store.write("reddit_comments", pd.DataFrame({"post_id": ["p3"], "comment_id": ["c3"], "body": ["new"], "score": [3], "created_utc": [3]}))
+	fingerprint = store.fingerprint(["reddit_comments"])
+	# A checkout touching the tracked CSV leaves the collected data alone
+	os.utime(store.csv_path("reddit_comments"), (time.time() + 60, time.time() + 60))
+	assert store.read("reddit_comments")["comment_id"].tolist() == ["c3"]
+	assert store.fingerprint(["reddit_comments"]) == fingerprint
+
+
+def test_migration_types_columns_empty_in_the_first_chunk(tmp_path):
+	store = DataStore(str(tmp_path))
+	trends = pd.DataFrame({"date": pd.date_range("2024-01-07", periods=6, freq="W"), "sneakers": [None, None, 3, 4, 5, 6], "T Nagar": [None, None, None, None, "low", "x"]})
+	trends.to_csv(store.csv_path("trends"), index=False)
+	store.migrate("trends", chunk_rows=2)
+	migrated = store.read("trends")
+	assert migrated["sneakers"].tolist()[2:] == [3.0, 4.0, 5.0, 6.0]
+	assert migrated["T Nagar"].tolist()[4:] == ["low", "x"]
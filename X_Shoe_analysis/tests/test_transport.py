@@ -0,0 +1,19 @@
+import base64
+import json
+
+from app.collectors.transport import ReplayServer, make_exchange
+
+
+def test_recorded_request_bodies_carry_no_credentials():
+	form = make_exchange("POST", "https://www.reddit.com/api/v1/access_token", "grant_type=password&username=me&password=hunter2", 200, {}, b'{"access_token": "secret"}')
+	assert base64.b64decode(form["body"]) == b"grant_type=password&username=replay&password=replay"
+	assert "secret" not in form["text"]
+	payload = make_exchange("POST", "https://example.com/token", json.dumps({"client_secret": "s3cret", "scope": "read"}), 200, {}, b"{}")
+	assert json.loads(base64.b64decode(payload["body"])) == {"client_secret": "replay", "scope": "read"}
+
+
+def test_live_credentials_match_their_scrubbed_recording():
+	exchange = make_exchange("POST", "https://www.reddit.com/api/v1/access_token", "grant_type=password&username=me&password=hunter2", 200, {}, b'{"token_type": "bearer"}')
+	server = ReplayServer([exchange], strict=True)
+	status, _, content = server.respond("POST", "https://www.reddit.com/api/v1/access_token", b"grant_type=password&username=other&password=changed")
+	assert status == 200 and json.loads(content) == {"token_type": "bearer"}
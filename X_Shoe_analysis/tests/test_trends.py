@@ -0,0 +1,37 @@
+import pandas as pd
+
+from app.collectors import trends
+from app.collectors.cache import RequestCache
+
+
+def _frame(batch, values):
+	index = pd.DatetimeIndex(pd.date_range("2024-01-07", periods=len(values), freq="W"), name="date")
+	return pd.DataFrame({kw: values for kw in batch}, index=index)
+
+
+def test_rescaled_batches_stay_within_100():
+	# The anchor is 10x weaker in the second batch, so scaling it up lifts "b" to 1000
+	first = pd.DataFrame({"a": [100.0, 50.0]})
+	second = pd.DataFrame({"a": [10.0, 5.0], "b": [100.0, 20.0]})
+	scaled = trends._rescale([first, second], "a")
+	assert max(frame.max().max() for frame in scaled) == 100
+	assert scaled[1]["b"].iloc[0] / scaled[0]["a"].iloc[0] == 10
+
+
+def test_fallback_geo_is_cached_under_its_own_geo(tmp_path, monkeypatch):
+	calls = []
+
+	def interest(batch, geo, timeframe):
+		calls.append(geo)
+		if geo == "IN-TN" and calls.count("IN-TN") == 1:
+			raise RuntimeError("regional request failed")
+		return _frame(batch, [1.0, 2.0] if geo == "IN" else [3.0, 4.0])
+
+	monkeypatch.setattr(trends, "_interest", interest)
+	cache = RequestCache(str(tmp_path))
+	fallback = trends.fetch_trends(["sneakers"], geo="IN-TN", cache=cache, retries=1)
+	assert fallback["sneakers"].tolist() == [1.0, 2.0]
+	# The regional request is tried again instead of being answered by the cached fallback
+	regional = trends.fetch_trends(["sneakers"], geo="IN-TN", cache=cache, retries=1)
+	assert regional["sneakers"].tolist() == [3.0, 4.0]
+	assert calls == ["IN-TN", "IN", "IN-TN"]